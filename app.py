@@ -1,8 +1,15 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from documind.pipeline.agent_pipeline import AgentPipeline
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from documind.components.agent_tools import get_classifier, get_swapper
+from documind.components.worker_pool import AgentWorkerPool, QueueFullError
+from documind.config.configuration import ConfigurationManager
 from documind.entity.api_models import DocumentRequest, AuditResponse
+from documind.utils.metrics import INFLIGHT_REQUESTS, render_metrics
 from documind import logger
 import uvicorn
+import asyncio
+import json
+import time
 import os
 
 # 1. Initialize API
@@ -13,60 +20,334 @@ app = FastAPI(
 )
 
 # 2. Global Variable for the Agent (Singleton Pattern)
-# We load it purely to None first. We will load it on "startup".
+# We load it purely to None first. It is warmed up in the background after startup.
 agent_pipeline = None
+warmup_state = {"status": "not_started", "error": None, "seconds": None}
 
-@app.on_event("startup")
-async def startup_event():
+# 3. Bounded pool for agent runs, so one audit never blocks the event loop
+serving_config = ConfigurationManager().get_serving_config()
+worker_pool_config = ConfigurationManager().get_worker_pool_config()
+worker_pool = AgentWorkerPool(worker_pool_config)
+
+@app.middleware("http")
+async def track_inflight_requests(request: Request, call_next):
+    # Scrapes are not traffic, keep them out of the gauge
+    if request.url.path == "/metrics":
+        return await call_next(request)
+    INFLIGHT_REQUESTS.inc()
+    try:
+        return await call_next(request)
+    finally:
+        INFLIGHT_REQUESTS.dec()
+
+def warm_up():
     """
-    Load the Heavy AI Models when the server starts.
-    This prevents loading them for every single request.
+    Loads the heavy models (classifier, then LLM agent). Runs in a thread so
+    the server accepts connections (and /health/live answers) meanwhile.
     """
     global agent_pipeline
+    warmup_state["status"] = "loading"
+    started_at = time.perf_counter()
     try:
-        logger.info(">>> STARTUP: Loading AI Models into GPU... <<<")
-        agent_pipeline = AgentPipeline()
-        logger.info(">>> STARTUP: Models Loaded Successfully! <<<")
+        logger.info(">>> WARM-UP: Loading AI Models... <<<")
+        # New classifier versions are picked up in the background from here on
+        app.state.swapper = get_swapper()
+        app.state.swapper.watch()
+        if serving_config.warmup_agent:
+            # Imported here so that importing the app does not pull in torch/transformers/langgraph
+            from documind.pipeline.agent_pipeline import AgentPipeline
+            agent_pipeline = AgentPipeline()
+        warmup_state["status"] = "ready"
+        logger.info(">>> WARM-UP: Models Loaded Successfully! <<<")
     except Exception as e:
+        warmup_state["status"] = "failed"
+        warmup_state["error"] = f"{type(e).__name__}: {e}"
         logger.error(f"Failed to load AI Models: {e}")
-        raise e
+    finally:
+        warmup_state["seconds"] = time.perf_counter() - started_at
+
+def agent_unavailable() -> HTTPException:
+    """
+    Error for an LLM request while there is no agent. Only a warm-up still in
+    progress is worth retrying; a failed warm-up stays failed until a restart.
+    """
+    if warmup_state["status"] == "failed":
+        return HTTPException(status_code=500, detail=f"AI Model failed to load: {warmup_state['error']}")
+    if warmup_state["status"] == "ready":
+        return HTTPException(status_code=503, detail="LLM agent is disabled on this server (serving.warmup_agent), use mode='classify'.")
+    return HTTPException(status_code=503, detail="AI Model not loaded yet.", headers={"Retry-After": str(worker_pool_config.retry_after_seconds)})
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Starts loading the Heavy AI Models in the background when the server starts.
+    This prevents loading them for every single request; /health/ready reports when they are in.
+    """
+    app.state.warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    worker_pool.shutdown()
+    # Only stop the watcher if warm-up got that far (never load models on shutdown)
+    if getattr(app.state, "swapper", None) is not None:
+        app.state.swapper.stop()
+    if agent_pipeline is not None:
+        agent_pipeline.close()
 
 @app.get("/")
 async def root():
     return {"status": "Online", "message": "DocuMind API is running. Go to /docs for Swagger UI."}
 
+@app.get("/health/live")
+async def health_live():
+    """
+    Liveness: the process is up and serving, models may still be loading.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def health_ready(response: Response):
+    """
+    Readiness: 200 once the models are loaded, 503 while warming up, 500 (with the error) after a failed load.
+    """
+    if warmup_state["status"] != "ready" and agent_pipeline is None:
+        response.status_code = 500 if warmup_state["status"] == "failed" else 503
+        return warmup_state
+    return {**warmup_state, "status": "ready"}
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus scrape endpoint (latency histograms, in-flight requests, model state, memory).
+    """
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+@app.get("/model")
+async def model_status():
+    """
+    Live classifier version, the versions kept for rollback and the ones the watcher skips.
+    Per worker: with serving.workers > 1 this is the state of the worker that answered (worker_pid).
+    """
+    return (await asyncio.to_thread(get_swapper)).status()
+
+@app.post("/model/reload")
+async def model_reload():
+    """
+    Checks the registry now and hot-swaps a new classifier version in if there is one.
+    Only the worker that answers swaps now; the other workers' watchers pick the version up on their next poll.
+    """
+    swapper = await asyncio.to_thread(get_swapper)
+    swapped = await asyncio.to_thread(swapper.check, True)
+    return {"swapped": swapped, **swapper.status()}
+
+@app.post("/model/rollback")
+async def model_rollback():
+    """
+    Swaps the previous classifier version back in, in the worker that answers only.
+    With several workers, roll back at the registry (alias or checkpoint) so every watcher follows.
+    """
+    swapper = await asyncio.to_thread(get_swapper)
+    try:
+        await asyncio.to_thread(swapper.rollback)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return swapper.status()
+
 @app.post("/audit", response_model=AuditResponse)
-async def audit_document(request: DocumentRequest):
+async def audit_document(request: DocumentRequest, response: Response):
     """
     Endpoint to audit a legal document text.
+    mode='classify' answers straight from the classifier without touching the LLM.
     """
     global agent_pipeline
-    
-    if not agent_pipeline:
-        raise HTTPException(status_code=503, detail="AI Model not loaded.")
 
     if len(request.text) < 10:
         raise HTTPException(status_code=400, detail="Text too short. Please provide a valid legal clause.")
 
     try:
-        logger.info("Received audit request...")
-        
-        # Run the Agent
-        # Note: In production, we might offload this to Celery, but for now we await it.
-        result_text = agent_pipeline.run_agent(request.text)
-        
+        logger.info(f"Received audit request (mode: {request.mode})...")
+
+        if request.mode != "classify" and not agent_pipeline:
+            raise agent_unavailable()
+
+        # 0. Near-duplicate of an earlier audit: reuse it, only novel clauses reach the LLM
+        # (a trace request always runs the agent, the trace is the point; DocumentRequest
+        # only accepts trace in full_agent mode, so a trace is always emitted then)
+        if request.mode != "classify" and not request.trace:
+            match = await asyncio.to_thread(agent_pipeline.find_prior_audit, request.text, request.mode)
+            if match is not None:
+                prior = match["value"]
+                logger.info(f"Reusing audit #{match['audit_id']} (similarity {match['similarity']:.2f})")
+                response.headers["X-Model-Version"] = prior["model_version"]
+                return AuditResponse(
+                    mode=request.mode,
+                    classification=prior["classification"],
+                    top_k=prior["top_k"],
+                    risk_analysis=prior["analysis"],
+                    raw_agent_output=prior["analysis"],
+                    model_version=prior["model_version"],
+                    near_duplicate_of=match["audit_id"],
+                    near_duplicate_similarity=match["similarity"]
+                )
+
+        # 1. Classifier fast path (milliseconds, runs in a thread so the event loop stays free)
+        started_at = time.perf_counter()
+        # One classifier reference per request: a hot swap never mixes versions within it
+        classifier = await asyncio.to_thread(get_classifier)
+        prediction = (await asyncio.to_thread(classifier.predict_top_k, [request.text], request.top_k))[0]
+        response.headers["X-Model-Version"] = classifier.model_version
+        classify_ms = (time.perf_counter() - started_at) * 1000
+
+        if request.mode == "classify":
+            return AuditResponse(
+                mode=request.mode,
+                classification=prediction["label"],
+                top_k=prediction["top_k"],
+                classify_ms=classify_ms,
+                model_version=classifier.model_version
+            )
+
+        # 2. Run the LLM on the bounded worker pool (keeps the event loop free)
+        try:
+            steps = None
+            if request.mode == "classify+summary":
+                result_text, timing = await worker_pool.run(agent_pipeline.summarize, request.text, prediction["label"])
+            elif request.trace:
+                traced, timing = await worker_pool.run(agent_pipeline.run_agent_traced, request.text)
+                result_text, steps = traced["output"], traced["steps"]
+            else:
+                result_text, timing = await worker_pool.run(agent_pipeline.run_agent, request.text)
+        except QueueFullError as e:
+            logger.warning(f"Rejecting audit request: {e}")
+            raise HTTPException(
+                status_code=429,
+                detail="Server is busy. Please retry later.",
+                headers={"Retry-After": str(worker_pool_config.retry_after_seconds)}
+            )
+
+        response.headers["X-Queue-Wait-Ms"] = f"{timing['queue_wait_ms']:.1f}"
+        response.headers["X-Run-Time-Ms"] = f"{timing['run_time_ms']:.1f}"
+
+        # 3. Index the audit so later near-duplicates can reuse it (failed runs are not worth reusing)
+        if result_text != "Agent Error - Check logs.":
+            await asyncio.to_thread(agent_pipeline.remember_audit, request.text, request.mode, {
+                "classification": prediction["label"],
+                "top_k": prediction["top_k"],
+                "analysis": result_text,
+                "model_version": classifier.model_version
+            })
+
         # Return structured response
-        # Since our Agent output is text, we map it to 'raw_agent_output'
-        # Ideally, we would ask the agent to output JSON, but text is fine for now.
+        # classification comes straight from the classifier, the LLM text is the risk analysis
         return AuditResponse(
-            risk_analysis="Processed by Agent", 
-            raw_agent_output=result_text
+            mode=request.mode,
+            classification=prediction["label"],
+            top_k=prediction["top_k"],
+            risk_analysis=result_text,
+            raw_agent_output=result_text,
+            classify_ms=classify_ms,
+            queue_wait_ms=timing["queue_wait_ms"],
+            run_time_ms=timing["run_time_ms"],
+            model_version=classifier.model_version,
+            agent_turns=sum(step["kind"] == "llm" for step in steps) if steps is not None else None,
+            trace=steps
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/audit/stream")
+async def audit_document_stream(request: DocumentRequest):
+    """
+    Streaming variant of /audit.
+    Sends agent events (tool calls, tool results, LLM tokens) as Server-Sent Events as they happen.
+    """
+    global agent_pipeline
+
+    if not agent_pipeline:
+        raise agent_unavailable()
+
+    if len(request.text) < 10:
+        raise HTTPException(status_code=400, detail="Text too short. Please provide a valid legal clause.")
+
+    logger.info("Received streaming audit request...")
+    # Resolved here: the first call loads the classifier, which must not happen on the event loop
+    classifier = await asyncio.to_thread(get_classifier)
+
+    # The agent runs on the bounded pool and hands events to the event loop through a queue
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def produce_events():
+        try:
+            for event in agent_pipeline.stream_agent(request.text):
+                loop.call_soon_threadsafe(events.put_nowait, event)
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    try:
+        job = worker_pool.submit(produce_events)
+    except QueueFullError as e:
+        logger.warning(f"Rejecting streaming audit request: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy. Please retry later.",
+            headers={"Retry-After": str(worker_pool_config.retry_after_seconds)}
+        )
+
+    async def sse_events():
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+        _, timing = await job
+        timing["model_version"] = classifier.model_version
+        yield f"event: timing\ndata: {json.dumps(timing)}\n\n"
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/audit/document")
+async def audit_full_document(request: DocumentRequest):
+    """
+    Long-document mode: classifies a whole agreement clause by clause.
+    Results are streamed back as NDJSON (one line per clause/window) as each batch finishes.
+    """
+    if len(request.text) < 10:
+        raise HTTPException(status_code=400, detail="Text too short. Please provide a valid legal document.")
+
+    logger.info(f"Received document request ({len(request.text)} chars)...")
+
+    def stream_segments():
+        started_at = time.perf_counter()
+        classifier = get_classifier()
+        count = 0
+        for result in classifier.predict_document(request.text):
+            count += 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({
+            "done": True,
+            "segments": count,
+            "elapsed_ms": (time.perf_counter() - started_at) * 1000,
+            "model_version": classifier.model_version
+        }) + "\n"
+
+    # Sync generator: Starlette iterates it in a worker thread, off the event loop
+    return StreamingResponse(stream_segments(), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
+    if serving_config.workers > 1:
+        # Several workers sharing the preloaded classifier copy-on-write, see gunicorn.conf.py
+        os.execvp("gunicorn", ["gunicorn", "-c", "gunicorn.conf.py", "app:app"])
+
     # Host 0.0.0.0 allows access from other machines/docker
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    uvicorn.run("app:app", host=serving_config.host, port=serving_config.port, reload=False)
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Reproducible, offline performance benchmarks for DocuMind.
+
+Everything runs against tiny randomly initialized stand-ins (DistilBERT
+classifier as in production, a Mistral decoder with Qwen2.5's GQA + RoPE
+layout, scripted chat model), so the numbers are comparable across commits
+on the same machine, not absolute.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # writes benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py --quick              # fewer repeats
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Works with `pip install -e .` as well as from a plain checkout
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+BATCH_SIZES = [1, 8, 32]
+INPUT_WORDS = [32, 128, 512]
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+def summarize(samples_sec: list) -> dict:
+    samples_ms = sorted(s * 1000 for s in samples_sec)
+    return {
+        "p50_ms": statistics.median(samples_ms),
+        "p95_ms": samples_ms[min(len(samples_ms) - 1, int(round(0.95 * (len(samples_ms) - 1))))],
+        "mean_ms": statistics.fmean(samples_ms)
+    }
+
+def make_texts(count: int, words: int, seed: int = 0) -> list:
+    from documind.utils.stand_ins import STAND_IN_WORDS
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(STAND_IN_WORDS) for _ in range(words)) for _ in range(count)]
+
+def build_workspace(workspace: str) -> str:
+    """
+    Copies the configs into a scratch directory, points prediction at a stand-in
+    checkpoint and turns the result cache off so every call hits the model.
+    """
+    from documind.utils.stand_ins import build_stand_in_classifier
+
+    model_path = build_stand_in_classifier(os.path.join(workspace, "stand_in_classifier"))
+
+    os.makedirs(os.path.join(workspace, "config"))
+    with open(os.path.join(REPO_ROOT, "config", "config.yaml")) as f:
+        config = yaml.safe_load(f)
+    config["prediction"]["model_path"] = model_path
+    config["prediction"]["backend"] = "torch"
+    # Every run repeats the same text: audit reuse would turn the agent benchmark into an SQLite lookup
+    config["near_duplicate_index"]["enabled"] = False
+    config["result_cache"]["enabled"] = False
+    with open(os.path.join(workspace, "config", "config.yaml"), "w") as f:
+        yaml.safe_dump(config, f)
+
+    shutil.copy(os.path.join(REPO_ROOT, "params.yaml"), workspace)
+    shutil.copy(os.path.join(REPO_ROOT, "schema.yaml"), workspace)
+    return model_path
+
+def bench_cold_start() -> dict:
+    # Fresh interpreter: import cost and model construction measured separately
+    code = (
+        "import time, json\n"
+        "t0 = time.perf_counter()\n"
+        "from documind.pipeline.prediction import PredictionPipeline\n"
+        "t1 = time.perf_counter()\n"
+        "PredictionPipeline()\n"
+        "t2 = time.perf_counter()\n"
+        "print(json.dumps({'import_ms': (t1 - t0) * 1000, 'load_ms': (t2 - t1) * 1000}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(REPO_ROOT, "src"), os.environ.get("PYTHONPATH", "")]))
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.getcwd(), env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def bench_tokenizer(pipeline, repeats: int) -> dict:
+    results = {}
+    for words in INPUT_WORDS:
+        texts = make_texts(32, words)
+        timings = []
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            pipeline.tokenizer(texts, truncation=True, max_length=pipeline.max_length)
+            timings.append(time.perf_counter() - started_at)
+        stats = summarize(timings)
+        stats["texts_per_sec"] = len(texts) / statistics.median(timings)
+        results[f"words_{words}"] = stats
+    return results
+
+def bench_classifier(pipeline, repeats: int) -> dict:
+    results = {}
+    for words in INPUT_WORDS:
+        for batch_size in BATCH_SIZES:
+            texts = make_texts(batch_size, words, seed=batch_size)
+            pipeline.predict_batch(texts)  # warm-up
+            timings = []
+            for _ in range(repeats):
+                started_at = time.perf_counter()
+                pipeline.predict_batch(texts)
+                timings.append(time.perf_counter() - started_at)
+            stats = summarize(timings)
+            stats["texts_per_sec"] = batch_size / statistics.median(timings)
+            results[f"words_{words}_batch_{batch_size}"] = stats
+    return results
+
+def bench_audit_api(repeats: int) -> dict:
+    from fastapi.testclient import TestClient
+    from documind.pipeline.agent_pipeline import AgentPipeline
+    from documind.utils.stand_ins import StandInChatModel
+
+    sys.path.insert(0, REPO_ROOT)
+    import app as api
+
+    # The stand-in LLM replaces Qwen; no lifespan events, so nothing heavy is loaded
+    api.agent_pipeline = AgentPipeline(llm=StandInChatModel())
+    client = TestClient(api.app)
+
+    results = {}
+    text = make_texts(1, 64)[0]
+    for mode in ("classify", "full_agent"):
+        client.post("/audit", json={"text": text, "mode": mode})  # warm-up
+        timings = []
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            response = client.post("/audit", json={"text": text, "mode": mode})
+            timings.append(time.perf_counter() - started_at)
+            response.raise_for_status()
+        results[mode] = summarize(timings)
+    return results
+
+def bench_llm(workspace: str, repeats: int) -> dict:
+    """
+    Decode latency of the stand-in Mistral decoder on CPU behind a long shared
+    system prompt: without KV cache, with KV cache, and with the prefix cache on top.
+    """
+    from transformers import AutoModelForCausalLM, AutoTokenizer, TextGenerationPipeline
+    from documind.components.prefix_caching_pipeline import PrefixCachingTextGenerationPipeline
+    from documind.utils.stand_ins import build_stand_in_causal_lm
+
+    path = build_stand_in_causal_lm(os.path.join(workspace, "stand_in_llm"), hidden_size=256, num_layers=4)
+    tokenizer = AutoTokenizer.from_pretrained(path)
+    model = AutoModelForCausalLM.from_pretrained(path).eval()
+
+    system_prompt = make_texts(1, 400, seed=1)[0]
+    prompts = [
+        tokenizer.apply_chat_template(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": text}],
+            tokenize=False,
+            add_generation_prompt=True
+        )
+        for text in make_texts(repeats + 1, 32, seed=2)
+    ]
+    new_tokens = 32
+    generate_kwargs = {"max_new_tokens": new_tokens, "min_new_tokens": new_tokens, "do_sample": False, "return_full_text": False}
+
+    results = {}
+    cases = [
+        ("no_kv_cache", TextGenerationPipeline, False),
+        ("kv_cache", TextGenerationPipeline, True),
+        ("kv_cache+prefix_cache", PrefixCachingTextGenerationPipeline, True)
+    ]
+    for name, pipeline_class, use_cache in cases:
+        generator = pipeline_class(model=model, tokenizer=tokenizer)
+        generator(prompts[0], use_cache=use_cache, **generate_kwargs)  # warm-up, also fills the prefix cache
+        timings = []
+        for prompt in prompts[1:]:
+            started_at = time.perf_counter()
+            generator(prompt, use_cache=use_cache, **generate_kwargs)
+            timings.append(time.perf_counter() - started_at)
+        stats = summarize(timings)
+        stats["tokens_per_sec"] = new_tokens / statistics.median(timings)
+        results[name] = stats
+    return results
+
+def compare(current: dict, baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    print(f"\nComparing against {baseline_path} (commit {baseline.get('commit')}):")
+    for section in ("tokenizer", "classifier", "audit_api", "llm"):
+        for case, stats in current.get(section, {}).items():
+            old = baseline.get(section, {}).get(case)
+            if not old:
+                continue
+            ratio = stats["p50_ms"] / old["p50_ms"] if old["p50_ms"] else 1.0
+            flag = "REGRESSION" if ratio > 1 + threshold else ""
+            regressions += bool(flag)
+            print(f"  {section}/{case:<28} {old['p50_ms']:9.2f} ms -> {stats['p50_ms']:9.2f} ms  x{ratio:5.2f} {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="DocuMind benchmark suite (offline, stand-in models)")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats, for a fast sanity check")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed p50 slowdown before flagging (default 10%%)")
+    args = parser.parse_args()
+
+    repeats = 5 if args.quick else 30
+    output = args.output or os.path.join(RESULTS_DIR, f"{git_commit()}.json")
+    output = os.path.abspath(output)
+
+    workspace = tempfile.mkdtemp(prefix="documind-bench-")
+    try:
+        build_workspace(workspace)
+        # ConfigurationManager reads config/ relative to the working directory
+        os.chdir(workspace)
+
+        import torch
+        from documind.pipeline.prediction import PredictionPipeline
+
+        results = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": {
+                "python": platform.python_version(),
+                "torch": torch.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "torch_threads": torch.get_num_threads()
+            },
+            "repeats": repeats
+        }
+
+        print("Cold start...")
+        results["cold_start"] = bench_cold_start()
+
+        pipeline = PredictionPipeline()
+        print("Tokenizer...")
+        results["tokenizer"] = bench_tokenizer(pipeline, repeats)
+        print("Classifier...")
+        results["classifier"] = bench_classifier(pipeline, repeats)
+        print("/audit end to end...")
+        results["audit_api"] = bench_audit_api(repeats)
+        print("LLM decode...")
+        results["llm"] = bench_llm(workspace, repeats)
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+from documind import logger
+from documind.config.configuration import ConfigurationManager
+from documind.pipeline.bulk_audit import BulkAuditPipeline
+
+# Usage:
+#   python bulk_audit.py data_room.jsonl artifacts/bulk/results.jsonl --workers 4
+#   python bulk_audit.py data_room.jsonl artifacts/bulk/results --format parquet --agent-label "Indemnifications"
+# Re-running the same command after a crash resumes from the checkpoint.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk audit of a JSONL corpus (resumable).")
+    parser.add_argument("input_path", help="JSONL file, one clause per line")
+    parser.add_argument("output_path", help="JSONL file, or a directory of Parquet parts with --format parquet")
+    parser.add_argument("--format", dest="output_format", choices=["jsonl", "parquet"])
+    parser.add_argument("--id-field")
+    parser.add_argument("--text-field")
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--workers", type=int, help="Classifier processes (0 = run in this process)")
+    parser.add_argument("--agent-label", dest="agent_labels", action="append", help="Also run the LLM agent on clauses with this label (repeatable)")
+    parser.add_argument("--include-text", action="store_true", default=None)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+
+    try:
+        config = ConfigurationManager().get_bulk_audit_config(
+            input_path=args.input_path,
+            output_path=args.output_path,
+            resume=not args.no_resume,
+            output_format=args.output_format,
+            id_field=args.id_field,
+            text_field=args.text_field,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            agent_labels=args.agent_labels,
+            include_text=args.include_text
+        )
+        BulkAuditPipeline(config=config).run()
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for multi-worker serving:
+
+    gunicorn -c gunicorn.conf.py app:app      (or `python app.py` with serving.workers > 1)
+
+The classifier is loaded once in the master process before the workers are
+forked, so its weights are shared copy-on-write instead of copied into every
+worker. See the `serving` section of config/config.yaml.
+"""
+import gc
+from documind.config.configuration import ConfigurationManager
+
+serving_config = ConfigurationManager().get_serving_config()
+
+bind = f"{serving_config.host}:{serving_config.port}"
+workers = serving_config.workers
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = serving_config.timeout
+preload_app = True
+
+def on_starting(server):
+    if not serving_config.preload_classifier:
+        return
+
+    from documind.components.agent_tools import get_swapper
+    server.log.info("Preloading the classifier in the master process...")
+    get_swapper()
+
+    # Move everything allocated so far out of the collector's reach: a GC pass in a
+    # worker would otherwise write to these objects and un-share their pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    # N workers each using every core would oversubscribe the CPU
+    if serving_config.torch_threads_per_worker > 0:
+        import torch
+        torch.set_num_threads(serving_config.torch_threads_per_worker)
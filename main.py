@@ -1,56 +1,84 @@
+import argparse
 from documind import logger
+from documind.pipeline.stage_runner import Stage, StageRunner
 from documind.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
 from documind.pipeline.stage_02_data_validation import DataValidationTrainingPipeline
+from documind.pipeline.stage_02b_data_deduplication import DataDeduplicationTrainingPipeline
 from documind.pipeline.stage_03_data_transformation import DataTransformationTrainingPipeline
 from documind.pipeline.stage_04_model_trainer import ModelTrainerPipeline
 from documind.pipeline.stage_05_model_evaluation import ModelEvaluationPipeline
+from documind.pipeline.stage_06_onnx_export import OnnxExportPipeline
 
-STAGE_NAME = "Data Ingestion Stage"
-try:
-    logger.info(f">>>>>> Stage {STAGE_NAME} started <<<<<<")
-    obj = DataIngestionTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>>> Stage {STAGE_NAME} completed <<<<<<\n\n")
-except Exception as e:
-    logger.exception(e)
-    raise e
+# Every stage records hashes of its inputs, its config.yaml / params.yaml sections
+# (or single keys, as "section.key") and its outputs, and is skipped on the next
+# run when none of them changed.
+STAGES = [
+    Stage(
+        name="Data Ingestion Stage",
+        pipeline=DataIngestionTrainingPipeline,
+        outputs=["artifacts/data_ingestion"],
+        config_sections=["data_ingestion"]
+    ),
+    Stage(
+        name="Data Validation Stage",
+        pipeline=DataValidationTrainingPipeline,
+        inputs=["artifacts/data_ingestion", "schema.yaml"],
+        outputs=["artifacts/data_validation/status.txt"],
+        config_sections=["data_validation"]
+    ),
+    Stage(
+        name="Data Deduplication Stage",
+        pipeline=DataDeduplicationTrainingPipeline,
+        inputs=["artifacts/data_ingestion"],
+        outputs=["artifacts/data_deduplication"],
+        config_sections=["data_deduplication"]
+    ),
+    Stage(
+        name="Data Transformation Stage",
+        pipeline=DataTransformationTrainingPipeline,
+        inputs=["artifacts/data_ingestion", "artifacts/data_deduplication"],
+        outputs=["artifacts/data_transformation/samsum_dataset"],
+        config_sections=["data_transformation", "data_deduplication", "data_ingestion.file_format"],
+        params_sections=["TrainingArguments.max_length"]
+    ),
+    Stage(
+        name="Model Trainer Stage",
+        pipeline=ModelTrainerPipeline,
+        inputs=["artifacts/data_transformation/samsum_dataset", "artifacts/data_ingestion/labels.json"],
+        outputs=["artifacts/model_trainer/bert-classifier"],
+        config_sections=["model_trainer"],
+        params_sections=["TrainingArguments"]
+    ),
+    Stage(
+        name="Model Evaluation Stage",
+        pipeline=ModelEvaluationPipeline,
+        inputs=["artifacts/model_trainer/bert-classifier", "artifacts/data_transformation/samsum_dataset"],
+        outputs=["artifacts/model_evaluation/metrics.json", "artifacts/model_evaluation/per_class_metrics.json"],
+        config_sections=["model_evaluation"],
+        params_sections=["EvaluationArguments"]
+    ),
+    Stage(
+        name="ONNX Export Stage",
+        pipeline=OnnxExportPipeline,
+        inputs=["artifacts/model_trainer/bert-classifier", "artifacts/data_transformation/samsum_dataset"],
+        outputs=["artifacts/onnx_export"],
+        config_sections=["onnx_export"]
+    ),
+]
 
-STAGE_NAME = "Data Validation Stage"
-try:
-    logger.info(f">>>>>> Stage {STAGE_NAME} started <<<<<<")
-    obj = DataValidationTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>>> Stage {STAGE_NAME} completed <<<<<<\n\n")
-except Exception as e:
-    logger.exception(e)
-    raise e
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DocuMind training pipeline")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if nothing changed")
+    parser.add_argument("--from-stage", type=int, choices=range(1, len(STAGES) + 1),
+                        help="Leave earlier stages alone and run this stage and all later ones")
+    args = parser.parse_args()
 
-STAGE_NAME = "Data Transformation Stage"
-try:
-    logger.info(f">>>>>> Stage {STAGE_NAME} started <<<<<<")
-    obj = DataTransformationTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>>> Stage {STAGE_NAME} completed <<<<<<\n\n")
-except Exception as e:
-    logger.exception(e)
-    raise e
+    try:
+        summary = StageRunner().run(STAGES, force=args.force, from_stage=args.from_stage)
+    except Exception as e:
+        logger.exception(e)
+        raise e
 
-STAGE_NAME = "Model Trainer Stage"
-try:
-    logger.info(f">>>>>> Stage {STAGE_NAME} started <<<<<<")
-    obj = ModelTrainerPipeline()
-    obj.main()
-    logger.info(f">>>>>> Stage {STAGE_NAME} completed <<<<<<\n\n")
-except Exception as e:
-    logger.exception(e)
-    raise e
-
-STAGE_NAME = "Model Evaluation Stage"
-try:
-    logger.info(f">>>>>> Stage {STAGE_NAME} started <<<<<<")
-    obj = ModelEvaluationPipeline()
-    obj.main()
-    logger.info(f">>>>>> Stage {STAGE_NAME} completed <<<<<<\n\n")
-except Exception as e:
-    logger.exception(e)
-    raise e
\ No newline at end of file
+    logger.info("Pipeline summary:")
+    for number, name, status, seconds in summary:
+        logger.info(f"  {number}. {name:<28} {status:<8} {seconds:8.1f}s")
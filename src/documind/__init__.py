@@ -6,15 +6,27 @@ logging_str = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
 
 log_dir = "logs"
 log_filepath = os.path.join(log_dir, "running_logs.log")
-os.makedirs(log_dir, exist_ok=True)
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler that creates logs/ and opens the file on the first record,
+    so importing documind has no filesystem side effects.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 logging.basicConfig(
     level=logging.INFO,
     format=logging_str,
     handlers=[
-        logging.FileHandler(log_filepath),
+        LazyFileHandler(log_filepath),
         logging.StreamHandler(sys.stdout)
     ]
 )
 
-logger = logging.getLogger("documindLogger")
\ No newline at end of file
+logger = logging.getLogger("documindLogger")
@@ -0,0 +1,98 @@
+import time
+import threading
+from langchain_core.callbacks import BaseCallbackHandler
+from documind.utils.metrics import LLM_GENERATION_SECONDS
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Times every LLM generation inside the agent graph and records it in Prometheus.
+    """
+
+    def __init__(self):
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started_at = self._started.pop(run_id, None)
+        if started_at is not None:
+            LLM_GENERATION_SECONDS.observe(time.perf_counter() - started_at)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        started_at = self._started.pop(run_id, None)
+        if started_at is not None:
+            LLM_GENERATION_SECONDS.observe(time.perf_counter() - started_at)
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    Records every step of one agent run (LLM turns and tool calls) with its
+    wall time and token counts, for the opt-in trace in AuditResponse.
+    """
+
+    def __init__(self, count_tokens=None):
+        # count_tokens(text) -> int, used when the model does not report usage itself
+        self.count_tokens = count_tokens
+        self._started = {}
+        self._steps = []
+        self._lock = threading.Lock()
+
+    def _count(self, text: str):
+        if self.count_tokens is None or not text:
+            return None
+        return self.count_tokens(text)
+
+    def _finish(self, run_id, step: dict):
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        # Values known at the end (e.g. reported usage) win over those from the start
+        started_at, extra = started
+        step = {**extra, **step, "started_at": started_at}
+        step["duration_ms"] = (time.perf_counter() - started_at) * 1000
+        with self._lock:
+            self._steps.append(step)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        prompt = "\n".join(str(message.content) for message in messages[0])
+        self._started[run_id] = (time.perf_counter(), {"tokens_in": self._count(prompt)})
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        generation = response.generations[0][0]
+        message = getattr(generation, "message", None)
+        step = {"kind": "llm", "name": "llm", "tokens_out": self._count(generation.text)}
+        if message is not None:
+            step["tool_calls"] = [tool_call["name"] for tool_call in getattr(message, "tool_calls", [])]
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                step["tokens_in"] = usage.get("input_tokens")
+                step["tokens_out"] = usage.get("output_tokens")
+        self._finish(run_id, step)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, {"kind": "llm", "name": "llm", "error": str(error)})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._started[run_id] = (time.perf_counter(), {"name": serialized.get("name", "tool"), "input": input_str})
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id, {"kind": "tool", "output": str(getattr(output, "content", output))})
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, {"kind": "tool", "error": str(error)})
+
+    @property
+    def steps(self) -> list:
+        """
+        Finished steps in the order they started, numbered from 1.
+        """
+        with self._lock:
+            steps = sorted(self._steps, key=lambda step: step["started_at"])
+        first = steps[0]["started_at"] if steps else 0.0
+        return [
+            {**{k: v for k, v in step.items() if k != "started_at"}, "step": i, "offset_ms": (step["started_at"] - first) * 1000}
+            for i, step in enumerate(steps, start=1)
+        ]
@@ -1,9 +1,44 @@
+import threading
+import time
 # FIX: Import from langchain_core
 from langchain_core.tools import Tool
-from documind.pipeline.prediction import PredictionPipeline
+from documind import logger
+from documind.config.configuration import ConfigurationManager
+from documind.components.micro_batcher import MicroBatcher
+from documind.utils.metrics import TOOL_CALL_SECONDS
 
-# Initialize our classification tool
-classifier = PredictionPipeline()
+# The classifier is built on first use (or by an explicit warm-up), not at import time
+_swapper = None
+_batcher = None
+_lock = threading.Lock()
+
+def get_swapper():
+    """
+    Returns the shared ClassifierSwapper, loading the classifier on the first call.
+    """
+    global _swapper, _batcher
+    if _swapper is None:
+        with _lock:
+            if _swapper is None:
+                from documind.components.model_swapper import ClassifierSwapper
+                config_manager = ConfigurationManager()
+                swapper = ClassifierSwapper(config_manager.get_prediction_config(), config_manager.get_model_registry_config())
+                # Concurrent agent runs share one batched forward pass instead of one call each.
+                # The batch always goes to the live version, so hot swaps reach the agent too.
+                _batcher = MicroBatcher(lambda texts: swapper.current.predict_batch(texts), config_manager.get_micro_batcher_config())
+                _swapper = swapper
+    return _swapper
+
+def get_classifier():
+    """
+    Returns the live PredictionPipeline. A hot swap can replace it at any
+    time, so take one reference per request and use it throughout.
+    """
+    return get_swapper().current
+
+def get_batcher() -> MicroBatcher:
+    get_swapper()
+    return _batcher
 
 def classify_document_tool(text: str) -> str:
     """
@@ -11,7 +46,14 @@ def classify_document_tool(text: str) -> str:
     Input: The text of the document.
     Output: The class label (e.g., 'Governing Law', 'Termination').
     """
-    return classifier.predict(text)
+    started_at = time.perf_counter()
+    try:
+        return get_batcher().predict(text)
+    except Exception as e:
+        logger.error(f"Prediction Error: {e}")
+        return "Error"
+    finally:
+        TOOL_CALL_SECONDS.labels(tool="Document Classifier").observe(time.perf_counter() - started_at)
 
 # Wrap it as a LangChain Tool
 tools = [
@@ -20,4 +62,4 @@ tools = [
         func=classify_document_tool,
         description="Useful for when you need to know what kind of legal document or clause you are reading. Input should be the text of the clause."
     )
-]
\ No newline at end of file
+]
@@ -0,0 +1,153 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from documind import logger
+from documind.entity import DataDeduplicationConfig
+from documind.utils.common import save_json
+from documind.utils.minhash import MinHasher, lsh_bands
+
+class DataDeduplication:
+    """
+    Finds near-duplicate clauses within and across the ingested splits.
+
+    MinHash LSH proposes candidates (only rows sharing a band bucket are ever
+    compared) and union-find merges the verified pairs into groups. Rows are
+    numbered in `split_priority` order, so each group is kept as its first row
+    in the highest-priority split: train never keeps a near-copy of an
+    evaluation clause.
+    """
+
+    def __init__(self, config: DataDeduplicationConfig):
+        self.config = config
+        self.hasher = MinHasher(config.num_perm, config.shingle_size, config.seed)
+
+    def _split_file(self, directory, split: str) -> str:
+        return os.path.join(directory, f"{split}.{self.config.file_format}")
+
+    def _read(self, split: str) -> pd.DataFrame:
+        path = self._split_file(self.config.data_dir, split)
+        return pd.read_parquet(path) if self.config.file_format == "parquet" else pd.read_csv(path)
+
+    def _write(self, df: pd.DataFrame, split: str):
+        path = self._split_file(self.config.root_dir, split)
+        if self.config.file_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+    def find_groups(self, texts: list) -> np.ndarray:
+        """
+        Returns, for every text, the index of the first text of its near-duplicate group.
+        """
+        bands, rows = lsh_bands(self.config.threshold, self.config.num_perm)
+        signatures = np.stack([self.hasher.signature(text) for text in texts])
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(bands):
+            # 1. Bucket every row by this band of its signature
+            band_rows = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+            buckets = {}
+            for i, key in enumerate(band_rows.view(f"V{band_rows.shape[1] * band_rows.itemsize}").ravel()):
+                buckets.setdefault(key.tobytes(), []).append(i)
+
+            # 2. Verify each row against one row of every group already seen in the bucket
+            #    and merge with all similar ones; the smaller index stays root
+            for members in buckets.values():
+                seen = []
+                for i in members:
+                    merged = False
+                    for j in seen:
+                        root_j, root_i = find(j), find(i)
+                        if root_j == root_i:
+                            merged = True
+                        elif self.hasher.similarity(signatures[j], signatures[i]) >= self.config.threshold:
+                            parent[max(root_j, root_i)] = min(root_j, root_i)
+                            merged = True
+                    if not merged:
+                        seen.append(i)
+
+        return np.array([find(i) for i in range(len(texts))])
+
+    def deduplicate(self):
+        try:
+            os.makedirs(self.config.root_dir, exist_ok=True)
+            if not self.config.enabled:
+                # Transformation then reads the ingested files directly; clear outputs of an earlier run
+                for split in self.config.split_priority:
+                    path = self._split_file(self.config.root_dir, split)
+                    if os.path.exists(path):
+                        os.remove(path)
+                save_json(path=self.config.report_file, data={"enabled": False})
+                logger.info("Near-duplicate deduplication is disabled, nothing to do.")
+                return
+
+            started_at = time.perf_counter()
+
+            # 1. Load every split, rows numbered in priority order
+            frames = {split: self._read(split) for split in self.config.split_priority}
+            offsets, texts = {}, []
+            for split, df in frames.items():
+                offsets[split] = len(texts)
+                texts.extend(df["text"].astype(str).tolist())
+            logger.info(f"Hashing {len(texts)} clauses (threshold {self.config.threshold}, {self.config.num_perm} permutations)...")
+
+            # 2. Group near-duplicates across all splits at once
+            groups = self.find_groups(texts)
+            labels = np.concatenate([df["label"].to_numpy() for df in frames.values()])
+            group_sizes = np.bincount(groups, minlength=len(texts))
+            conflicting = pd.Series(labels).groupby(groups).nunique()
+
+            report = {
+                "enabled": True,
+                "mode": self.config.mode,
+                "threshold": self.config.threshold,
+                "rows_before": len(texts),
+                "duplicate_groups": int((group_sizes > 1).sum()),
+                "groups_with_conflicting_labels": int((conflicting > 1).sum()),
+                "splits": {}
+            }
+
+            # 3. Write each split: drop everything but the group's keeper, or tag the group
+            owner = np.empty(len(texts), dtype=object)
+            for split, df in frames.items():
+                owner[offsets[split] : offsets[split] + len(df)] = split
+
+            for split, df in frames.items():
+                split_groups = groups[offsets[split] : offsets[split] + len(df)]
+                is_keeper = split_groups == np.arange(offsets[split], offsets[split] + len(df))
+                kept_elsewhere = owner[split_groups] != split
+
+                if self.config.mode == "drop":
+                    out = df[is_keeper]
+                else:
+                    out = df.assign(dup_group=split_groups)
+                self._write(out.reset_index(drop=True), split)
+
+                report["splits"][split] = {
+                    "rows_before": len(df),
+                    "rows_after": len(out),
+                    "duplicates_within_split": int((~is_keeper & ~kept_elsewhere).sum()),
+                    "duplicates_of_other_splits": int((~is_keeper & kept_elsewhere).sum())
+                }
+                logger.info(f"{split}: {report['splits'][split]}")
+
+            report["rows_after"] = sum(split["rows_after"] for split in report["splits"].values())
+            report["reduction"] = 1 - report["rows_after"] / report["rows_before"] if report["rows_before"] else 0.0
+            report["seconds"] = time.perf_counter() - started_at
+            save_json(path=self.config.report_file, data=report)
+
+            logger.info(
+                f"Deduplication done in {report['seconds']:.1f}s: {report['rows_before']} -> {report['rows_after']} rows "
+                f"({report['reduction']:.1%} removed, {report['duplicate_groups']} groups)"
+            )
+
+        except Exception as e:
+            logger.exception(e)
+            raise e
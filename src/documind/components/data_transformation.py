@@ -1,8 +1,14 @@
 import os
+import json
+import shutil
+import hashlib
+import transformers
+from pathlib import Path
 from documind import logger
 from transformers import AutoTokenizer
 from datasets import load_dataset
 from documind.entity import DataTransformationConfig
+from documind.utils.common import get_file_hash, save_json
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
@@ -12,42 +18,78 @@ class DataTransformation:
     def convert_examples_to_features(self, example_batch):
         """
         Tokenizes the input text.
+        No padding here: DataCollatorWithPadding pads each batch at train/eval time.
         """
         return self.tokenizer(
             example_batch['text'],
-            padding='max_length',
             truncation=True,
-            max_length=512 # Standard BERT length
+            max_length=self.config.max_length # Standard BERT length
         )
 
+    def split_fingerprint(self, data_file: str) -> str:
+        """
+        Identifies one tokenized split: input data hash + tokenizer name, class and library version.
+        """
+        key = {
+            "data": get_file_hash(Path(data_file)),
+            "tokenizer": self.config.tokenizer_name,
+            "tokenizer_class": type(self.tokenizer).__name__,
+            "transformers": transformers.__version__,
+            "max_length": self.config.max_length
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
     def convert(self):
         try:
             logger.info("Loading validated data for transformation...")
-            
-            # We load the CSVs we saved in Stage 01
-            # Note: We look at the data_ingestion folder, not just the single file path in config
-            data_dir = os.path.dirname(self.config.data_path)
-            
+
+            # We load the columnar files we saved in Stage 01 (no CSV parsing for parquet)
+            data_dir = self.config.data_path
+            file_format = self.config.file_format
+
             data_files = {
-                "train": os.path.join(data_dir, "train.csv"),
-                "test": os.path.join(data_dir, "test.csv"),
-                "validation": os.path.join(data_dir, "validation.csv")
+                "train": os.path.join(data_dir, f"train.{file_format}"),
+                "test": os.path.join(data_dir, f"test.{file_format}"),
+                "validation": os.path.join(data_dir, f"validation.{file_format}")
             }
 
-            dataset = load_dataset("csv", data_files=data_files)
-            
-            logger.info(f"Data loaded. Rows: {dataset.num_rows}")
-            logger.info("Starting Tokenization (This may take a moment)...")
+            save_path = os.path.join(self.config.root_dir, "samsum_dataset")
+            fingerprints = {}
+            if os.path.exists(self.config.fingerprint_file):
+                with open(self.config.fingerprint_file) as f:
+                    fingerprints = json.load(f)
+
+            # Each split is saved on its own, so an unchanged split is never re-tokenized
+            for split, data_file in data_files.items():
+                split_path = os.path.join(save_path, split)
+                fingerprint = self.split_fingerprint(data_file)
 
-            # Map the tokenization function over the dataset
-            encoded_dataset = dataset.map(self.convert_examples_to_features, batched=True)
+                if fingerprints.get(split) == fingerprint and os.path.exists(split_path):
+                    logger.info(f"Split '{split}' unchanged, skipping tokenization.")
+                    continue
+
+                dataset = load_dataset(file_format, data_files={split: data_file}, split=split)
+                logger.info(f"Tokenizing '{split}' ({dataset.num_rows} rows, {self.config.num_proc} workers)...")
+
+                # Map the tokenization function over the dataset
+                encoded_dataset = dataset.map(
+                    self.convert_examples_to_features,
+                    batched=True,
+                    num_proc=self.config.num_proc if dataset.num_rows > self.config.num_proc else None,
+                    desc=f"Tokenizing {split}"
+                )
+
+                # Save the processed split to disk (Arrow format)
+                shutil.rmtree(split_path, ignore_errors=True)
+                encoded_dataset.save_to_disk(split_path)
+                fingerprints[split] = fingerprint
+
+            # Same layout as DatasetDict.save_to_disk, so load_from_disk keeps working downstream
+            save_json(path=Path(save_path, "dataset_dict.json"), data={"splits": list(data_files)})
+            save_json(path=self.config.fingerprint_file, data=fingerprints)
 
-            # Save the processed dataset to disk (Arrow format)
-            save_path = os.path.join(self.config.root_dir, "samsum_dataset")
-            encoded_dataset.save_to_disk(save_path)
-            
             logger.info(f"Transformation completed. Saved to {save_path}")
 
         except Exception as e:
             logger.exception(e)
-            raise e
\ No newline at end of file
+            raise e
@@ -1,4 +1,5 @@
 import os
+import pyarrow.parquet as pq
 import pandas as pd
 from documind import logger
 from documind.entity import DataValidationConfig
@@ -7,26 +8,38 @@ class DataValidation:
     def __init__(self, config: DataValidationConfig):
         self.config = config
 
+    def read_columns(self, file_path: str) -> list:
+        # Parquet keeps the schema in the footer, no need to read any rows
+        if file_path.endswith(".parquet"):
+            return pq.read_schema(file_path).names
+        return list(pd.read_csv(file_path, nrows=0).columns)
+
     def validate_all_columns(self) -> bool:
         try:
             validation_status = True
-            
-            # Read the ingested data
-            data = pd.read_csv(os.path.join("artifacts", "data_ingestion", "train.csv"))
-            all_cols = list(data.columns)
 
             # Fix: all_schema already contains the column names as keys
             schema_keys = self.config.all_schema.keys()
 
-            logger.info(f"Validating columns. Expected: {list(schema_keys)}, Found: {all_cols}")
-
-            for col in all_cols:
-                if col not in schema_keys:
+            for file_name in self.config.required_files:
+                file_path = os.path.join(self.config.data_dir, file_name)
+                if not os.path.exists(file_path):
                     validation_status = False
-                    logger.error(f"Validation Error: Column '{col}' is not defined in schema.yaml")
-                else:
-                    # Optional: Check data type consistency
-                    logger.info(f"Column '{col}' validated.")
+                    logger.error(f"Validation Error: Required file '{file_path}' is missing")
+                    continue
+
+                # Read the ingested data
+                all_cols = self.read_columns(file_path)
+
+                logger.info(f"Validating columns of {file_name}. Expected: {list(schema_keys)}, Found: {all_cols}")
+
+                for col in all_cols:
+                    if col not in schema_keys:
+                        validation_status = False
+                        logger.error(f"Validation Error: Column '{col}' is not defined in schema.yaml")
+                    else:
+                        # Optional: Check data type consistency
+                        logger.info(f"Column '{col}' validated.")
 
             # Write status to file
             with open(self.config.report_file, 'w') as f:
@@ -41,4 +54,4 @@ class DataValidation:
 
         except Exception as e:
             logger.exception(e)
-            raise e
\ No newline at end of file
+            raise e
@@ -0,0 +1,93 @@
+import re
+from documind.entity import DocumentSplitterConfig
+
+# Blank lines, or a line break followed by a clause heading such as
+# "12.", "12.3", "(a)", "Section 4" or "ARTICLE IV"
+CLAUSE_BOUNDARY = re.compile(
+    r"\n\s*\n|\n(?=\s*(?:\d+(?:\.\d+)*\.?\s|\([a-z0-9]{1,4}\)\s|section\s+\d+|article\s+[ivxlc\d]+))",
+    re.IGNORECASE
+)
+
+class DocumentSplitter:
+    """
+    Splits a full agreement into classifier-sized segments.
+
+    The text is first cut at clause boundaries. Any clause longer than the
+    classifier window is then cut into overlapping token windows, so nothing
+    past 512 tokens is silently dropped. Every segment keeps its character
+    span in the original document.
+    """
+
+    def __init__(self, tokenizer, config: DocumentSplitterConfig):
+        self.tokenizer = tokenizer
+        self.config = config
+        # Room for [CLS] and [SEP]
+        self.window_tokens = config.max_tokens - tokenizer.num_special_tokens_to_add()
+        if not 0 <= config.stride < self.window_tokens:
+            raise ValueError(f"stride ({config.stride}) must be >= 0 and < the {self.window_tokens} tokens of a window")
+
+    def split_clauses(self, document: str) -> list:
+        spans = []
+        start = 0
+        for match in CLAUSE_BOUNDARY.finditer(document):
+            spans.append((start, match.start()))
+            start = match.end()
+        spans.append((start, len(document)))
+
+        # Drop whitespace-only pieces and fold tiny fragments (headings, numbering) into the next clause
+        clauses = []
+        pending_start = None
+        for begin, end in spans:
+            text = document[begin:end]
+            if not text.strip():
+                continue
+            if pending_start is not None:
+                begin = pending_start
+                pending_start = None
+            if len(document[begin:end].strip()) < self.config.min_clause_chars:
+                pending_start = begin
+                continue
+            clauses.append((begin, end))
+
+        if pending_start is not None:
+            if clauses:
+                clauses[-1] = (clauses[-1][0], len(document))
+            else:
+                clauses.append((pending_start, len(document)))
+
+        return clauses
+
+    def split(self, document: str) -> list:
+        segments = []
+        for clause_index, (begin, end) in enumerate(self.split_clauses(document)):
+            clause = document[begin:end]
+            encoding = self.tokenizer(clause, add_special_tokens=False, return_offsets_mapping=True)
+            offsets = encoding["offset_mapping"]
+
+            if len(offsets) <= self.window_tokens:
+                segments.append({
+                    "clause": clause_index,
+                    "window": 0,
+                    "start": begin,
+                    "end": end,
+                    "text": clause.strip()
+                })
+                continue
+
+            # Overlapping windows, `stride` tokens shared between neighbours
+            step = self.window_tokens - self.config.stride
+            for window_index, first in enumerate(range(0, len(offsets), step)):
+                last = min(first + self.window_tokens, len(offsets)) - 1
+                char_start = begin + offsets[first][0]
+                char_end = begin + offsets[last][1]
+                segments.append({
+                    "clause": clause_index,
+                    "window": window_index,
+                    "start": char_start,
+                    "end": char_end,
+                    "text": document[char_start:char_end]
+                })
+                if last == len(offsets) - 1:
+                    break
+
+        return segments
@@ -1,61 +1,92 @@
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, pipeline
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, TextGenerationPipeline, pipeline
 from langchain_huggingface import HuggingFacePipeline, ChatHuggingFace
 from documind import logger
-import os
+from documind.config.configuration import ConfigurationManager
+from documind.components.prefix_caching_pipeline import PrefixCachingTextGenerationPipeline
+from documind.entity import LLMEngineConfig
+
+DTYPES = {"float16": torch.float16, "bfloat16": torch.bfloat16, "float32": torch.float32}
 
 class LLMEngine:
     _instance = None
     _pipeline = None
 
-    def __new__(cls):
+    def __new__(cls, config: LLMEngineConfig = None):
         if cls._instance is None:
             cls._instance = super(LLMEngine, cls).__new__(cls)
+            cls._instance.config = config or ConfigurationManager().get_llm_engine_config()
             cls._instance._initialize_model()
         return cls._instance
 
+    def _resolve_device(self) -> str:
+        if self.config.device == "auto":
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        return self.config.device
+
+    def _resolve_dtype(self, device: str) -> torch.dtype:
+        if self.config.dtype == "auto":
+            return torch.float16 if device == "cuda" else torch.float32
+        return DTYPES[self.config.dtype]
+
+    def _quantization_config(self, device: str, dtype: torch.dtype):
+        if self.config.quantization == "none":
+            return None
+        if device != "cuda":
+            logger.warning(f"{self.config.quantization} quantization needs bitsandbytes on CUDA, loading unquantized on {device}")
+            return None
+        if self.config.quantization == "8bit":
+            return BitsAndBytesConfig(load_in_8bit=True)
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=dtype,
+            bnb_4bit_use_double_quant=True,
+        )
+
     def _initialize_model(self):
         try:
-            logger.info("Initializing Qwen2.5-3B Agent (4-bit Quantization)...")
-            
-            # SWITCHING TO QWEN (More stable, Native Support)
-            model_id = "Qwen/Qwen2.5-3B-Instruct"
-            
-            # 1. Quantization Config
-            bnb_config = BitsAndBytesConfig(
-                load_in_4bit=True,
-                bnb_4bit_quant_type="nf4",
-                bnb_4bit_compute_dtype=torch.float16,
-                bnb_4bit_use_double_quant=True,
-            )
+            model_id = self.config.model_id
+            self.model_id = model_id
+            device = self._resolve_device()
+            dtype = self._resolve_dtype(device)
+            quantization_config = self._quantization_config(device, dtype)
+            logger.info(f"Initializing {model_id} Agent on {device} ({dtype}, quantization: {self.config.quantization if quantization_config else 'none'})...")
 
-            # 2. Load Tokenizer
+            # 1. Load Tokenizer
             tokenizer = AutoTokenizer.from_pretrained(model_id)
 
-            # 3. Load Model
-            # Note: We removed trust_remote_code=True because Qwen is native
+            # 2. Load Model
             model = AutoModelForCausalLM.from_pretrained(
                 model_id,
-                quantization_config=bnb_config,
-                device_map="cuda",
-                attn_implementation="eager" # Keeps it stable on Windows
+                quantization_config=quantization_config,
+                dtype=dtype,
+                device_map=device,
+                attn_implementation=self.config.attn_implementation
             )
+            # KV cache: each new token attends to cached keys/values instead of re-running the whole context
+            model.generation_config.use_cache = self.config.use_cache
+
+            # 3. Create Pipeline (the prefix-caching one reuses the shared system/tool prompt across calls)
+            if self.config.use_cache and self.config.prefix_cache:
+                pipeline_kwargs = {"pipeline_class": PrefixCachingTextGenerationPipeline, "min_prefix_tokens": self.config.min_prefix_tokens}
+            else:
+                pipeline_kwargs = {"pipeline_class": TextGenerationPipeline}
 
-            # 4. Create Pipeline
             text_generation_pipeline = pipeline(
                 "text-generation",
                 model=model,
                 tokenizer=tokenizer,
-                max_new_tokens=512,
-                model_kwargs={"use_cache": False}, # Disable cache explicitly
-                temperature=0.1,
-                do_sample=True,
-                return_full_text=False
+                max_new_tokens=self.config.max_new_tokens,
+                temperature=self.config.temperature,
+                do_sample=self.config.do_sample,
+                return_full_text=False,
+                **pipeline_kwargs
             )
 
-            # 5. Wrap in LangChain
+            # 4. Wrap in LangChain
             self._pipeline = HuggingFacePipeline(pipeline=text_generation_pipeline)
-            logger.info("Qwen2.5 Agent is ready.")
+            logger.info(f"{model_id} Agent is ready.")
 
         except Exception as e:
             logger.error(f"Failed to load LLM: {e}")
@@ -63,4 +94,4 @@ class LLMEngine:
 
     def get_llm(self):
         # Wrap in Chat Interface
-        return ChatHuggingFace(llm=self._pipeline)
\ No newline at end of file
+        return ChatHuggingFace(llm=self._pipeline)
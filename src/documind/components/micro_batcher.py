@@ -0,0 +1,82 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from documind import logger
+from documind.entity import MicroBatcherConfig
+from documind.utils.metrics import MICRO_BATCH_QUEUE_DEPTH, MICRO_BATCH_SIZE
+
+class MicroBatcher:
+    """
+    Collects concurrent classification calls into a single batched forward pass.
+
+    Callers block on `predict(text)`. A background worker waits for the first
+    request, then keeps gathering until either `max_batch_size` requests are
+    queued or `max_wait_ms` has passed, runs `predict_batch` once and hands
+    every caller its own result. Batch sizes and queue depth go to /metrics.
+    """
+
+    def __init__(self, predict_batch_fn, config: MicroBatcherConfig):
+        self.predict_batch_fn = predict_batch_fn
+        self.config = config
+
+        self._start_lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        self._pid = os.getpid()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="documind-micro-batcher", daemon=True)
+        self._worker.start()
+
+    def predict(self, text: str):
+        # Threads do not survive fork(): a batcher preloaded in a server master restarts its worker in each child
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+        future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _collect(self) -> list:
+        # 1. Block until there is at least one request
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.config.max_wait_ms / 1000.0
+
+        # 2. Keep gathering until the batch is full or the window closes
+        while len(items) < self.config.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            texts = [text for text, _ in items]
+
+            MICRO_BATCH_SIZE.observe(len(items))
+            MICRO_BATCH_QUEUE_DEPTH.set(self._queue.qsize())
+
+            # 3. One forward pass, results routed back to each caller
+            try:
+                results = list(self.predict_batch_fn(texts))
+                # A short result list would leave callers waiting forever
+                if len(results) != len(items):
+                    raise RuntimeError(f"predict_batch returned {len(results)} results for {len(items)} texts")
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(items)} failed: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(items, results):
+                future.set_result(result)
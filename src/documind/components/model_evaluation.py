@@ -1,8 +1,13 @@
+import time
+import numpy as np
 import torch
 import pandas as pd
 import mlflow
 import mlflow.pytorch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+from torch.utils.data import DataLoader
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, DataCollatorWithPadding
 from datasets import load_from_disk
 from documind.entity import ModelEvaluationConfig
 from documind.utils.common import save_json
@@ -16,59 +21,134 @@ class ModelEvaluation:
 
     def eval_metrics(self, actual, pred):
         accuracy = accuracy_score(actual, pred)
-        precision, recall, f1, _ = precision_recall_fscore_support(actual, pred, average='weighted')
+        precision, recall, f1, _ = precision_recall_fscore_support(actual, pred, average='weighted', zero_division=0)
         return accuracy, precision, recall, f1
 
+    def per_class_metrics(self, actual, pred, id2label: dict) -> dict:
+        label_ids = sorted(id2label)
+        precision, recall, f1, support = precision_recall_fscore_support(
+            actual, pred, labels=label_ids, average=None, zero_division=0
+        )
+        return {
+            id2label[label_id]: {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1": float(f1[i]),
+                "support": int(support[i])
+            }
+            for i, label_id in enumerate(label_ids)
+        }
+
+    def latency_profile(self, batch_latencies: list, batch_sizes: list, device: str) -> dict:
+        latencies_ms = np.array(batch_latencies) * 1000
+        total_seconds = float(np.sum(batch_latencies))
+        return {
+            "device": device,
+            "batch_size": self.config.eval_batch_size,
+            "num_batches": len(batch_latencies),
+            "num_examples": int(np.sum(batch_sizes)),
+            "total_seconds": total_seconds,
+            "examples_per_sec": float(np.sum(batch_sizes) / total_seconds) if total_seconds else 0.0,
+            "batch_latency_ms_mean": float(latencies_ms.mean()),
+            "batch_latency_ms_p50": float(np.percentile(latencies_ms, 50)),
+            "batch_latency_ms_p95": float(np.percentile(latencies_ms, 95))
+        }
+
     def evaluation(self):
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        
+
         # 1. Load Model & Tokenizer
         model = AutoModelForSequenceClassification.from_pretrained(self.config.model_path).to(device)
+        model.eval()
         tokenizer = AutoTokenizer.from_pretrained(self.config.tokenizer_path)
-        
+        id2label = {int(i): label for i, label in model.config.id2label.items()}
+
         # 2. Load Data
         dataset = load_from_disk(self.config.data_path)
         eval_dataset = dataset["test"] # Use test set for final evaluation
 
+        # Sort by length so every batch is padded only to similarly sized examples
+        lengths = eval_dataset.map(
+            lambda batch: {"length": [len(ids) for ids in batch["input_ids"]]},
+            batched=True,
+            remove_columns=eval_dataset.column_names
+        )["length"]
+        eval_dataset = eval_dataset.select(np.argsort(lengths, kind="stable"))
+        eval_dataset = eval_dataset.with_format("torch", columns=["input_ids", "attention_mask", "label"])
+
+        loader = DataLoader(
+            eval_dataset,
+            batch_size=self.config.eval_batch_size,
+            collate_fn=DataCollatorWithPadding(tokenizer=tokenizer)
+        )
+
         # 3. Batch Prediction
-        logger.info("Starting Batch Evaluation...")
+        logger.info(f"Starting Batch Evaluation (batch size {self.config.eval_batch_size}, device {device})...")
         predictions = []
         labels = []
+        batch_latencies = []
+        batch_sizes = []
+
+        with torch.inference_mode():
+            for batch in loader:
+                batch_labels = batch.pop("labels")
+                batch = {name: tensor.to(device) for name, tensor in batch.items()}
 
-        # We process in batches to avoid OOM on 6GB VRAM
-        batch_size = self.config.eval_batch_size
-        
-        # Simple loop for inference
-        for i in range(0, len(eval_dataset), batch_size):
-            batch = eval_dataset[i : i + batch_size]
-            
-            # Tokenize on the fly or use existing features (we have features)
-            input_ids = torch.tensor(batch["input_ids"]).to(device)
-            attention_mask = torch.tensor(batch["attention_mask"]).to(device)
-            
-            with torch.no_grad():
-                outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-            
-            logits = outputs.logits
-            preds = torch.argmax(logits, dim=1).cpu().numpy()
-            
-            predictions.extend(preds)
-            labels.extend(batch["label"])
+                started_at = time.perf_counter()
+                logits = model(**batch).logits
+                if device == "cuda":
+                    torch.cuda.synchronize()
+                batch_latencies.append(time.perf_counter() - started_at)
+                batch_sizes.append(len(batch_labels))
+
+                predictions.extend(torch.argmax(logits, dim=1).cpu().tolist())
+                labels.extend(batch_labels.tolist())
 
         # 4. Calculate Metrics
         accuracy, precision, recall, f1 = self.eval_metrics(labels, predictions)
-        
+        per_class = self.per_class_metrics(labels, predictions, id2label)
+        profile = self.latency_profile(batch_latencies, batch_sizes, device)
+
         # 5. Save locally
         scores = {"accuracy": accuracy, "f1": f1, "precision": precision, "recall": recall}
         save_json(path=Path(self.config.metric_file_name), data=scores)
-        
+        save_json(path=Path(self.config.per_class_metric_file), data=per_class)
+        save_json(path=Path(self.config.latency_profile_file), data=profile)
+
         # 6. Log to MLflow
-        mlflow.set_registry_uri("file://" + str(Path("mlruns").absolute())) # Local MLflow
+        mlflow.set_tracking_uri(self.config.tracking_uri)
+        mlflow.set_registry_uri(self.config.tracking_uri)
         mlflow.set_experiment("DocuMind-Classification")
-        
-        with mlflow.start_run():
+
+        with mlflow.start_run() as run:
             mlflow.log_params(self.config.__dict__)
             mlflow.log_metrics(scores)
-            # We don't log the full model to MLflow here to save space, but you can if needed
-            
-        logger.info(f"Evaluation completed. Metrics: {scores}")
\ No newline at end of file
+            mlflow.log_metrics({
+                "examples_per_sec": profile["examples_per_sec"],
+                "batch_latency_ms_p50": profile["batch_latency_ms_p50"],
+                "batch_latency_ms_p95": profile["batch_latency_ms_p95"]
+            })
+            mlflow.log_artifact(str(self.config.per_class_metric_file))
+            mlflow.log_artifact(str(self.config.latency_profile_file))
+
+            # Register the checkpoint so a running server can pick it up (see ModelRegistry).
+            # The checkpoint is logged as plain artifacts, not an MLflow flavor, so the
+            # version points at the run's artifact directory: MLflow 3 only resolves
+            # runs:/ URIs to logged models.
+            if self.config.registered_model_name:
+                mlflow.log_artifacts(str(self.config.model_path), artifact_path="model")
+                client = MlflowClient(tracking_uri=self.config.tracking_uri, registry_uri=self.config.tracking_uri)
+                try:
+                    client.create_registered_model(self.config.registered_model_name)
+                except MlflowException as e:
+                    if e.error_code != "RESOURCE_ALREADY_EXISTS":
+                        raise
+                version = client.create_model_version(
+                    self.config.registered_model_name,
+                    source=f"{run.info.artifact_uri}/model",
+                    run_id=run.info.run_id
+                )
+                logger.info(f"Registered {self.config.registered_model_name} version {version.version}")
+
+        logger.info(f"Evaluation completed. Metrics: {scores}")
+        logger.info(f"Throughput: {profile['examples_per_sec']:.1f} examples/sec, p50 {profile['batch_latency_ms_p50']:.1f} ms, p95 {profile['batch_latency_ms_p95']:.1f} ms per batch")
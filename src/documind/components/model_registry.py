@@ -0,0 +1,82 @@
+import time
+from pathlib import Path
+from documind import logger
+from documind.entity import ModelRegistryConfig
+from documind.utils.common import get_directory_fingerprint
+
+# An explicit reload fingerprints the watched directory twice, this far apart
+SETTLE_SECONDS = 1.0
+
+class ModelRegistry:
+    """
+    Tells the serving process which classifier version is the newest one and
+    where its files are.
+
+    source='path':   the version is the fingerprint of the watched checkpoint
+                     directory (the same id PredictionPipeline uses), reported
+                     only once it stopped changing between two polls (or
+                     between two looks SETTLE_SECONDS apart for an explicit reload).
+    source='mlflow': the newest version (or the one behind `model_alias`) of
+                     `model_name` in the local MLflow registry, downloaded to
+                     `download_dir/<version>`.
+    """
+
+    def __init__(self, config: ModelRegistryConfig):
+        self.config = config
+        self._last_seen = None
+
+        if config.source not in ("path", "mlflow"):
+            raise ValueError(f"Unknown model registry source '{config.source}'. Expected 'path' or 'mlflow'")
+
+    def _client(self):
+        from mlflow.tracking import MlflowClient
+        return MlflowClient(tracking_uri=self.config.tracking_uri, registry_uri=self.config.tracking_uri)
+
+    def latest_version(self, settle: bool = False):
+        """
+        Returns the version id that should be served, or None if there is none (yet).
+        `settle` checks for a finished checkpoint within this call instead of across polls.
+        """
+        if self.config.source == "path":
+            path = self.config.watch_path
+            if not (path / "config.json").exists():
+                return None
+            # The trainer may still be writing: wait until two polls agree
+            if settle:
+                self._last_seen = get_directory_fingerprint(path)
+                time.sleep(SETTLE_SECONDS)
+            fingerprint = get_directory_fingerprint(path)
+            stable = fingerprint == self._last_seen
+            self._last_seen = fingerprint
+            return fingerprint if stable else None
+
+        client = self._client()
+        if self.config.model_alias:
+            model_version = client.get_model_version_by_alias(self.config.model_name, self.config.model_alias)
+        else:
+            versions = client.search_model_versions(f"name='{self.config.model_name}'")
+            if not versions:
+                return None
+            model_version = max(versions, key=lambda v: int(v.version))
+        return f"{self.config.model_name}/{model_version.version}"
+
+    def fetch(self, version: str) -> Path:
+        """
+        Returns a local directory holding the checkpoint of `version`.
+        """
+        if self.config.source == "path":
+            return self.config.watch_path
+
+        import mlflow
+        number = version.rsplit("/", 1)[-1]
+        destination = self.config.download_dir / number
+        local_path = destination / "model"
+        if not (local_path / "config.json").exists():
+            source = self._client().get_model_version(self.config.model_name, number).source
+            logger.info(f"Downloading {version} from {source}...")
+            local_path = Path(mlflow.artifacts.download_artifacts(
+                artifact_uri=source,
+                dst_path=str(destination),
+                tracking_uri=self.config.tracking_uri
+            ))
+        return local_path
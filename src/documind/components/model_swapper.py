@@ -0,0 +1,146 @@
+import os
+import threading
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
+from documind import logger
+from documind.components.model_registry import ModelRegistry
+from documind.entity import PredictionConfig, ModelRegistryConfig
+from documind.pipeline.prediction import PredictionPipeline
+
+WARMUP_TEXTS = ["This Agreement shall be governed by the laws of the State of New York."]
+
+class ClassifierSwapper:
+    """
+    Holds the live classifier and swaps in new versions while requests keep flowing.
+
+    A new version is loaded and warmed up next to the live one; the swap itself
+    is a single reference assignment, so a request that already took
+    `current` finishes on the model it started with. The last `keep_versions`
+    models stay loaded for an instant rollback.
+
+    State is per process: under gunicorn every worker runs its own swapper and
+    watcher. Watchers converge on a new registry version on their own, but
+    reload and rollback only act on the worker that handled the call
+    (`status()` reports its pid). Roll a fleet back at the source instead:
+    move the model alias back, or restore the previous checkpoint.
+    """
+
+    def __init__(self, prediction_config: PredictionConfig, registry_config: ModelRegistryConfig):
+        self.prediction_config = prediction_config
+        self.registry_config = registry_config
+        self.registry = ModelRegistry(registry_config)
+
+        self.current = self._load(prediction_config.model_path)
+        self.history = deque(maxlen=registry_config.keep_versions)
+        # Versions that failed to load or were rolled back: the watcher leaves them alone
+        self.rejected = set()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self, model_path: Path, version: str = None) -> PredictionPipeline:
+        config = replace(self.prediction_config, model_path=Path(model_path))
+        # ONNX backends need the version's own graph: the configured one belongs to the startup model
+        if config.backend != "torch" and version is not None:
+            config = replace(config, **self._onnx_graphs(Path(model_path), version))
+        pipeline = PredictionPipeline(config, model_version=version)
+
+        # First forward pass allocates buffers: do it here, not on a request (bypasses the cache)
+        pipeline._predict_batch(WARMUP_TEXTS)
+        return pipeline
+
+    def _onnx_graphs(self, model_path: Path, version: str) -> dict:
+        """
+        Returns the ONNX graph paths for a version: the ones shipped in its
+        checkpoint directory, otherwise exported (and quantized) on load into
+        `download_dir/onnx/<version>`.
+        """
+        onnx_file = "model.onnx" if self.prediction_config.backend == "onnx" else "model-int8.onnx"
+        if (model_path / onnx_file).exists():
+            return {"onnx_model_path": model_path / "model.onnx", "onnx_int8_model_path": model_path / "model-int8.onnx"}
+
+        from documind.components.onnx_export import export_to_onnx, quantize_onnx
+
+        export_dir = self.registry_config.download_dir / "onnx" / version.replace("/", "_")
+        export_dir.mkdir(parents=True, exist_ok=True)
+        onnx_model_path, onnx_int8_model_path = export_dir / "model.onnx", export_dir / "model-int8.onnx"
+        # Written under a temporary name first: an interrupted export must not look finished
+        if not onnx_model_path.exists():
+            export_to_onnx(model_path, export_dir / "model.onnx.partial")
+            (export_dir / "model.onnx.partial").replace(onnx_model_path)
+        if self.prediction_config.backend == "onnx-int8" and not onnx_int8_model_path.exists():
+            quantize_onnx(onnx_model_path, export_dir / "model-int8.onnx.partial")
+            (export_dir / "model-int8.onnx.partial").replace(onnx_int8_model_path)
+        return {"onnx_model_path": onnx_model_path, "onnx_int8_model_path": onnx_int8_model_path}
+
+    def check(self, explicit: bool = False) -> bool:
+        """
+        Loads and swaps in the registry's newest version if it is not the live one.
+        `explicit` (POST /model/reload) does not wait for a second poll to see a finished checkpoint.
+        Returns True when a swap happened.
+        """
+        with self._lock:
+            version = self.registry.latest_version(settle=explicit)
+            if version is None or version == self.current.model_version or version in self.rejected:
+                return False
+
+            logger.info(f"New classifier version {version}, loading in the background...")
+            try:
+                pipeline = self._load(self.registry.fetch(version), version)
+            except Exception as e:
+                logger.error(f"Failed to load classifier version {version}: {e}")
+                self.rejected.add(version)
+                return False
+
+            previous = self.current
+            self.current = pipeline
+            self.history.append(previous)
+            logger.info(f"Classifier swapped: {previous.model_version} -> {pipeline.model_version}")
+            return True
+
+    def rollback(self) -> str:
+        """
+        Swaps the previous version back in and stops the watcher from re-loading the current one.
+        """
+        with self._lock:
+            if not self.history:
+                raise ValueError("No previous classifier version is loaded")
+
+            rolled_back = self.current
+            self.current = self.history.pop()
+            self.rejected.add(rolled_back.model_version)
+            logger.info(f"Classifier rolled back: {rolled_back.model_version} -> {self.current.model_version}")
+            return self.current.model_version
+
+    def watch(self):
+        """
+        Starts a daemon thread that polls the registry every `poll_seconds`.
+        """
+        if self.registry_config.poll_seconds <= 0 or self._thread is not None:
+            return
+
+        def poll():
+            while not self._stop.wait(self.registry_config.poll_seconds):
+                try:
+                    self.check()
+                except Exception as e:
+                    logger.error(f"Model registry poll failed: {e}")
+
+        self._thread = threading.Thread(target=poll, name="classifier-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.registry_config.source} registry every {self.registry_config.poll_seconds}s for new classifier versions")
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        return {
+            "worker_pid": os.getpid(),
+            "version": self.current.model_version,
+            "model_path": self.current.model_path,
+            "source": self.registry_config.source,
+            "previous": [pipeline.model_version for pipeline in self.history],
+            "rejected": sorted(self.rejected)
+        }
@@ -1,48 +1,113 @@
 
 import os
+import time
+from pathlib import Path
 from documind import logger
 from documind.entity import ModelTrainerConfig
-from transformers import AutoModelForSequenceClassification, AutoTokenizer, TrainingArguments, Trainer, DataCollatorWithPadding
+from documind.utils.common import load_json, save_json
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, TrainingArguments, Trainer, DataCollatorWithPadding, TrainerCallback
 from datasets import load_from_disk
 import torch
 
+class TimeBudgetCallback(TrainerCallback):
+    """
+    Stops training (and saves) once the wall-clock budget is used up.
+    """
+    def __init__(self, max_minutes: float):
+        self.max_seconds = max_minutes * 60
+        self.started_at = None
+
+    def on_train_begin(self, args, state, control, **kwargs):
+        self.started_at = time.perf_counter()
+
+    def on_step_end(self, args, state, control, **kwargs):
+        if time.perf_counter() - self.started_at > self.max_seconds:
+            logger.info(f"Time budget of {self.max_seconds / 60:.1f} min reached at step {state.global_step}, stopping.")
+            control.should_training_stop = True
+            control.should_save = True
+        return control
+
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
 
+    def resolve_precision(self, device: str) -> str:
+        """
+        Picks fp32 / bf16 / fp16 for this device; fp16 needs a GPU, so it falls back to fp32 on CPU.
+        """
+        precision = self.config.precision
+        if precision == "auto":
+            if device == "cuda":
+                return "bf16" if torch.cuda.is_bf16_supported() else "fp16"
+            return "fp32"
+        if precision == "fp16" and device != "cuda":
+            logger.warning("fp16 requested but no GPU is available, falling back to fp32.")
+            return "fp32"
+        return precision
+
     def train(self):
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Training on Device: {device}")
-        
+        precision = self.resolve_precision(device)
+        logger.info(f"Training on Device: {device} (precision: {precision})")
+
         # 1. Load the tokenizer and model
+        # The label map is baked into the saved config so serving never needs the dataset
+        label_names = list(load_json(self.config.label_file).names)
+        id2label = {i: label for i, label in enumerate(label_names)}
+        label2id = {label: i for i, label in id2label.items()}
+
         tokenizer = AutoTokenizer.from_pretrained(self.config.model_ckpt)
         model = AutoModelForSequenceClassification.from_pretrained(
-            self.config.model_ckpt, 
-            num_labels=100 # LEDGAR has ~100 classes
+            self.config.model_ckpt,
+            num_labels=len(label_names), # LEDGAR has 100 classes
+            id2label=id2label,
+            label2id=label2id
         ).to(device)
 
         # 2. Load the processed dataset
         dataset = load_from_disk(self.config.data_path)
+        train_lengths = dataset["train"].map(
+            lambda batch: {"length": [len(ids) for ids in batch["input_ids"]]},
+            batched=True,
+            remove_columns=dataset["train"].column_names
+        )["length"]
+        mean_tokens_per_sample = sum(train_lengths) / max(len(train_lengths), 1)
 
         # 3. Define Data Collator (Handles dynamic padding for batches)
         data_collator = DataCollatorWithPadding(tokenizer=tokenizer)
 
         # 4. Define Training Arguments
-        # We enforce FP16 to save memory on your RTX 3060
+        # Precision and throughput knobs come from params.yaml
+        # transformers 5 replaced group_by_length with train_sampling_strategy
+        if "train_sampling_strategy" in TrainingArguments.__dataclass_fields__:
+            sampling_kwargs = {"train_sampling_strategy": "group_by_length" if self.config.group_by_length else "random"}
+        else:
+            sampling_kwargs = {"group_by_length": self.config.group_by_length}
+
         args = TrainingArguments(
             output_dir=self.config.root_dir,
             num_train_epochs=self.config.num_train_epochs,
+            max_steps=self.config.max_steps,
             per_device_train_batch_size=self.config.per_device_train_batch_size,
+            gradient_accumulation_steps=self.config.gradient_accumulation_steps,
             learning_rate=self.config.learning_rate,
             weight_decay=self.config.weight_decay,
-            logging_steps=10,
+            dataloader_num_workers=self.config.dataloader_num_workers,
+            torch_compile=self.config.torch_compile,
+            logging_steps=self.config.logging_steps,
             eval_strategy="steps",
-            eval_steps=500,
-            save_steps=1000,
-            fp16=True, # <--- CRITICAL for 6GB VRAM
-            report_to="none" # We will add MLflow later
+            eval_steps=self.config.eval_steps,
+            save_steps=self.config.save_steps,
+            fp16=precision == "fp16",
+            bf16=precision == "bf16",
+            report_to="none", # We will add MLflow later
+            **sampling_kwargs
         )
 
+        callbacks = []
+        if self.config.max_train_minutes > 0:
+            callbacks.append(TimeBudgetCallback(self.config.max_train_minutes))
+
         # 5. Initialize Trainer
         trainer = Trainer(
             model=model,
@@ -50,13 +115,31 @@ class ModelTrainer:
             train_dataset=dataset["train"],
             eval_dataset=dataset["test"], # We use test as eval for this demo
             data_collator=data_collator,
+            callbacks=callbacks,
         )
 
         # 6. Start Training
         logger.info("Starting Training...")
-        trainer.train()
+        train_result = trainer.train()
+
+        # Throughput report: samples actually seen and their (unpadded) token count
+        runtime = train_result.metrics["train_runtime"]
+        # state.epoch is fractional (steps done / steps per epoch), so this counts every device and the last partial batch
+        samples_seen = round(trainer.state.epoch * len(dataset["train"]))
+        train_metrics = {
+            "device": device,
+            "precision": precision,
+            "global_steps": trainer.state.global_step,
+            "samples_seen": samples_seen,
+            "train_runtime_sec": runtime,
+            "train_loss": train_result.metrics.get("train_loss"),
+            "samples_per_sec": samples_seen / runtime if runtime else 0.0,
+            "tokens_per_sec": samples_seen * mean_tokens_per_sample / runtime if runtime else 0.0
+        }
+        save_json(path=Path(self.config.train_metrics_file), data=train_metrics)
+        logger.info(f"Training throughput: {train_metrics['samples_per_sec']:.1f} samples/sec, {train_metrics['tokens_per_sec']:.0f} tokens/sec")
 
         # 7. Save Model and Tokenizer
         logger.info(f"Saving model to {self.config.root_dir}")
         model.save_pretrained(os.path.join(self.config.root_dir, "bert-classifier"))
-        tokenizer.save_pretrained(os.path.join(self.config.root_dir, "bert-classifier"))
\ No newline at end of file
+        tokenizer.save_pretrained(os.path.join(self.config.root_dir, "bert-classifier"))
@@ -0,0 +1,124 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from documind.entity import NearDuplicateIndexConfig
+from documind.utils.minhash import MinHasher, lsh_bands, numbers
+from documind.utils.metrics import NEAR_DUPLICATE_LOOKUPS
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash LSH index over past audits.
+
+    Exact-hash caching misses boilerplate that only differs in party names,
+    dates or whitespace. This index returns a stored audit whose clause has an
+    estimated Jaccard similarity >= `threshold` with the new one and exactly
+    the same numbers: amounts, caps, terms and dates are what the audit is
+    about, so they are neither masked nor allowed to differ. Entries are
+    inserted one at a time into SQLite (signature + one row per LSH band), so
+    the index survives restarts and grows incrementally up to `max_entries`
+    per namespace (oldest dropped first). As with ResultCache, `namespace`
+    and `version` keep results of other modes/models apart; other versions'
+    rows are left for a rollback until eviction removes them.
+    """
+
+    def __init__(self, config: NearDuplicateIndexConfig, namespace: str, version: str):
+        self.config = config
+        self.namespace = namespace
+        self.version = version
+        self.hasher = MinHasher(config.num_perm, config.shingle_size, config.seed, mask_numbers=False)
+        self.bands, self.rows = lsh_bands(config.threshold, config.num_perm)
+
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(config.sqlite_path)), exist_ok=True)
+        self._connect()
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS audits ("
+            "id INTEGER PRIMARY KEY, namespace TEXT, version TEXT, signature BLOB, numbers TEXT, value TEXT, created_at REAL);"
+            "CREATE TABLE IF NOT EXISTS buckets (bucket TEXT, audit_id INTEGER);"
+            "CREATE INDEX IF NOT EXISTS buckets_bucket ON buckets (bucket);"
+            "CREATE INDEX IF NOT EXISTS buckets_audit ON buckets (audit_id);"
+        )
+        # Indexes from before numbers were compared: their rows (numbers NULL) never match again
+        if "numbers" not in [row[1] for row in self._db.execute("PRAGMA table_info(audits)")]:
+            self._db.execute("ALTER TABLE audits ADD COLUMN numbers TEXT")
+        self._db.commit()
+
+    def _connect(self):
+        self._pid = os.getpid()
+        self._db = sqlite3.connect(str(self.config.sqlite_path), check_same_thread=False)
+
+    def _check_fork(self):
+        # A SQLite connection must not be shared across fork(): each worker process opens its own
+        if self._pid != os.getpid():
+            self._connect()
+
+    def _bucket_keys(self, signature: np.ndarray) -> list:
+        # Namespace and version are part of the key, so candidates always match both
+        prefix = f"{self.namespace}|{self.version}|"
+        return [prefix + key for key in self.hasher.band_keys(signature, self.bands, self.rows)]
+
+    def find(self, text: str):
+        """
+        Returns {"value", "similarity", "audit_id"} for the most similar stored
+        audit at or above the threshold, or None.
+        """
+        signature = self.hasher.signature(text)
+        keys = self._bucket_keys(signature)
+
+        with self._lock:
+            self._check_fork()
+            rows = self._db.execute(
+                f"SELECT DISTINCT a.id, a.signature, a.value FROM buckets b JOIN audits a ON a.id = b.audit_id "
+                f"WHERE b.bucket IN ({','.join('?' * len(keys))}) AND a.numbers = ?",
+                keys + [json.dumps(numbers(text))]
+            ).fetchall()
+
+        best = None
+        for audit_id, stored, value in rows:
+            similarity = self.hasher.similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+            if similarity >= self.config.threshold and (best is None or similarity > best["similarity"]):
+                best = {"value": value, "similarity": similarity, "audit_id": audit_id}
+
+        NEAR_DUPLICATE_LOOKUPS.labels(mode=self.namespace, result="miss" if best is None else "hit").inc()
+        if best is None:
+            return None
+        best["value"] = json.loads(best["value"])
+        return best
+
+    def add(self, text: str, value) -> int:
+        """
+        Inserts one audit and its LSH buckets; returns its id.
+        """
+        signature = self.hasher.signature(text)
+        keys = self._bucket_keys(signature)
+
+        with self._lock:
+            self._check_fork()
+            audit_id = self._db.execute(
+                "INSERT INTO audits (namespace, version, signature, numbers, value, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, self.version, signature.tobytes(), json.dumps(numbers(text)), json.dumps(value), time.time())
+            ).lastrowid
+            self._db.executemany("INSERT INTO buckets VALUES (?, ?)", [(key, audit_id) for key in keys])
+            self._inserts += 1
+            if self._inserts % 100 == 0:
+                self._evict()
+            self._db.commit()
+        return audit_id
+
+    def _evict(self):
+        # Keep the newest max_entries audits of this namespace, whatever their version
+        row = self._db.execute(
+            "SELECT id FROM audits WHERE namespace = ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (self.namespace, self.config.max_entries)
+        ).fetchone()
+        if row is not None:
+            self._db.execute(
+                "DELETE FROM buckets WHERE audit_id IN (SELECT id FROM audits WHERE namespace = ? AND id <= ?)",
+                (self.namespace, row[0])
+            )
+            self._db.execute("DELETE FROM audits WHERE namespace = ? AND id <= ?", (self.namespace, row[0]))
@@ -0,0 +1,116 @@
+import os
+import numpy as np
+import torch
+from pathlib import Path
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from documind import logger
+from documind.entity import OnnxExportConfig
+from documind.utils.common import save_json
+
+def export_to_onnx(model_path: Path, onnx_model_path: Path, opset: int = 17):
+    """
+    Exports the classifier checkpoint at `model_path` to ONNX with dynamic batch and sequence axes.
+    """
+    logger.info(f"Exporting {model_path} to ONNX...")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    dummy = tokenizer(["This Agreement shall be governed by the laws of New York."], return_tensors="pt")
+
+    torch.onnx.export(
+        model,
+        (dummy["input_ids"], dummy["attention_mask"]),
+        str(onnx_model_path),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"}
+        },
+        opset_version=opset,
+        # TorchScript exporter: the dynamo one's graphs fail onnxruntime's shape inference when quantizing
+        dynamo=False
+    )
+    logger.info(f"ONNX model saved to {onnx_model_path}")
+
+def quantize_onnx(onnx_model_path: Path, onnx_int8_model_path: Path):
+    """
+    Dynamic int8 quantization of an exported graph (weights int8, activations quantized at runtime).
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    logger.info("Quantizing ONNX model to int8...")
+    quantize_dynamic(
+        str(onnx_model_path),
+        str(onnx_int8_model_path),
+        weight_type=QuantType.QInt8
+    )
+
+    fp32_mb = os.path.getsize(onnx_model_path) / 1024 ** 2
+    int8_mb = os.path.getsize(onnx_int8_model_path) / 1024 ** 2
+    logger.info(f"int8 model saved to {onnx_int8_model_path} ({fp32_mb:.0f} MB -> {int8_mb:.0f} MB)")
+
+class OnnxExport:
+    def __init__(self, config: OnnxExportConfig):
+        self.config = config
+
+    def export(self):
+        export_to_onnx(self.config.model_path, self.config.onnx_model_path, self.config.opset)
+
+    def quantize(self):
+        quantize_onnx(self.config.onnx_model_path, self.config.onnx_int8_model_path)
+
+    def parity_check(self, batch_size: int = 32) -> dict:
+        """
+        Compares predicted labels of the ONNX backends against the eager PyTorch model on the test split.
+        Raises RuntimeError when a backend agrees on fewer than `min_agreement` of them.
+        """
+        import onnxruntime as ort
+        from datasets import load_from_disk
+
+        tokenizer = AutoTokenizer.from_pretrained(self.config.model_path)
+        model = AutoModelForSequenceClassification.from_pretrained(self.config.model_path)
+        model.eval()
+
+        test_dataset = load_from_disk(self.config.data_path)["test"]
+        test_dataset = test_dataset.select(range(min(self.config.parity_samples, len(test_dataset))))
+        texts = test_dataset["text"]
+        gold = np.array(test_dataset["label"])
+
+        sessions = {
+            "onnx": ort.InferenceSession(str(self.config.onnx_model_path), providers=["CPUExecutionProvider"]),
+            "onnx-int8": ort.InferenceSession(str(self.config.onnx_int8_model_path), providers=["CPUExecutionProvider"])
+        }
+        predictions = {"torch": [], "onnx": [], "onnx-int8": []}
+
+        logger.info(f"Running parity check on {len(texts)} test examples...")
+        for i in range(0, len(texts), batch_size):
+            inputs = tokenizer(texts[i : i + batch_size], truncation=True, max_length=512, padding="longest", return_tensors="pt")
+
+            with torch.inference_mode():
+                predictions["torch"].extend(model(**inputs).logits.argmax(dim=1).tolist())
+
+            feeds = {name: inputs[name].numpy().astype(np.int64) for name in ("input_ids", "attention_mask")}
+            for backend, session in sessions.items():
+                logits = session.run(["logits"], feeds)[0]
+                predictions[backend].extend(logits.argmax(axis=1).tolist())
+
+        reference = np.array(predictions["torch"])
+        report = {"samples": len(texts), "accuracy": {"torch": float((reference == gold).mean())}, "agreement": {}}
+        for backend in sessions:
+            backend_preds = np.array(predictions[backend])
+            report["agreement"][backend] = float((backend_preds == reference).mean())
+            report["accuracy"][backend] = float((backend_preds == gold).mean())
+
+        save_json(path=Path(self.config.parity_report), data=report)
+        logger.info(f"Parity report: {report}")
+
+        # A broken or over-quantized graph must not ship: fail the export stage
+        failing = {backend: agreement for backend, agreement in report["agreement"].items() if agreement < self.config.min_agreement}
+        if failing:
+            details = ", ".join(f"'{backend}' {agreement:.2%}" for backend, agreement in failing.items())
+            raise RuntimeError(f"ONNX parity check failed (min agreement {self.config.min_agreement:.2%}): {details}")
+
+        return report
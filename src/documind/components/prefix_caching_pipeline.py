@@ -0,0 +1,70 @@
+import copy
+import threading
+from transformers import DynamicCache, TextGenerationPipeline
+from documind import logger
+
+def _crop_to(cache: DynamicCache, length: int):
+    # Negative counts remove that many tokens (positive values are deprecated in transformers 5)
+    extra = cache.get_seq_length() - length
+    if extra > 0:
+        cache.crop(-extra)
+
+class PrefixCachingTextGenerationPipeline(TextGenerationPipeline):
+    """
+    text-generation pipeline that reuses the KV cache of the prompt prefix it
+    shares with the previous call.
+
+    Every agent prompt starts with the same system prompt and tool
+    descriptions, and the second ReAct turn repeats the whole first turn. After
+    each generation the prompt part of the KV cache is kept; the next call
+    gets a deep copy cropped to the longest common token prefix, so only the
+    new tokens are prefilled. Single prompts only (batches run uncached).
+    """
+
+    def __init__(self, *args, min_prefix_tokens: int = 16, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_prefix_tokens = min_prefix_tokens
+        self._prefix_ids = None
+        self._prefix_cache = None
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "hits": 0, "reused_tokens": 0}
+
+    def _lookup(self, prompt_ids: list):
+        with self._lock:
+            self.stats["calls"] += 1
+            if self._prefix_ids is None:
+                return DynamicCache()
+
+            common = 0
+            for cached_id, prompt_id in zip(self._prefix_ids, prompt_ids):
+                if cached_id != prompt_id:
+                    break
+                common += 1
+            # generate() needs at least one uncached token to produce logits from
+            common = min(common, len(prompt_ids) - 1)
+            if common < self.min_prefix_tokens:
+                return DynamicCache()
+
+            cache = copy.deepcopy(self._prefix_cache)
+            _crop_to(cache, common)
+            self.stats["hits"] += 1
+            self.stats["reused_tokens"] += common
+
+        logger.debug(f"Prefix cache hit: {common}/{len(prompt_ids)} prompt tokens reused")
+        return cache
+
+    def _forward(self, model_inputs, **generate_kwargs):
+        input_ids = model_inputs.get("input_ids")
+        if input_ids is None or input_ids.shape[0] != 1 or "past_key_values" in generate_kwargs:
+            return super()._forward(model_inputs, **generate_kwargs)
+
+        prompt_ids = input_ids[0].tolist()
+        cache = self._lookup(prompt_ids)
+        output = super()._forward(model_inputs, past_key_values=cache, **generate_kwargs)
+
+        # generate() filled the cache in place with prompt + answer: keep the prompt part for the next call
+        _crop_to(cache, len(prompt_ids))
+        with self._lock:
+            self._prefix_ids = prompt_ids
+            self._prefix_cache = cache
+        return output
@@ -0,0 +1,332 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Optional
+import httpx
+from pydantic import PrivateAttr, SecretStr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, convert_to_openai_messages
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from documind import logger
+from documind.entity import RemoteLLMConfig
+from documind.utils.metrics import REMOTE_LLM_REQUEST_SECONDS, REMOTE_LLM_RETRIES
+
+# One INFO line per request from httpx is noise at agent throughput; failures are logged here
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Worth another attempt: the server is busy, restarting or behind a flaky proxy
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+class RemoteLLMError(Exception):
+    """Raised when the remote LLM answers with an error or keeps failing after all retries."""
+
+def _usage_metadata(usage: Optional[dict]):
+    if not usage:
+        return None
+    return {
+        "input_tokens": usage.get("prompt_tokens", 0),
+        "output_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0)
+    }
+
+def _to_ai_message(message: dict, usage: Optional[dict]) -> AIMessage:
+    tool_calls, invalid_tool_calls = [], []
+    for call in message.get("tool_calls") or []:
+        function = call.get("function", {})
+        try:
+            args = json.loads(function.get("arguments") or "{}")
+            tool_calls.append({"name": function.get("name"), "args": args, "id": call.get("id"), "type": "tool_call"})
+        except json.JSONDecodeError as e:
+            invalid_tool_calls.append({
+                "name": function.get("name"),
+                "args": function.get("arguments"),
+                "id": call.get("id"),
+                "error": str(e),
+                "type": "invalid_tool_call"
+            })
+    return AIMessage(
+        content=message.get("content") or "",
+        tool_calls=tool_calls,
+        invalid_tool_calls=invalid_tool_calls,
+        usage_metadata=_usage_metadata(usage)
+    )
+
+def _to_ai_message_chunk(delta: dict, usage: Optional[dict]) -> AIMessageChunk:
+    tool_call_chunks = [
+        {
+            "name": call.get("function", {}).get("name"),
+            "args": call.get("function", {}).get("arguments"),
+            "id": call.get("id"),
+            "index": call.get("index", 0)
+        }
+        for call in delta.get("tool_calls") or []
+    ]
+    return AIMessageChunk(
+        content=delta.get("content") or "",
+        tool_call_chunks=tool_call_chunks,
+        usage_metadata=_usage_metadata(usage)
+    )
+
+class RemoteChatModel(BaseChatModel):
+    """
+    Chat model served by an OpenAI-compatible endpoint (vLLM, TGI, llama.cpp server, ...).
+
+    All requests of the process go through one httpx.AsyncClient owned by a
+    private event loop thread, so its keep-alive connection pool is shared by
+    the agent worker threads and by async callers alike. At most
+    `max_concurrency` generations are in flight; failed attempts (connection
+    errors, timeouts, 429/5xx) are retried with exponential backoff and full
+    jitter, honouring Retry-After. A stream is only retried until its first chunk.
+    """
+
+    base_url: str
+    model: str
+    api_key: Optional[SecretStr] = None
+    connect_timeout_seconds: float = 5.0
+    timeout_seconds: float = 120.0
+    max_retries: int = 3
+    backoff_seconds: float = 0.5
+    max_backoff_seconds: float = 8.0
+    max_concurrency: int = 8
+    max_connections: int = 16
+    max_keepalive_connections: int = 8
+    keepalive_expiry_seconds: float = 30.0
+    max_tokens: int = 512
+    temperature: float = 0.1
+
+    _pid: Optional[int] = PrivateAttr(default=None)
+    _loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+    _client: Optional[httpx.AsyncClient] = PrivateAttr(default=None)
+    _semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _start_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_config(cls, config: RemoteLLMConfig) -> "RemoteChatModel":
+        api_key = os.environ.get(config.api_key_env) if config.api_key_env else None
+        return cls(
+            base_url=config.base_url,
+            model=config.model,
+            api_key=api_key,
+            connect_timeout_seconds=config.connect_timeout_seconds,
+            timeout_seconds=config.timeout_seconds,
+            max_retries=config.max_retries,
+            backoff_seconds=config.backoff_seconds,
+            max_backoff_seconds=config.max_backoff_seconds,
+            max_concurrency=config.max_concurrency,
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry_seconds=config.keepalive_expiry_seconds,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "documind-remote-openai"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"base_url": self.base_url, "model": self.model}
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        if isinstance(tool_choice, str) and tool_choice not in ("auto", "none", "required"):
+            tool_choice = {"type": "function", "function": {"name": tool_choice}}
+        if tool_choice is not None:
+            kwargs["tool_choice"] = tool_choice
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    # --- Client loop ---
+
+    def _start(self):
+        self._pid = os.getpid()
+        self._loop = asyncio.new_event_loop()
+        headers = {"Authorization": f"Bearer {self.api_key.get_secret_value()}"} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry_seconds
+            )
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        threading.Thread(target=self._loop.run_forever, name="documind-remote-llm", daemon=True).start()
+        logger.info(f"Remote LLM client for {self.model} at {self.base_url} (max {self.max_concurrency} in flight)")
+
+    def _submit(self, coroutine):
+        # The loop thread does not survive fork(): a model created before the fork starts a fresh client in each child
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def close(self):
+        """
+        Closes the pooled connections and stops the client loop.
+        """
+        if self._loop is None or self._pid != os.getpid():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._pid = None
+
+    # --- HTTP ---
+
+    def _payload(self, messages, stop, stream: bool, **kwargs) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": convert_to_openai_messages(messages),
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            **kwargs
+        }
+        if stop:
+            payload["stop"] = stop
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff_seconds)
+            except ValueError:
+                pass
+        # Full jitter: workers that failed together do not come back together
+        return random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+
+    async def _with_retries(self, send, can_retry=lambda: True):
+        """
+        Runs `send()` (one HTTP attempt returning a response whose body was
+        already handled) under the concurrency limit, retrying transient failures.
+        """
+        attempt = 0
+        while True:
+            response, error = None, None
+            started_at = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    response = await send()
+                if response.status_code < 400:
+                    REMOTE_LLM_REQUEST_SECONDS.labels(outcome="ok").observe(time.perf_counter() - started_at)
+                    return response
+                error = RemoteLLMError(f"Remote LLM answered {response.status_code}: {response.text[:200]}")
+                reason = str(response.status_code)
+                retryable = response.status_code in RETRY_STATUS_CODES
+            except httpx.TransportError as e:
+                error = RemoteLLMError(f"Remote LLM request failed: {type(e).__name__}: {e}")
+                reason = type(e).__name__
+                retryable = True
+            REMOTE_LLM_REQUEST_SECONDS.labels(outcome="error").observe(time.perf_counter() - started_at)
+
+            if not retryable or not can_retry() or attempt >= self.max_retries:
+                raise error
+            delay = self._backoff(attempt, response)
+            REMOTE_LLM_RETRIES.labels(reason=reason).inc()
+            logger.warning(f"{error} - retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _complete(self, payload: dict) -> dict:
+        async def send():
+            return await self._client.post("/chat/completions", json=payload)
+
+        return (await self._with_retries(send)).json()
+
+    async def _stream_to(self, payload: dict, emit):
+        """
+        Streams the completion, calling `emit(chunk_dict)` for every SSE event.
+        """
+        emitted = False
+
+        async def send():
+            nonlocal emitted
+            async with self._client.stream("POST", "/chat/completions", json=payload) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    return response
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    emit(json.loads(data))
+                    emitted = True
+                return response
+
+        await self._with_retries(send, can_retry=lambda: not emitted)
+
+    # --- LangChain interface ---
+
+    def _result(self, body: dict) -> ChatResult:
+        choice = body["choices"][0]
+        message = _to_ai_message(choice["message"], body.get("usage"))
+        return ChatResult(
+            generations=[ChatGeneration(message=message, generation_info={"finish_reason": choice.get("finish_reason")})],
+            llm_output={"model": body.get("model", self.model)}
+        )
+
+    @staticmethod
+    def _chunk(event: dict) -> Optional[ChatGenerationChunk]:
+        choices = event.get("choices") or []
+        if not choices and not event.get("usage"):
+            return None
+        delta = choices[0].get("delta", {}) if choices else {}
+        return ChatGenerationChunk(message=_to_ai_message_chunk(delta, event.get("usage")))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        payload = self._payload(messages, stop, stream=False, **kwargs)
+        return self._result(self._submit(self._complete(payload)).result())
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        payload = self._payload(messages, stop, stream=False, **kwargs)
+        return self._result(await asyncio.wrap_future(self._submit(self._complete(payload))))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        payload = self._payload(messages, stop, stream=True, **kwargs)
+        events = queue.Queue()
+        future = self._submit(self._stream_to(payload, events.put))
+        future.add_done_callback(lambda _: events.put(None))
+        try:
+            while (event := events.get()) is not None:
+                chunk = self._chunk(event)
+                if chunk is not None:
+                    if run_manager and chunk.message.content:
+                        run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+                    yield chunk
+            future.result()
+        finally:
+            future.cancel()
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        payload = self._payload(messages, stop, stream=True, **kwargs)
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def emit(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        future = self._submit(self._stream_to(payload, emit))
+        future.add_done_callback(lambda _: emit(None))
+        try:
+            while (event := await events.get()) is not None:
+                chunk = self._chunk(event)
+                if chunk is not None:
+                    if run_manager and chunk.message.content:
+                        await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+                    yield chunk
+            future.result()
+        finally:
+            future.cancel()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from documind.entity import ResultCacheConfig
+from documind.utils.metrics import RESULT_CACHE_LOOKUPS
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form used for cache keys: NFKC, collapsed whitespace, stripped.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+class ResultCache:
+    """
+    Content-addressed cache for model outputs.
+
+    Keys are a SHA-256 over the normalized text, the cache namespace and a
+    version string (model checkpoint fingerprint, prompt version, ...), so a
+    new checkpoint or prompt never serves stale results. Entries live in an
+    in-memory LRU tier and, when `sqlite_path` is set, in a persistent SQLite
+    tier. Both tiers honour the TTL and their own size limit; rows of other
+    versions stay (a rollback or another backend may still use them) until
+    that eviction removes them. Lookups are counted on /metrics.
+    """
+
+    def __init__(self, config: ResultCacheConfig, namespace: str, version: str):
+        self.config = config
+        self.namespace = namespace
+        self.version = version
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        self._writes = 0
+        if config.sqlite_path:
+            os.makedirs(os.path.dirname(os.path.abspath(config.sqlite_path)), exist_ok=True)
+            self._connect()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, namespace TEXT, version TEXT, "
+                "value TEXT, expires_at REAL, last_access REAL)"
+            )
+            self._db.commit()
+
+    def _connect(self):
+        self._pid = os.getpid()
+        self._db = sqlite3.connect(str(self.config.sqlite_path), check_same_thread=False)
+
+    def _check_fork(self):
+        # A SQLite connection must not be shared across fork(): each worker process opens its own
+        if self._db is not None and self._pid != os.getpid():
+            self._connect()
+
+    def key(self, text: str) -> str:
+        payload = "\0".join([self.namespace, self.version, normalize_text(text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str):
+        key = self.key(text)
+        now = time.time()
+
+        with self._lock:
+            self._check_fork()
+
+            # 1. Memory tier
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    RESULT_CACHE_LOOKUPS.labels(namespace=self.namespace, result="memory").inc()
+                    return value
+                del self._memory[key]
+
+            # 2. Persistent tier
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1])
+                        RESULT_CACHE_LOOKUPS.labels(namespace=self.namespace, result="disk").inc()
+                        return value
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+
+            RESULT_CACHE_LOOKUPS.labels(namespace=self.namespace, result="miss").inc()
+            return None
+
+    def set(self, text: str, value):
+        key = self.key(text)
+        now = time.time()
+        expires_at = now + self.config.ttl_seconds
+
+        with self._lock:
+            self._check_fork()
+            self._remember(key, value, expires_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, self.namespace, self.version, json.dumps(value), expires_at, now)
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._evict_disk()
+                self._db.commit()
+
+    def _evict_disk(self):
+        # Size-based eviction: drop the least recently used rows of this namespace (any version)
+        self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        self._db.execute(
+            "DELETE FROM results WHERE namespace = ? AND key NOT IN ("
+            "SELECT key FROM results WHERE namespace = ? ORDER BY last_access DESC LIMIT ?)",
+            (self.namespace, self.namespace, self.config.sqlite_max_entries)
+        )
+
+    def _remember(self, key: str, value, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.max_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from documind import logger
+from documind.entity import WorkerPoolConfig
+from documind.utils.metrics import QUEUE_WAIT_SECONDS
+
+class QueueFullError(Exception):
+    """Raised when the pool already holds max_concurrency + max_queue jobs."""
+
+class AgentWorkerPool:
+    """
+    Runs blocking agent calls off the event loop on a bounded thread pool.
+
+    At most `max_concurrency` jobs run at once and at most `max_queue` more may
+    wait for a worker. Anything beyond that is rejected straight away with
+    QueueFullError so the API can answer with 429 instead of piling up work.
+    """
+
+    def __init__(self, config: WorkerPoolConfig):
+        self.config = config
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.max_concurrency,
+            thread_name_prefix="documind-agent"
+        )
+        self._capacity = config.max_concurrency + config.max_queue
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> asyncio.Future:
+        """
+        Reserves a slot and schedules fn(*args) on the pool.
+        Raises QueueFullError immediately when the pool is saturated.
+        The returned future resolves to (result, timing) where timing holds
+        queue_wait_ms and run_time_ms.
+        """
+        with self._lock:
+            if self._pending >= self._capacity:
+                raise QueueFullError(f"Agent queue is full ({self._pending} jobs pending)")
+            self._pending += 1
+
+        timing = {}
+        submitted_at = time.perf_counter()
+
+        def _job():
+            started_at = time.perf_counter()
+            timing["queue_wait_ms"] = (started_at - submitted_at) * 1000
+            QUEUE_WAIT_SECONDS.observe(started_at - submitted_at)
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args), timing
+            finally:
+                timing["run_time_ms"] = (time.perf_counter() - started_at) * 1000
+                with self._lock:
+                    self._running -= 1
+                logger.info(f"Agent job done. Queue wait: {timing['queue_wait_ms']:.1f} ms, run time: {timing['run_time_ms']:.1f} ms")
+
+        released = threading.Event()
+
+        def _release(_=None):
+            # Runs when the job finishes, and also when it is cancelled while still queued
+            # (client disconnect, shutdown): _job never runs then, the slot must still come back
+            with self._lock:
+                if not released.is_set():
+                    released.set()
+                    self._pending -= 1
+
+        try:
+            future = self._executor.submit(_job)
+        except RuntimeError:
+            _release()
+            raise
+        future.add_done_callback(_release)
+        return asyncio.wrap_future(future)
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) on the pool and waits for it.
+        Returns (result, timing).
+        """
+        return await self.submit(fn, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_concurrency": self.config.max_concurrency,
+                "max_queue": self.config.max_queue,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -1,8 +1,13 @@
 from documind.constants import *
-from documind.utils.common import read_yaml, create_directories
+from documind.utils.common import read_yaml, create_directories, get_tracking_uri
 from documind.entity import DataIngestionConfig, DataValidationConfig, DataTransformationConfig
+from documind.entity import DataDeduplicationConfig
 from documind.entity import ModelTrainerConfig
 from documind.entity import ModelEvaluationConfig
+from documind.entity import MicroBatcherConfig, WorkerPoolConfig, ResultCacheConfig, ServingConfig
+from documind.entity import NearDuplicateIndexConfig, LLMEngineConfig, RemoteLLMConfig
+from documind.entity import DocumentSplitterConfig, PredictionConfig, OnnxExportConfig, ModelRegistryConfig
+from documind.entity import BulkAuditConfig
 from pathlib import Path
 
 class ConfigurationManager:
@@ -26,7 +31,11 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             dataset_name=config.dataset_name,
             subset_name=config.subset_name,
-            local_data_file=Path(config.local_data_file)
+            local_data_file=Path(config.local_data_file),
+            label_file=Path(config.label_file),
+            split_sizes=dict(config.split_sizes),
+            file_format=config.file_format,
+            chunk_size=int(config.chunk_size)
         )
 
         return data_ingestion_config
@@ -41,22 +50,55 @@ class ConfigurationManager:
         data_validation_config = DataValidationConfig(
             root_dir=Path(config.root_dir),
             report_file=Path(config.report_file),
-            required_files=config.required_files,
+            data_dir=Path(config.data_dir),
+            required_files=[f"{split}.{self.config.data_ingestion.file_format}" for split in config.required_splits],
             all_schema=schema
         )
 
         return data_validation_config
     
     # Add this method inside ConfigurationManager class
+    def get_data_deduplication_config(self) -> DataDeduplicationConfig:
+        config = self.config.data_deduplication
+
+        create_directories([config.root_dir])
+
+        data_deduplication_config = DataDeduplicationConfig(
+            root_dir=Path(config.root_dir),
+            data_dir=Path(config.data_dir),
+            # Reads and writes the files exactly as ingestion wrote them
+            file_format=self.config.data_ingestion.file_format,
+            enabled=bool(config.enabled),
+            mode=config.mode,
+            split_priority=tuple(config.split_priority),
+            threshold=float(config.threshold),
+            num_perm=int(config.num_perm),
+            shingle_size=int(config.shingle_size),
+            seed=int(config.seed),
+            report_file=Path(config.report_file)
+        )
+
+        return data_deduplication_config
+
     def get_data_transformation_config(self) -> DataTransformationConfig:
         config = self.config.data_transformation
+        params = self.params.TrainingArguments
 
         create_directories([config.root_dir])
 
+        # With deduplication on, the deduplicated splits replace the ingested ones
+        data_path = config.data_path
+        if self.config.data_deduplication.enabled:
+            data_path = self.config.data_deduplication.root_dir
+
         data_transformation_config = DataTransformationConfig(
             root_dir=Path(config.root_dir),
-            data_path=Path(config.data_path),
-            tokenizer_name=config.tokenizer_name
+            data_path=Path(data_path),
+            file_format=self.config.data_ingestion.file_format,
+            tokenizer_name=config.tokenizer_name,
+            max_length=int(params.max_length),
+            num_proc=int(config.num_proc),
+            fingerprint_file=Path(config.fingerprint_file)
         )
 
         return data_transformation_config
@@ -72,17 +114,29 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             data_path=Path(config.data_path),
             model_ckpt=config.model_ckpt,
+            label_file=Path(config.label_file),
+            train_metrics_file=Path(config.train_metrics_file),
             num_train_epochs=int(params.epochs),
             per_device_train_batch_size=int(params.batch_size),
             weight_decay=float(params.weight_decay),
-            learning_rate=float(params.learning_rate)
+            learning_rate=float(params.learning_rate),
+            precision=params.precision,
+            gradient_accumulation_steps=int(params.gradient_accumulation_steps),
+            group_by_length=bool(params.group_by_length),
+            dataloader_num_workers=int(params.dataloader_num_workers),
+            torch_compile=bool(params.torch_compile),
+            max_steps=int(params.max_steps),
+            max_train_minutes=float(params.max_train_minutes),
+            logging_steps=int(params.logging_steps),
+            eval_steps=int(params.eval_steps),
+            save_steps=int(params.save_steps)
         )
 
         return model_trainer_config
     
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         config = self.config.model_evaluation
-        params = self.params.TrainingArguments
+        params = self.params.EvaluationArguments
 
         create_directories([config.root_dir])
 
@@ -92,7 +146,204 @@ class ConfigurationManager:
             model_path=Path(config.model_path),
             tokenizer_path=Path(config.model_path), # Tokenizer is saved with model
             metric_file_name=Path(config.metric_file_name),
-            eval_batch_size=params.batch_size
+            per_class_metric_file=Path(config.per_class_metric_file),
+            latency_profile_file=Path(config.latency_profile_file),
+            eval_batch_size=int(params.batch_size),
+            registered_model_name=config.get("registered_model_name"),
+            # Runs and registered versions go where the serving registry looks for them
+            tracking_uri=get_tracking_uri(self.config.model_registry.tracking_uri)
+        )
+
+        return model_evaluation_config
+
+    def get_prediction_config(self) -> PredictionConfig:
+        config = self.config.prediction
+
+        prediction_config = PredictionConfig(
+            model_path=Path(config.model_path),
+            backend=config.backend,
+            onnx_model_path=Path(config.onnx_model_path),
+            onnx_int8_model_path=Path(config.onnx_int8_model_path),
+            max_length=int(config.max_length),
+            batch_size=int(config.batch_size)
+        )
+
+        return prediction_config
+
+    def get_model_registry_config(self) -> ModelRegistryConfig:
+        config = self.config.model_registry
+
+        model_registry_config = ModelRegistryConfig(
+            source=config.source,
+            watch_path=Path(self.config.prediction.model_path),
+            tracking_uri=get_tracking_uri(config.tracking_uri),
+            model_name=config.model_name,
+            model_alias=config.model_alias,
+            download_dir=Path(config.download_dir),
+            poll_seconds=float(config.poll_seconds),
+            keep_versions=int(config.keep_versions)
+        )
+
+        return model_registry_config
+
+    def get_onnx_export_config(self) -> OnnxExportConfig:
+        config = self.config.onnx_export
+
+        create_directories([config.root_dir])
+
+        onnx_export_config = OnnxExportConfig(
+            root_dir=Path(config.root_dir),
+            model_path=Path(config.model_path),
+            data_path=Path(config.data_path),
+            onnx_model_path=Path(config.onnx_model_path),
+            onnx_int8_model_path=Path(config.onnx_int8_model_path),
+            parity_report=Path(config.parity_report),
+            parity_samples=int(config.parity_samples),
+            min_agreement=float(config.min_agreement),
+            opset=int(config.opset)
+        )
+
+        return onnx_export_config
+
+    def get_llm_engine_config(self) -> LLMEngineConfig:
+        config = self.config.llm_engine
+
+        llm_engine_config = LLMEngineConfig(
+            backend=config.backend,
+            model_id=config.model_id,
+            device=config.device,
+            dtype=config.dtype,
+            quantization=config.quantization,
+            attn_implementation=config.attn_implementation,
+            use_cache=bool(config.use_cache),
+            prefix_cache=bool(config.prefix_cache),
+            min_prefix_tokens=int(config.min_prefix_tokens),
+            max_new_tokens=int(config.max_new_tokens),
+            temperature=float(config.temperature),
+            do_sample=bool(config.do_sample)
+        )
+
+        return llm_engine_config
+
+    def get_remote_llm_config(self) -> RemoteLLMConfig:
+        config = self.config.remote_llm
+
+        remote_llm_config = RemoteLLMConfig(
+            base_url=config.base_url.rstrip("/"),
+            model=config.model,
+            api_key_env=config.api_key_env,
+            connect_timeout_seconds=float(config.connect_timeout_seconds),
+            timeout_seconds=float(config.timeout_seconds),
+            max_retries=int(config.max_retries),
+            backoff_seconds=float(config.backoff_seconds),
+            max_backoff_seconds=float(config.max_backoff_seconds),
+            max_concurrency=int(config.max_concurrency),
+            max_connections=int(config.max_connections),
+            max_keepalive_connections=int(config.max_keepalive_connections),
+            keepalive_expiry_seconds=float(config.keepalive_expiry_seconds),
+            max_tokens=int(config.max_tokens),
+            temperature=float(config.temperature)
+        )
+
+        return remote_llm_config
+
+    def get_micro_batcher_config(self) -> MicroBatcherConfig:
+        config = self.config.micro_batcher
+
+        micro_batcher_config = MicroBatcherConfig(
+            max_batch_size=int(config.max_batch_size),
+            max_wait_ms=float(config.max_wait_ms)
+        )
+
+        return micro_batcher_config
+
+    def get_worker_pool_config(self) -> WorkerPoolConfig:
+        config = self.config.worker_pool
+
+        worker_pool_config = WorkerPoolConfig(
+            max_concurrency=int(config.max_concurrency),
+            max_queue=int(config.max_queue),
+            retry_after_seconds=int(config.retry_after_seconds)
+        )
+
+        return worker_pool_config
+
+    def get_serving_config(self) -> ServingConfig:
+        config = self.config.serving
+
+        serving_config = ServingConfig(
+            host=config.host,
+            port=int(config.port),
+            workers=int(config.workers),
+            preload_classifier=bool(config.preload_classifier),
+            warmup_agent=bool(config.warmup_agent),
+            torch_threads_per_worker=int(config.torch_threads_per_worker),
+            timeout=int(config.timeout)
+        )
+
+        return serving_config
+
+    def get_result_cache_config(self) -> ResultCacheConfig:
+        config = self.config.result_cache
+
+        result_cache_config = ResultCacheConfig(
+            enabled=bool(config.enabled),
+            max_entries=int(config.max_entries),
+            ttl_seconds=int(config.ttl_seconds),
+            sqlite_path=Path(config.sqlite_path) if config.sqlite_path else None,
+            sqlite_max_entries=int(config.sqlite_max_entries)
+        )
+
+        return result_cache_config
+
+    def get_near_duplicate_index_config(self) -> NearDuplicateIndexConfig:
+        config = self.config.near_duplicate_index
+
+        near_duplicate_index_config = NearDuplicateIndexConfig(
+            enabled=bool(config.enabled),
+            sqlite_path=Path(config.sqlite_path),
+            max_entries=int(config.max_entries),
+            threshold=float(config.threshold),
+            num_perm=int(config.num_perm),
+            shingle_size=int(config.shingle_size),
+            seed=int(config.seed)
+        )
+
+        return near_duplicate_index_config
+
+    def get_document_splitter_config(self) -> DocumentSplitterConfig:
+        config = self.config.document_splitter
+
+        # Windows advance by max_tokens - stride tokens: a non-positive step yields no segments
+        if not 0 <= int(config.stride) < int(config.max_tokens):
+            raise ValueError(f"document_splitter.stride must be >= 0 and < max_tokens ({config.max_tokens}), got {config.stride}")
+
+        document_splitter_config = DocumentSplitterConfig(
+            max_tokens=int(config.max_tokens),
+            stride=int(config.stride),
+            min_clause_chars=int(config.min_clause_chars),
+            batch_size=int(config.batch_size)
+        )
+
+        return document_splitter_config
+
+    def get_bulk_audit_config(self, input_path: Path, output_path: Path, resume: bool = True, **overrides) -> BulkAuditConfig:
+        config = self.config.bulk_audit
+        # Command line values win over config.yaml (None means "not given")
+        values = {key: value for key, value in config.items()}
+        values.update({key: value for key, value in overrides.items() if value is not None})
+
+        bulk_audit_config = BulkAuditConfig(
+            input_path=Path(input_path),
+            output_path=Path(output_path),
+            output_format=values["output_format"],
+            id_field=values["id_field"],
+            text_field=values["text_field"],
+            chunk_size=int(values["chunk_size"]),
+            workers=int(values["workers"]),
+            agent_labels=tuple(values["agent_labels"]),
+            include_text=bool(values["include_text"]),
+            resume=resume
         )
 
-        return model_evaluation_config
\ No newline at end of file
+        return bulk_audit_config
\ No newline at end of file
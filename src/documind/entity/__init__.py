@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 @dataclass(frozen=True)
 class DataIngestionConfig:
@@ -7,29 +8,64 @@ class DataIngestionConfig:
     dataset_name: str
     subset_name: str
     local_data_file: Path
+    label_file: Path
+    split_sizes: dict
+    file_format: str
+    chunk_size: int
     
 @dataclass(frozen=True)
 class DataValidationConfig:
     root_dir: Path
     report_file: Path
+    data_dir: Path
     required_files: list
     all_schema: dict
     
+@dataclass(frozen=True)
+class DataDeduplicationConfig:
+    root_dir: Path
+    data_dir: Path
+    file_format: str
+    enabled: bool
+    mode: str
+    split_priority: tuple
+    threshold: float
+    num_perm: int
+    shingle_size: int
+    seed: int
+    report_file: Path
+
 @dataclass(frozen=True)
 class DataTransformationConfig:
     root_dir: Path
     data_path: Path
+    file_format: str
     tokenizer_name: str
+    max_length: int
+    num_proc: int
+    fingerprint_file: Path
     
 @dataclass(frozen=True)
 class ModelTrainerConfig:
     root_dir: Path
     data_path: Path
     model_ckpt: str
+    label_file: Path
+    train_metrics_file: Path
     num_train_epochs: int
     per_device_train_batch_size: int
     weight_decay: float
     learning_rate: float
+    precision: str
+    gradient_accumulation_steps: int
+    group_by_length: bool
+    dataloader_num_workers: int
+    torch_compile: bool
+    max_steps: int
+    max_train_minutes: float
+    logging_steps: int
+    eval_steps: int
+    save_steps: int
     
 @dataclass(frozen=True)
 class ModelEvaluationConfig:
@@ -38,4 +74,132 @@ class ModelEvaluationConfig:
     model_path: Path
     tokenizer_path: Path
     metric_file_name: Path
-    eval_batch_size: int
\ No newline at end of file
+    per_class_metric_file: Path
+    latency_profile_file: Path
+    eval_batch_size: int
+    registered_model_name: Optional[str]
+    tracking_uri: str
+
+@dataclass(frozen=True)
+class LLMEngineConfig:
+    backend: str
+    model_id: str
+    device: str
+    dtype: str
+    quantization: str
+    attn_implementation: str
+    use_cache: bool
+    prefix_cache: bool
+    min_prefix_tokens: int
+    max_new_tokens: int
+    temperature: float
+    do_sample: bool
+
+@dataclass(frozen=True)
+class RemoteLLMConfig:
+    base_url: str
+    model: str
+    api_key_env: str
+    connect_timeout_seconds: float
+    timeout_seconds: float
+    max_retries: int
+    backoff_seconds: float
+    max_backoff_seconds: float
+    max_concurrency: int
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    max_tokens: int
+    temperature: float
+
+@dataclass(frozen=True)
+class MicroBatcherConfig:
+    max_batch_size: int
+    max_wait_ms: float
+
+@dataclass(frozen=True)
+class WorkerPoolConfig:
+    max_concurrency: int
+    max_queue: int
+    retry_after_seconds: int
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    host: str
+    port: int
+    workers: int
+    preload_classifier: bool
+    warmup_agent: bool
+    torch_threads_per_worker: int
+    timeout: int
+
+@dataclass(frozen=True)
+class ResultCacheConfig:
+    enabled: bool
+    max_entries: int
+    ttl_seconds: int
+    sqlite_path: Optional[Path]
+    sqlite_max_entries: int
+
+@dataclass(frozen=True)
+class NearDuplicateIndexConfig:
+    enabled: bool
+    sqlite_path: Path
+    max_entries: int
+    threshold: float
+    num_perm: int
+    shingle_size: int
+    seed: int
+
+@dataclass(frozen=True)
+class DocumentSplitterConfig:
+    max_tokens: int
+    stride: int
+    min_clause_chars: int
+    batch_size: int
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    model_path: Path
+    backend: str
+    onnx_model_path: Path
+    onnx_int8_model_path: Path
+    max_length: int
+    batch_size: int
+
+@dataclass(frozen=True)
+class ModelRegistryConfig:
+    source: str
+    watch_path: Path
+    tracking_uri: str
+    model_name: str
+    model_alias: Optional[str]
+    download_dir: Path
+    poll_seconds: float
+    keep_versions: int
+
+@dataclass(frozen=True)
+class OnnxExportConfig:
+    root_dir: Path
+    model_path: Path
+    data_path: Path
+    onnx_model_path: Path
+    onnx_int8_model_path: Path
+    parity_report: Path
+    parity_samples: int
+    min_agreement: float
+    opset: int
+
+@dataclass(frozen=True)
+class BulkAuditConfig:
+    input_path: Path
+    output_path: Path
+    output_format: str
+    id_field: str
+    text_field: str
+    chunk_size: int
+    workers: int
+    agent_labels: tuple
+    include_text: bool
+    resume: bool
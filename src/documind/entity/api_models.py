@@ -1,10 +1,55 @@
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+# LEDGAR has 100 clause types; more than that is never a meaningful ranking
+MAX_TOP_K = 100
 
 class DocumentRequest(BaseModel):
     text: str
+    # classify: classifier only (no LLM), classify+summary: one LLM call, full_agent: ReAct agent
+    mode: Literal["classify", "classify+summary", "full_agent"] = "full_agent"
+    top_k: int = Field(5, ge=1, le=MAX_TOP_K)
+    # full_agent only: return every agent step (LLM turns, tool calls) with timings and tokens
+    trace: bool = False
+
+    @model_validator(mode="after")
+    def check_trace(self):
+        # The other modes have no agent steps to trace: say so instead of silently ignoring the flag
+        if self.trace and self.mode != "full_agent":
+            raise ValueError(f"trace is only available in mode='full_agent', not '{self.mode}'")
+        return self
+
+class LabelScore(BaseModel):
+    label: str
+    score: float
+
+class AgentStep(BaseModel):
+    step: int
+    kind: Literal["llm", "tool"]
+    name: str
+    offset_ms: float
+    duration_ms: float
+    tokens_in: Optional[int] = None
+    tokens_out: Optional[int] = None
+    tool_calls: Optional[List[str]] = None
+    input: Optional[str] = None
+    output: Optional[str] = None
+    error: Optional[str] = None
 
 class AuditResponse(BaseModel):
     filename: str = "input_text"
+    mode: str = "full_agent"
     classification: str = "Unknown"
-    risk_analysis: str
-    raw_agent_output: str
\ No newline at end of file
+    top_k: Optional[List[LabelScore]] = None
+    risk_analysis: str = ""
+    raw_agent_output: str = ""
+    classify_ms: Optional[float] = None
+    queue_wait_ms: Optional[float] = None
+    run_time_ms: Optional[float] = None
+    # Classifier version that served this request (changes after a hot swap)
+    model_version: Optional[str] = None
+    # Set when an earlier audit of a near-identical clause was returned instead of running the LLM
+    near_duplicate_of: Optional[int] = None
+    near_duplicate_similarity: Optional[float] = None
+    agent_turns: Optional[int] = None
+    trace: Optional[List[AgentStep]] = None
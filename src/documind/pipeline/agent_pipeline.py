@@ -1,40 +1,236 @@
-from documind.components.llm_engine import LLMEngine
-from documind.components.agent_tools import tools
+from documind.components.agent_tools import tools, get_classifier
+from documind.components.result_cache import ResultCache
+from documind.components.near_duplicate_index import NearDuplicateIndex
+from documind.components.agent_callbacks import MetricsCallbackHandler, TraceCallbackHandler
+from documind.config.configuration import ConfigurationManager
 from documind import logger
-from langchain_core.messages import HumanMessage
+from documind.utils.metrics import AGENT_RUN_SECONDS, MODEL_LOADED
+from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, AIMessageChunk, ToolMessage
 # Ensure this is the import line:
-from langgraph.prebuilt import create_react_agent 
+from langgraph.prebuilt import create_react_agent
+import time
+
+# Bump whenever the task prompt below changes, so cached audits are not reused
+PROMPT_VERSION = "2"
+
+# Fixed prefix of every prompt: the LLM engine keeps its KV cache across requests
+# (see PrefixCachingTextGenerationPipeline), so nothing request-specific goes here
+SYSTEM_PROMPT = (
+    "You are DocuMind, an assistant that audits clauses of legal agreements.\n"
+    "You can use these tools:\n"
+    + "\n".join(f"- {tool.name}: {tool.description}" for tool in tools)
+    + "\nAnswer with the clause type and a short summary of any risk it carries."
+)
 
 class AgentPipeline:
-    def __init__(self):
+    def __init__(self, llm=None):
         # 1. Get the LLM (Now it returns a ChatModel)
-        self.llm = LLMEngine().get_llm()
-        
+        # A chat model can be passed in directly, e.g. a local stand-in for testing
+        config_manager = ConfigurationManager()
+        if llm is None:
+            engine_config = config_manager.get_llm_engine_config()
+            if engine_config.backend == "remote":
+                # Generation runs on a separate inference server: nothing to load here
+                from documind.components.remote_llm import RemoteChatModel
+                remote_config = config_manager.get_remote_llm_config()
+                self.llm = RemoteChatModel.from_config(remote_config)
+                llm_id = f"remote:{remote_config.model}"
+            else:
+                # Imported here: torch/transformers are only needed for the local LLM
+                from documind.components.llm_engine import LLMEngine
+                engine = LLMEngine(engine_config)
+                self.llm = engine.get_llm()
+                llm_id = engine.model_id
+        else:
+            self.llm = llm
+            llm_id = type(llm).__name__
+
         # 2. Create the Agent using LangGraph
         self.agent = create_react_agent(self.llm, tools)
-        
-    def run_agent(self, document_text: str):
-        try:
-            logger.info("Initializing Agentic Workflow (LangGraph)...")
-            
-            # 3. Construct Input
-            user_input = f"""
+
+        # 3. Cache full agent outputs per (prompt, classifier checkpoint, LLM)
+        self.llm_id = llm_id
+        self.cache_config = config_manager.get_result_cache_config()
+        self._cache = None
+
+        # Near-duplicate audits (same clause with other names/dates) are reused per mode
+        self.near_duplicate_config = config_manager.get_near_duplicate_index_config()
+        self._near_duplicate_indexes = {}
+
+        # 4. Tokenizer for trace token counts when the model does not report usage (HF pipelines)
+        self.tokenizer = getattr(self.llm, "tokenizer", None)
+
+        MODEL_LOADED.labels(model="llm").set(1)
+
+    def close(self):
+        """
+        Releases the LLM client's connections (remote backend only).
+        """
+        if hasattr(self.llm, "close"):
+            self.llm.close()
+
+    @property
+    def cache(self):
+        """
+        Result cache for the live classifier version; re-keyed after a hot swap.
+        """
+        if not self.cache_config.enabled:
+            return None
+        version = self._version()
+        if self._cache is None or self._cache.version != version:
+            self._cache = ResultCache(self.cache_config, "agent", version)
+        return self._cache
+
+    def _version(self) -> str:
+        # Stored outputs are only valid for this (prompt, classifier checkpoint, LLM)
+        return f"{PROMPT_VERSION}:{get_classifier().model_version}:{self.llm_id}"
+
+    def _near_duplicate_index(self, mode: str):
+        if not self.near_duplicate_config.enabled:
+            return None
+        version = self._version()
+        index = self._near_duplicate_indexes.get(mode)
+        if index is None or index.version != version:
+            index = self._near_duplicate_indexes[mode] = NearDuplicateIndex(self.near_duplicate_config, mode, version)
+        return index
+
+    def find_prior_audit(self, document_text: str, mode: str):
+        """
+        Returns {"value", "similarity", "audit_id"} of an earlier audit of a
+        near-identical clause in the same mode, or None.
+        """
+        index = self._near_duplicate_index(mode)
+        return index.find(document_text) if index is not None else None
+
+    def remember_audit(self, document_text: str, mode: str, value: dict):
+        index = self._near_duplicate_index(mode)
+        if index is not None:
+            index.add(document_text, value)
+
+    def _build_messages(self, document_text: str) -> list:
+        user_input = f"""
             Task: Classify this legal text and find the risk.
             Text: "{document_text}"
             First, use the 'Document Classifier' tool.
             Then, summarize the result.
             """
-            
-            messages = [HumanMessage(content=user_input)]
+        return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user_input)]
+
+    def summarize(self, document_text: str, label: str) -> str:
+        """
+        Single LLM generation for the 'classify+summary' mode: no ReAct loop, no tool calls.
+        """
+        user_input = f"""
+            Task: Summarize this legal text and point out any risk.
+            The text has already been classified as: '{label}'.
+            Text: "{document_text}"
+            """
+        started_at = time.perf_counter()
+        try:
+            messages = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user_input)]
+            return self.llm.invoke(messages, config={"callbacks": [MetricsCallbackHandler()]}).content
+        except Exception as e:
+            logger.error(f"Summary failed: {e}")
+            return "Agent Error - Check logs."
+        finally:
+            AGENT_RUN_SECONDS.labels(mode="classify+summary").observe(time.perf_counter() - started_at)
+
+    def _count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    def run_agent(self, document_text: str):
+        if self.cache is not None:
+            cached = self.cache.get(document_text)
+            if cached is not None:
+                logger.info("Agent result served from cache.")
+                return cached
+
+        return self._run_graph(document_text)["output"]
+
+    def run_agent_traced(self, document_text: str) -> dict:
+        """
+        run_agent with a step-by-step trace: every LLM turn and tool call with its
+        wall time and tokens in/out. Always runs the graph (a cached answer has no trace).
+        """
+        tracer = TraceCallbackHandler(self._count_tokens if self.tokenizer is not None else None)
+        result = self._run_graph(document_text, tracer)
+        result["steps"] = tracer.steps
+        return result
+
+    def _run_graph(self, document_text: str, tracer=None) -> dict:
+        callbacks = [MetricsCallbackHandler()] + ([tracer] if tracer is not None else [])
+        started_at = time.perf_counter()
+        try:
+            logger.info("Initializing Agentic Workflow (LangGraph)...")
+
+            # 3. Construct Input
+            messages = self._build_messages(document_text)
 
             # 4. Run Graph
             logger.info("Agent is thinking...")
-            result = self.agent.invoke({"messages": messages})
-            
+            result = self.agent.invoke({"messages": messages}, config={"callbacks": callbacks})
+
             # 5. Extract Answer
             final_response = result["messages"][-1].content
-            return final_response
+            # Only a finished, non-empty answer is worth reusing
+            if self.cache is not None and final_response:
+                self.cache.set(document_text, final_response)
+            return {"output": final_response}
+
+        except Exception as e:
+            logger.error(f"Agent failed: {e}")
+            return {"output": "Agent Error - Check logs."}
+        finally:
+            AGENT_RUN_SECONDS.labels(mode="full_agent").observe(time.perf_counter() - started_at)
+
+    def stream_agent(self, document_text: str):
+        """
+        Streaming variant of run_agent.
+        Yields event dicts as the ReAct loop progresses:
+        tool_call_started, tool_result, token (LLM output) and finally final/error.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(document_text)
+            if cached is not None:
+                logger.info("Agent result served from cache.")
+                yield {"event": "final", "text": cached, "cached": True}
+                return
+
+        started_at = time.perf_counter()
+        try:
+            logger.info("Initializing Agentic Workflow (LangGraph, streaming)...")
+            messages = self._build_messages(document_text)
+            final_response = ""
+
+            # "messages" carries LLM tokens, "updates" carries finished node outputs
+            for mode, chunk in self.agent.stream(
+                {"messages": messages},
+                stream_mode=["messages", "updates"],
+                config={"callbacks": [MetricsCallbackHandler()]}
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if isinstance(message, (AIMessageChunk, AIMessage)) and metadata.get("langgraph_node") == "agent" and message.content:
+                        yield {"event": "token", "text": message.content}
+                    continue
+
+                for node, update in chunk.items():
+                    for message in (update or {}).get("messages", []):
+                        if isinstance(message, AIMessage):
+                            for tool_call in message.tool_calls:
+                                yield {"event": "tool_call_started", "tool": tool_call["name"], "args": tool_call["args"]}
+                            if not message.tool_calls:
+                                final_response = message.content
+                        elif isinstance(message, ToolMessage):
+                            yield {"event": "tool_result", "tool": message.name, "content": message.content}
+
+            # Only a finished, non-empty answer is worth reusing
+            if self.cache is not None and final_response:
+                self.cache.set(document_text, final_response)
+            yield {"event": "final", "text": final_response, "cached": False}
 
         except Exception as e:
             logger.error(f"Agent failed: {e}")
-            return "Agent Error - Check logs."
\ No newline at end of file
+            yield {"event": "error", "detail": "Agent Error - Check logs."}
+        finally:
+            AGENT_RUN_SECONDS.labels(mode="full_agent").observe(time.perf_counter() - started_at)
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import torch
+from documind import logger
+from documind.entity import BulkAuditConfig
+
+# One classifier per worker process, created by the pool initializer
+_worker_classifier = None
+
+def _init_worker(threads_per_worker: int):
+    global _worker_classifier
+    from documind.pipeline.prediction import PredictionPipeline
+
+    # Avoid oversubscribing the CPU: every process gets its own slice of cores
+    torch.set_num_threads(threads_per_worker)
+    _worker_classifier = PredictionPipeline()
+
+def _classify_chunk(texts: list) -> list:
+    return _worker_classifier.predict_batch(texts)
+
+class BulkAuditPipeline:
+    """
+    Offline audit of large JSONL corpora.
+
+    The input is streamed in chunks, classified on a process pool and written
+    incrementally (JSONL file or Parquet part files). Progress is checkpointed
+    after every chunk so a crashed run resumes where it stopped.
+    """
+
+    def __init__(self, config: BulkAuditConfig):
+        self.config = config
+        self.checkpoint_path = f"{config.output_path}.checkpoint.json"
+        self.agent = None
+
+    def _load_checkpoint(self) -> dict:
+        if self.config.resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("input_path") == str(self.config.input_path):
+                logger.info(f"Resuming from checkpoint: {checkpoint['lines_done']} lines already done")
+                return checkpoint
+            logger.warning("Checkpoint belongs to a different input file, starting over")
+        return {"input_path": str(self.config.input_path), "lines_done": 0, "records_written": 0, "output_bytes": 0, "chunks": 0}
+
+    def _save_checkpoint(self, checkpoint: dict):
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _read_chunks(self, skip_lines: int):
+        with open(self.config.input_path, encoding="utf-8") as f:
+            lines = islice(enumerate(f), skip_lines, None)
+            while True:
+                chunk = list(islice(lines, self.config.chunk_size))
+                if not chunk:
+                    return
+                records = []
+                for line_no, line in chunk:
+                    line = line.strip()
+                    # A malformed line becomes an error row: aborting would hit it again on every resume
+                    try:
+                        record = json.loads(line) if line else {}
+                        if not isinstance(record, dict):
+                            raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+                    except ValueError as e:
+                        records.append({"id": line_no, "text": "", "error": f"Invalid JSON on line {line_no + 1}: {e}"})
+                        continue
+                    records.append({
+                        "id": record.get(self.config.id_field, line_no),
+                        "text": record.get(self.config.text_field) or "",
+                        "error": None
+                    })
+                yield len(chunk), records
+
+    def _run_agent(self, records: list):
+        if not self.config.agent_labels:
+            return
+        for record in records:
+            if record["error"] is None and record["label"] in self.config.agent_labels:
+                if self.agent is None:
+                    from documind.pipeline.agent_pipeline import AgentPipeline
+                    self.agent = AgentPipeline()
+                record["agent_output"] = self.agent.run_agent(record["text"])
+
+    def _write(self, records: list, checkpoint: dict):
+        if not self.config.include_text:
+            records = [{k: v for k, v in record.items() if k != "text"} for record in records]
+
+        if self.config.output_format == "parquet":
+            import pandas as pd
+            os.makedirs(self.config.output_path, exist_ok=True)
+            part_path = os.path.join(self.config.output_path, f"part-{checkpoint['chunks']:06d}.parquet")
+            pd.DataFrame(records).to_parquet(part_path, index=False)
+        else:
+            with open(self.config.output_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            checkpoint["output_bytes"] = os.path.getsize(self.config.output_path)
+
+    def run(self):
+        checkpoint = self._load_checkpoint()
+
+        # Drop anything written after the last checkpoint (a partially written chunk,
+        # or the whole output of an earlier run when starting over)
+        if self.config.output_format == "jsonl":
+            os.makedirs(os.path.dirname(os.path.abspath(self.config.output_path)), exist_ok=True)
+            with open(self.config.output_path, "a+") as f:
+                f.truncate(checkpoint["output_bytes"])
+        elif os.path.isdir(self.config.output_path):
+            for name in os.listdir(self.config.output_path):
+                if name.startswith("part-") and name.endswith(".parquet") and int(name[5:11]) >= checkpoint["chunks"]:
+                    os.remove(os.path.join(self.config.output_path, name))
+
+        started_at = time.perf_counter()
+        processed = 0
+        chunks = self._read_chunks(checkpoint["lines_done"])
+
+        executor = None
+        if self.config.workers > 0:
+            threads = max(1, (os.cpu_count() or 1) // self.config.workers)
+            executor = ProcessPoolExecutor(
+                max_workers=self.config.workers,
+                initializer=_init_worker,
+                initargs=(threads,)
+            )
+        else:
+            _init_worker(torch.get_num_threads())
+
+        try:
+            # Keep a bounded number of chunks in flight and consume them in input order,
+            # so the checkpoint always marks a contiguous prefix of the input
+            in_flight = deque()
+            max_in_flight = max(1, self.config.workers * 2)
+
+            def submit_next() -> bool:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                line_count, records = chunk
+                # Error rows have no text worth classifying
+                texts = [record["text"] for record in records if record["error"] is None]
+                future = executor.submit(_classify_chunk, texts) if executor else _classify_chunk(texts)
+                in_flight.append((line_count, records, future))
+                return True
+
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
+
+            while in_flight:
+                line_count, records, future = in_flight.popleft()
+                labels = future.result() if executor else future
+                submit_next()
+
+                labels = iter(labels)
+                for record in records:
+                    record["label"] = next(labels) if record["error"] is None else None
+                self._run_agent(records)
+                self._write(records, checkpoint)
+
+                checkpoint["lines_done"] += line_count
+                checkpoint["records_written"] += len(records)
+                checkpoint["chunks"] += 1
+                self._save_checkpoint(checkpoint)
+
+                processed += len(records)
+                elapsed = time.perf_counter() - started_at
+                logger.info(f"Bulk audit: {checkpoint['records_written']} records done ({processed / elapsed:.1f} records/sec this run)")
+        finally:
+            if executor:
+                executor.shutdown()
+
+        elapsed = time.perf_counter() - started_at
+        logger.info(f"Bulk audit completed: {processed} records in {elapsed:.1f}s. Output: {self.config.output_path}")
+        return checkpoint
@@ -1,48 +1,187 @@
-import os
+import time
+import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from datasets import load_dataset
+from pathlib import Path
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
 from documind import logger
+from documind.config.configuration import ConfigurationManager
+from documind.components.result_cache import ResultCache
+from documind.components.document_splitter import DocumentSplitter
+from documind.entity import PredictionConfig
+from documind.utils.common import get_directory_fingerprint
+from documind.utils.metrics import TOKENIZATION_SECONDS, CLASSIFIER_FORWARD_SECONDS, MODEL_LOADED
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
 
 class PredictionPipeline:
-    def __init__(self):
-        self.model_path = os.path.join("artifacts", "model_trainer", "bert-classifier")
+    def __init__(self, config: PredictionConfig = None, model_version: str = None):
+        config_manager = ConfigurationManager()
+        self.config = config or config_manager.get_prediction_config()
+        self.model_path = str(self.config.model_path)
         self.device = "cpu" # Keep CPU for tool usage
-        
-        logger.info(f"Loading Classification Model from {self.model_path}...")
+        self.max_length = self.config.max_length
+        self.batch_size = self.config.batch_size
+        self.backend = self.config.backend
+
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown prediction backend '{self.backend}'. Expected one of {BACKENDS}")
+
+        logger.info(f"Loading Classification Model from {self.model_path} (backend: {self.backend})...")
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path).to(self.device)
+        self.model_config = AutoConfig.from_pretrained(self.model_path)
+
+        # ONNX backends reuse the tokenizer and label map, only the forward pass changes
+        self.model = None
+        self.session = None
+        if self.backend == "torch":
+            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path).to(self.device)
+            self.model.eval()
+        else:
+            import onnxruntime as ort
+            onnx_path = self.config.onnx_model_path if self.backend == "onnx" else self.config.onnx_int8_model_path
+            logger.info(f"Loading ONNX Runtime session from {onnx_path}...")
+            self.session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+
+        # Label names are stored in the checkpoint config by ModelTrainer
+        self.id2label = {int(i): label for i, label in self.model_config.id2label.items()}
+        if all(label == f"LABEL_{i}" for i, label in self.id2label.items()):
+            logger.warning("Checkpoint has no label names; retrain to embed id2label in the model config.")
+
+        # Results are cached per checkpoint, a retrained model gets a fresh key space
+        # (registry versions are passed in, otherwise the checkpoint fingerprint is the version)
+        self.model_version = model_version or get_directory_fingerprint(Path(self.model_path))
+        cache_config = config_manager.get_result_cache_config()
+        cache_version = f"{self.model_version}:{self.backend}"
+        self.cache = ResultCache(cache_config, "classifier", cache_version) if cache_config.enabled else None
+        self.top_k_cache = ResultCache(cache_config, "classifier_top_k", cache_version) if cache_config.enabled else None
+
+        self.splitter_config = config_manager.get_document_splitter_config()
+        self.splitter = DocumentSplitter(self.tokenizer, self.splitter_config)
 
-        # --- FIX: Load Label Mappings ---
-        # We fetch the dataset metadata to get the list of 100 label names
-        logger.info("Loading Label Mappings...")
-        dataset = load_dataset("lex_glue", "ledgar", split="train", trust_remote_code=False)
-        self.id2label = {i: label for i, label in enumerate(dataset.features["label"].names)}
+        MODEL_LOADED.labels(model="classifier").set(1)
 
     def predict(self, text: str):
         try:
-            # 1. Tokenize
-            inputs = self.tokenizer(
-                text, 
-                return_tensors="pt", 
-                truncation=True, 
-                padding="max_length", 
-                max_length=512
-            ).to(self.device)
-
-            # 2. Inference
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-            
-            # 3. Get Prediction ID
-            logits = outputs.logits
-            predicted_class_id = torch.argmax(logits, dim=1).item()
-            
-            # 4. Convert to Text
-            predicted_label = self.id2label[predicted_class_id]
-
-            return predicted_label
+            return self.predict_batch([text])[0]
 
         except Exception as e:
             logger.error(f"Prediction Error: {e}")
-            return "Error"
\ No newline at end of file
+            return "Error"
+
+    def predict_batch(self, texts: list, batch_size: int = None) -> list:
+        """
+        Classifies many texts at once.
+        Inputs are sorted by token length and every batch is padded only to its
+        longest member, so short clauses never pay for a full 512-token pass.
+        Results are returned in the caller's order; cached texts skip the model.
+        """
+        if not texts:
+            return []
+
+        if self.cache is None:
+            return self._predict_batch(texts, batch_size)
+        return self._through_cache(self.cache, texts, lambda missing: self._predict_batch(missing, batch_size))
+
+    def _through_cache(self, cache, texts: list, compute, key=lambda text: text) -> list:
+        # Only texts that miss the cache go through the model (each distinct one once)
+        results = [cache.get(key(text)) for text in texts]
+        missing = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+        if missing:
+            computed = dict(zip(missing, compute(missing)))
+            for text, result in computed.items():
+                cache.set(key(text), result)
+            results = [computed[text] if result is None else result for text, result in zip(texts, results)]
+        return results
+
+    def predict_document(self, document: str):
+        """
+        Long-document mode.
+        Splits a full agreement into clauses / overlapping token windows and
+        yields one result per segment, batch by batch, as soon as it is ready.
+        """
+        segments = self.splitter.split(document)
+        logger.info(f"Document split into {len(segments)} segments")
+
+        batch_size = self.splitter_config.batch_size
+        for start in range(0, len(segments), batch_size):
+            batch = segments[start : start + batch_size]
+            labels = self.predict_batch([segment["text"] for segment in batch])
+            for offset, (segment, label) in enumerate(zip(batch, labels)):
+                yield {
+                    "segment": start + offset,
+                    "clause": segment["clause"],
+                    "window": segment["window"],
+                    "start": segment["start"],
+                    "end": segment["end"],
+                    "label": label
+                }
+
+    def predict_top_k(self, texts: list, k: int = 5, batch_size: int = None) -> list:
+        """
+        Like predict_batch, but returns the label together with the k most
+        probable labels and their softmax scores for every text.
+        """
+        if not texts:
+            return []
+
+        if self.top_k_cache is None:
+            return self._predict_top_k(texts, k, batch_size)
+
+        # Keyed by k too: a top-3 answer cannot serve a top-10 request
+        return self._through_cache(
+            self.top_k_cache, texts, lambda missing: self._predict_top_k(missing, k, batch_size), key=lambda text: f"top{k}:{text}"
+        )
+
+    def _predict_top_k(self, texts: list, k: int, batch_size: int = None) -> list:
+        results = []
+        for probs in self._predict_probs(texts, batch_size):
+            scores, ids = torch.topk(probs, k=min(k, probs.shape[-1]))
+            top_k = [{"label": self.id2label[i], "score": round(s, 4)} for s, i in zip(scores.tolist(), ids.tolist())]
+            results.append({"label": top_k[0]["label"], "top_k": top_k})
+        return results
+
+    def _predict_batch(self, texts: list, batch_size: int = None) -> list:
+        return [self.id2label[int(torch.argmax(probs))] for probs in self._predict_probs(texts, batch_size)]
+
+    def _predict_probs(self, texts: list, batch_size: int = None) -> list:
+        batch_size = batch_size or self.batch_size
+
+        # 1. Tokenize once, without padding
+        started_at = time.perf_counter()
+        encodings = self.tokenizer(
+            list(texts),
+            truncation=True,
+            max_length=self.max_length
+        )
+        TOKENIZATION_SECONDS.observe(time.perf_counter() - started_at)
+        input_ids = encodings["input_ids"]
+
+        # 2. Sort by length so each batch holds similarly sized inputs
+        order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+
+        probabilities = [None] * len(input_ids)
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start : start + batch_size]
+
+            # 3. Pad only up to the longest input in this batch
+            features = [{"input_ids": input_ids[i], "attention_mask": encodings["attention_mask"][i]} for i in batch_idx]
+            inputs = self.tokenizer.pad(features, padding="longest", return_tensors="pt").to(self.device)
+
+            # 4. Inference
+            started_at = time.perf_counter()
+            logits = self._forward(inputs)
+            CLASSIFIER_FORWARD_SECONDS.labels(backend=self.backend).observe(time.perf_counter() - started_at)
+
+            # 5. Scatter results back to the caller's positions
+            for i, probs in zip(batch_idx, torch.softmax(logits.float(), dim=1)):
+                probabilities[i] = probs
+
+        return probabilities
+
+    def _forward(self, inputs) -> torch.Tensor:
+        if self.session is None:
+            with torch.inference_mode():
+                return self.model(**inputs).logits
+
+        feeds = {name: inputs[name].numpy().astype(np.int64) for name in ("input_ids", "attention_mask")}
+        return torch.from_numpy(self.session.run(["logits"], feeds)[0])
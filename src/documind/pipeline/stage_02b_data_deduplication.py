@@ -0,0 +1,16 @@
+from documind.config.configuration import ConfigurationManager
+from documind.components.data_deduplication import DataDeduplication
+from documind import logger
+
+class DataDeduplicationTrainingPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigurationManager()
+            data_deduplication_config = config.get_data_deduplication_config()
+            data_deduplication = DataDeduplication(config=data_deduplication_config)
+            data_deduplication.deduplicate()
+        except Exception as e:
+            raise e
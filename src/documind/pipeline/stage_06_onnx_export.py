@@ -0,0 +1,18 @@
+from documind.config.configuration import ConfigurationManager
+from documind.components.onnx_export import OnnxExport
+from documind import logger
+
+class OnnxExportPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigurationManager()
+            onnx_export_config = config.get_onnx_export_config()
+            onnx_export = OnnxExport(config=onnx_export_config)
+            onnx_export.export()
+            onnx_export.quantize()
+            onnx_export.parity_check()
+        except Exception as e:
+            raise e
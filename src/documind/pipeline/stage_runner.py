@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from documind import logger
+from documind.config.configuration import ConfigurationManager
+from documind.utils.common import get_file_hash
+
+@dataclass
+class Stage:
+    name: str
+    pipeline: type
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    config_sections: list = field(default_factory=list)
+    params_sections: list = field(default_factory=list)
+
+class StageRunner:
+    """
+    Runs the training stages and skips any stage whose inputs, config.yaml /
+    params.yaml sections and outputs are unchanged since its last successful run.
+    """
+
+    def __init__(self, state_file: Path = Path("artifacts/.stage_state.json")):
+        self.state_file = state_file
+        self.state = {"stages": {}, "file_hashes": {}}
+        if os.path.exists(state_file):
+            with open(state_file) as f:
+                self.state = json.load(f)
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        with open(self.state_file, "w") as f:
+            json.dump(self.state, f, indent=4)
+
+    def _file_hash(self, path: str) -> str:
+        # Content hashes are memoized per (size, mtime) so big checkpoints are only read when they change
+        stat = os.stat(path)
+        memo_key = f"{stat.st_size}:{stat.st_mtime_ns}"
+        memo = self.state["file_hashes"].get(path)
+        if memo and memo["stat"] == memo_key:
+            return memo["hash"]
+        file_hash = get_file_hash(Path(path))
+        self.state["file_hashes"][path] = {"stat": memo_key, "hash": file_hash}
+        return file_hash
+
+    def _paths_hash(self, paths: list):
+        """Content hash over files and directories; None if any path is missing."""
+        digest = hashlib.sha256()
+        for path in paths:
+            if not os.path.exists(path):
+                return None
+            files = [path] if os.path.isfile(path) else sorted(
+                os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+            )
+            for file_path in files:
+                digest.update(f"{file_path}:{self._file_hash(file_path)}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _lookup(tree, name: str):
+        # "section" hashes a whole section, "section.key" only the keys a stage actually reads
+        for key in name.split("."):
+            tree = tree.get(key) if tree is not None else None
+        return tree
+
+    def _sections_hash(self, stage: Stage) -> str:
+        config = ConfigurationManager()
+        sections = {
+            "config": {name: self._lookup(config.config, name) for name in stage.config_sections},
+            "params": {name: self._lookup(config.params, name) for name in stage.params_sections}
+        }
+        return hashlib.sha256(json.dumps(sections, sort_keys=True, default=str).encode()).hexdigest()
+
+    def run(self, stages: list, force: bool = False, from_stage: int = None) -> list:
+        """
+        force: run every stage. from_stage: leave earlier stages alone and run this one and all later ones.
+        Returns (number, name, status, seconds) per stage, status being ran, cached or skipped.
+        """
+        summary = []
+
+        for number, stage in enumerate(stages, start=1):
+            if from_stage is not None and number < from_stage:
+                summary.append((number, stage.name, "skipped", 0.0))
+                continue
+
+            started_at = time.perf_counter()
+            inputs_hash = self._paths_hash(stage.inputs)
+            sections_hash = self._sections_hash(stage)
+            outputs_hash = self._paths_hash(stage.outputs)
+            record = self.state["stages"].get(stage.name)
+
+            up_to_date = (
+                record is not None
+                and outputs_hash is not None
+                and record["inputs"] == inputs_hash
+                and record["sections"] == sections_hash
+                and record["outputs"] == outputs_hash
+            )
+
+            if up_to_date and not force and from_stage is None:
+                logger.info(f">>>>>> Stage {stage.name} is up to date, skipping <<<<<<")
+                summary.append((number, stage.name, "cached", time.perf_counter() - started_at))
+                continue
+
+            logger.info(f">>>>>> Stage {stage.name} started <<<<<<")
+            stage.pipeline().main()
+            logger.info(f">>>>>> Stage {stage.name} completed <<<<<<\n\n")
+
+            self.state["stages"][stage.name] = {
+                "inputs": inputs_hash,
+                "sections": sections_hash,
+                "outputs": self._paths_hash(stage.outputs)
+            }
+            self._save_state()
+            summary.append((number, stage.name, "ran", time.perf_counter() - started_at))
+
+        self._save_state()
+        return summary
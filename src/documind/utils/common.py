@@ -1,9 +1,9 @@
 import os
+import hashlib
 from box.exceptions import BoxValueError
 import yaml
 from documind import logger
 import json
-import joblib
 from ensure import ensure_annotations
 from box import ConfigBox
 from pathlib import Path
@@ -72,4 +72,65 @@ def save_json(path: Path, data: dict):
     """
     with open(path, "w") as f:
         json.dump(data, f, indent=4)
-    logger.info(f"json file saved at: {path}")
\ No newline at end of file
+    logger.info(f"json file saved at: {path}")
+
+@ensure_annotations
+def load_json(path: Path) -> ConfigBox:
+    """load json files data
+
+    Args:
+        path (Path): path to json file
+
+    Returns:
+        ConfigBox: data as class attributes instead of dict
+    """
+    with open(path) as f:
+        content = json.load(f)
+
+    logger.info(f"json file loaded succesfully from: {path}")
+    return ConfigBox(content)
+
+@ensure_annotations
+def get_directory_fingerprint(path: Path) -> str:
+    """fingerprint of a directory based on file names, sizes and mtimes
+
+    Args:
+        path (Path): directory, e.g. a saved model checkpoint
+
+    Returns:
+        str: short hex digest that changes whenever any file changes
+    """
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(path)):
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            stat = os.stat(file_path)
+            digest.update(f"{os.path.relpath(file_path, path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+@ensure_annotations
+def get_file_hash(path: Path) -> str:
+    """sha256 of a file's content, read in 1 MB chunks
+
+    Args:
+        path (Path): path of the file
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+@ensure_annotations
+def get_tracking_uri(uri: str) -> str:
+    """MLflow tracking/registry URI from the config value
+
+    Args:
+        uri (str): a URI, or a plain directory for a local file store
+
+    Returns:
+        str: the URI, with plain directories turned into absolute file:// URIs
+    """
+    return uri if "://" in uri else "file://" + str(Path(uri).absolute())
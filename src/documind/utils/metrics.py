@@ -0,0 +1,104 @@
+"""
+Prometheus metrics for the serving hot path.
+
+prometheus_client is optional: without it every metric below is a no-op, so
+the pipelines can be used (and imported) anywhere.
+"""
+import os
+import resource
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+class _NoOpMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def set(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+def _histogram(name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoOpMetric()
+    return Histogram(name, documentation, labelnames=labelnames, buckets=buckets)
+
+def _gauge(name: str, documentation: str, labelnames: tuple = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoOpMetric()
+    return Gauge(name, documentation, labelnames=labelnames)
+
+def _counter(name: str, documentation: str, labelnames: tuple = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoOpMetric()
+    return Counter(name, documentation, labelnames=labelnames)
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+MODEL_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+TOKENIZATION_SECONDS = _histogram(
+    "documind_tokenization_seconds", "Classifier tokenization time per predict call", FAST_BUCKETS
+)
+CLASSIFIER_FORWARD_SECONDS = _histogram(
+    "documind_classifier_forward_seconds", "Classifier forward pass time per batch", MODEL_BUCKETS, ("backend",)
+)
+LLM_GENERATION_SECONDS = _histogram(
+    "documind_llm_generation_seconds", "Time of each LLM generation", LLM_BUCKETS
+)
+TOOL_CALL_SECONDS = _histogram(
+    "documind_tool_call_seconds", "Time of each agent tool call", MODEL_BUCKETS, ("tool",)
+)
+AGENT_RUN_SECONDS = _histogram(
+    "documind_agent_run_seconds", "Total agent run time per request", LLM_BUCKETS, ("mode",)
+)
+MICRO_BATCH_SIZE = _histogram(
+    "documind_micro_batch_size", "Requests gathered into each classifier micro-batch", (1, 2, 4, 8, 16, 32, 64)
+)
+QUEUE_WAIT_SECONDS = _histogram(
+    "documind_queue_wait_seconds", "Time a request waited for an agent worker", LLM_BUCKETS
+)
+RESULT_CACHE_LOOKUPS = _counter(
+    "documind_result_cache_lookups_total", "Result cache lookups by tier that answered (memory, disk) or miss", ("namespace", "result")
+)
+NEAR_DUPLICATE_LOOKUPS = _counter(
+    "documind_near_duplicate_lookups_total", "Near-duplicate audit index lookups (hit or miss)", ("mode", "result")
+)
+
+REMOTE_LLM_REQUEST_SECONDS = _histogram(
+    "documind_remote_llm_request_seconds", "Time of each HTTP attempt against the remote LLM", LLM_BUCKETS, ("outcome",)
+)
+REMOTE_LLM_RETRIES = _counter("documind_remote_llm_retries_total", "Remote LLM attempts that were retried", ("reason",))
+
+INFLIGHT_REQUESTS = _gauge("documind_inflight_requests", "HTTP requests currently being served")
+MICRO_BATCH_QUEUE_DEPTH = _gauge("documind_micro_batch_queue_depth", "Classifier requests waiting for the next micro-batch")
+MODEL_LOADED = _gauge("documind_model_loaded", "1 when the model is loaded and ready", ("model",))
+PROCESS_RESIDENT_MEMORY = _gauge("documind_process_resident_memory_bytes", "Resident memory of this process")
+
+def resident_memory_bytes() -> int:
+    # Current RSS from /proc on Linux, peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def render_metrics():
+    """
+    Returns (payload, content_type) for the /metrics endpoint.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", "text/plain; charset=utf-8"
+    PROCESS_RESIDENT_MEMORY.set(resident_memory_bytes())
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,83 @@
+"""
+MinHash signatures and LSH banding for near-duplicate detection.
+
+A clause becomes a set of word shingles; its MinHash signature estimates the
+Jaccard similarity to any other signature in O(num_perm). LSH cuts the
+signature into bands and only texts sharing at least one band bucket are
+compared, so finding near-duplicates never needs all pairs.
+"""
+import hashlib
+import re
+import unicodedata
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+DIGITS = re.compile(r"\d+")
+
+def shingles(text: str, size: int = 3, mask_numbers: bool = True) -> set:
+    """
+    Word shingles of a clause: lowercased, whitespace-normalized, numbers
+    optionally masked (so dates and amounts do not break otherwise identical
+    boilerplate when deduplicating training data).
+    """
+    words = unicodedata.normalize("NFKC", text).lower()
+    if mask_numbers:
+        words = DIGITS.sub("0", words)
+    words = words.split()
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+def numbers(text: str) -> list:
+    """
+    Every number of a clause in order ("1,000" gives ["1", "000"]).
+    """
+    return DIGITS.findall(unicodedata.normalize("NFKC", text))
+
+def lsh_bands(threshold: float, num_perm: int, recall: float = 0.95) -> tuple:
+    """
+    Picks (bands, rows) with bands * rows <= num_perm: the most selective split
+    (most rows per band) under which a pair exactly at the similarity threshold
+    still shares a bucket with probability >= `recall`. Centering the S-curve
+    (1 / bands) ** (1 / rows) on the threshold instead would miss about half of
+    the pairs just above it.
+    """
+    candidates = [(num_perm // r, r) for r in range(1, num_perm + 1)]
+    found = [(b, r) for b, r in candidates if 1 - (1 - threshold ** r) ** b >= recall]
+    return max(found, key=lambda br: br[1]) if found else (num_perm, 1)
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1, mask_numbers: bool = True):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.mask_numbers = mask_numbers
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles(text, self.shingle_size, self.mask_numbers)],
+            dtype=np.uint64
+        )
+        # Universal hashing (a * x + b) mod p as num_perm permutations; uint64 wraparound is intended
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """
+        Estimated Jaccard similarity of the two shingle sets.
+        """
+        return float(np.mean(a == b))
+
+    @staticmethod
+    def band_keys(signature: np.ndarray, bands: int, rows: int) -> list:
+        """
+        One bucket key per band; texts sharing any key are LSH candidates.
+        """
+        return [
+            f"{band}:" + hashlib.blake2b(signature[band * rows : (band + 1) * rows].tobytes(), digest_size=8).hexdigest()
+            for band in range(bands)
+        ]
@@ -0,0 +1,256 @@
+"""
+Small local stand-ins for the heavy models.
+
+They let the agent and API paths run end to end on a laptop CPU, offline and
+in milliseconds, e.g. `AgentPipeline(llm=StandInChatModel())`, a
+PredictionPipeline pointed at `build_stand_in_classifier(path)`, an
+LLMEngine pointed at `build_stand_in_causal_lm(path)`, or a RemoteChatModel
+pointed at `build_stand_in_openai_app()` served with uvicorn.
+"""
+import os
+import json
+import re
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class StandInChatModel(BaseChatModel):
+    """
+    Scripted chat model that follows the ReAct loop of AgentPipeline.
+
+    First turn: calls the 'Document Classifier' tool with the clause text.
+    Second turn: answers with `reply_template`, streamed word by word.
+    """
+
+    reply_template: str = "The clause is classified as '{label}'. No unusual risk was found in this stand-in analysis."
+    tool_name: str = "Document Classifier"
+
+    @property
+    def _llm_type(self) -> str:
+        return "documind-stand-in"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_message(self, messages) -> AIMessage:
+        tool_results = [message for message in messages if isinstance(message, ToolMessage)]
+        if tool_results:
+            return AIMessage(content=self.reply_template.format(label=tool_results[-1].content))
+
+        prompt = messages[-1].content
+        match = re.search(r'Text: "(.*)"\s*First', prompt, re.DOTALL)
+        clause = match.group(1) if match else prompt
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": self.tool_name, "args": {"__arg1": clause}, "id": "call_0"}]
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self._next_message(messages)
+        # Whitespace "tokens", so traces show realistic-looking usage
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        output_tokens = len(message.content.split()) + len(message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next_message(messages)
+
+        if message.tool_calls:
+            tool_call = message.tool_calls[0]
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[{
+                    "name": tool_call["name"],
+                    "args": json.dumps(tool_call["args"]),
+                    "id": tool_call["id"],
+                    "index": 0
+                }]
+            ))
+            return
+
+        for token in re.findall(r"\S+\s*", message.content):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+# Small word list for the stand-in WordPiece vocabulary (legal-ish, lowercase)
+STAND_IN_WORDS = (
+    "the this agreement shall be governed by and construed in accordance with laws of state "
+    "party parties company employee term termination notice days written any all other such "
+    "without limitation including not may will under to or a an for on as at from that its "
+    "indemnify indemnification hold harmless losses claims confidential information disclose "
+    "payment fees invoice within thirty after date effective period year years compete "
+    "assign assignment consent waiver severability provision invalid unenforceable remain force"
+).split()
+
+def build_stand_in_classifier(path: str, num_labels: int = 100, seed: int = 0,
+                              dim: int = 64, hidden_dim: int = 128, n_layers: int = 2) -> str:
+    """
+    Saves a randomly initialized DistilBERT classifier (same architecture, tiny
+    dimensions unless asked otherwise) and a matching WordPiece tokenizer to `path`. No downloads.
+    """
+    import torch
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    os.makedirs(path, exist_ok=True)
+
+    # 1. Tokenizer: special tokens + word list + single characters as a fallback
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list(STAND_IN_WORDS)
+    vocab += list("abcdefghijklmnopqrstuvwxyz0123456789.,;:()'\"-")
+    vocab += [f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    vocab = list(dict.fromkeys(vocab))
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(vocab))
+    tokenizer = DistilBertTokenizerFast(vocab_file=vocab_file, do_lower_case=True)
+
+    # 2. Model: same architecture as distilbert-base-uncased, a fraction of the size
+    torch.manual_seed(seed)
+    config = DistilBertConfig(
+        vocab_size=len(vocab),
+        dim=dim,
+        hidden_dim=hidden_dim,
+        n_layers=n_layers,
+        n_heads=2,
+        max_position_embeddings=512,
+        num_labels=num_labels,
+        id2label={i: f"Stand-in Label {i}" for i in range(num_labels)},
+        label2id={f"Stand-in Label {i}": i for i in range(num_labels)}
+    )
+    model = DistilBertForSequenceClassification(config)
+
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+
+STAND_IN_CHAT_TEMPLATE = (
+    "{% for message in messages %}<|{{ message['role'] }}|> {{ message['content'] }} <|end|> {% endfor %}"
+    "{% if add_generation_prompt %}<|assistant|> {% endif %}"
+)
+
+def build_stand_in_causal_lm(path: str, seed: int = 0, hidden_size: int = 128, num_layers: int = 2) -> str:
+    """
+    Saves a randomly initialized Mistral causal LM (tiny dimensions) with a
+    word-level tokenizer and chat template to `path`, so LLMEngine can run on
+    CPU with `llm_engine.model_id: <path>`. The output is gibberish, the
+    timings are real. No downloads.
+    """
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast, MistralConfig, MistralForCausalLM
+
+    os.makedirs(path, exist_ok=True)
+
+    # 1. Tokenizer: role markers + word list, anything else is [UNK]
+    specials = ["[PAD]", "[UNK]", "<|end|>", "<|system|>", "<|user|>", "<|assistant|>", "<|tool|>"]
+    vocab = {token: i for i, token in enumerate(dict.fromkeys(specials + list(STAND_IN_WORDS) + list(".,;:'\"()-")))}
+    backend = Tokenizer(models.WordLevel(vocab=vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        pad_token="[PAD]",
+        unk_token="[UNK]",
+        eos_token="<|end|>",
+        chat_template=STAND_IN_CHAT_TEMPLATE
+    )
+
+    # 2. Model: Qwen2.5-style decoder (GQA, RoPE), a fraction of the size; Mistral so AutoTokenizer keeps the word-level tokenizer
+    torch.manual_seed(seed)
+    config = MistralConfig(
+        vocab_size=len(vocab),
+        hidden_size=hidden_size,
+        intermediate_size=hidden_size * 2,
+        num_hidden_layers=num_layers,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=4096,
+        pad_token_id=vocab["[PAD]"],
+        eos_token_id=vocab["<|end|>"]
+    )
+    model = MistralForCausalLM(config)
+
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+def build_stand_in_openai_app(fail_first: int = 0, fail_status: int = 503, latency_ms: float = 0.0):
+    """
+    FastAPI app with an OpenAI-compatible /v1/chat/completions endpoint
+    (plain and SSE streaming) that answers like StandInChatModel.
+
+    The first `fail_first` requests get `fail_status`, each answer takes
+    `latency_ms`, and `app.state.stats` records requests, the peak number in
+    flight and the client ports seen (few ports = connections were kept alive).
+    """
+    import asyncio
+    import time
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from langchain_core.messages import HumanMessage
+
+    app = FastAPI(title="DocuMind stand-in LLM server")
+    app.state.stats = {"requests": 0, "failed": 0, "in_flight": 0, "max_in_flight": 0, "client_ports": set()}
+    model = StandInChatModel()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stats = app.state.stats
+        stats["requests"] += 1
+        stats["client_ports"].add(request.client.port)
+        if stats["requests"] <= fail_first:
+            stats["failed"] += 1
+            return JSONResponse({"error": {"message": "stand-in failure"}}, status_code=fail_status)
+
+        body = await request.json()
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(latency_ms / 1000)
+        finally:
+            stats["in_flight"] -= 1
+
+        # Only the tool results and the last prompt matter to the stand-in script
+        messages = [
+            ToolMessage(content=m["content"], tool_call_id=m["tool_call_id"]) if m["role"] == "tool" else HumanMessage(content=m.get("content") or "")
+            for m in body["messages"]
+        ]
+        reply = model._next_message(messages)
+        tool_calls = [
+            {"id": call["id"], "type": "function", "function": {"name": call["name"], "arguments": json.dumps(call["args"])}}
+            for call in reply.tool_calls
+        ]
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        usage = {
+            "prompt_tokens": input_tokens,
+            "completion_tokens": len(reply.content.split()) + len(tool_calls),
+            "total_tokens": input_tokens + len(reply.content.split()) + len(tool_calls)
+        }
+        response = {"id": f"chatcmpl-{stats['requests']}", "object": "chat.completion", "created": int(time.time()), "model": body["model"]}
+
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": reply.content or None}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            finish_reason = "tool_calls" if tool_calls else "stop"
+            return {**response, "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}], "usage": usage}
+
+        def events():
+            if tool_calls:
+                deltas = [{"role": "assistant", "tool_calls": [{**call, "index": i} for i, call in enumerate(tool_calls)]}]
+            else:
+                deltas = [{"role": "assistant", "content": token} for token in re.findall(r"\S+\s*", reply.content)]
+            for delta in deltas:
+                yield f"data: {json.dumps({**response, 'object': 'chat.completion.chunk', 'choices': [{'index': 0, 'delta': delta}]})}\n\n"
+            yield f"data: {json.dumps({**response, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
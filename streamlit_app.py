@@ -4,6 +4,7 @@ import json
 
 # Configuration
 API_URL = "http://localhost:8000/audit"
+STREAM_API_URL = "http://localhost:8000/audit/stream"
 st.set_page_config(page_title="DocuMind Enterprise", layout="wide")
 
 # Custom CSS for Professional Look
@@ -62,6 +63,9 @@ with st.sidebar:
     st.write("2. Click 'Audit Document'.")
     st.write("3. The Agent will classify and analyze risks.")
 
+    st.markdown("---")
+    stream_mode = st.checkbox("Stream agent steps live", value=True)
+
 # Main Layout
 col1, col2 = st.columns([1, 1])
 
@@ -82,35 +86,75 @@ with col2:
         if not doc_text or len(doc_text) < 10:
             st.warning("Please enter valid text (min 10 characters).")
         else:
-            with st.spinner("Agent is analyzing... (This uses GPU)"):
+            if stream_mode:
+                # Render agent events as they arrive over Server-Sent Events
+                steps_box = st.container()
+                answer_box = st.empty()
+                answer = ""
                 try:
-                    # Call the FastAPI Backend
                     payload = {"text": doc_text}
-                    response = requests.post(API_URL, json=payload)
+                    with requests.post(STREAM_API_URL, json=payload, stream=True) as response:
+                        if response.status_code != 200:
+                            st.error(f"Server Error: {response.status_code}")
+                            st.write(response.text)
+                        else:
+                            for line in response.iter_lines(decode_unicode=True):
+                                if not line or not line.startswith("data: "):
+                                    continue
+                                event = json.loads(line[len("data: "):])
+
+                                if event["event"] == "tool_call_started":
+                                    steps_box.info(f"🔧 Calling tool: {event['tool']}")
+                                elif event["event"] == "tool_result":
+                                    steps_box.success(f"✅ {event['tool']}: {event['content']}")
+                                elif event["event"] == "token":
+                                    answer += event["text"]
+                                    answer_box.markdown(answer)
+                                elif event["event"] == "final":
+                                    answer_box.markdown(f"""
+                                    <div class="success-box">
+                                        {event["text"]}
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                                elif event["event"] == "error":
+                                    st.error(event["detail"])
+                                elif event["event"] == "timing":
+                                    st.caption(f"Queue wait: {event['queue_wait_ms']:.0f} ms | Run time: {event['run_time_ms']:.0f} ms")
+
+                except requests.exceptions.ConnectionError:
+                    st.error("Failed to connect to Backend. Is 'python app.py' running?")
+                except Exception as e:
+                    st.error(f"An error occurred: {e}")
+            else:
+                with st.spinner("Agent is analyzing... (This uses GPU)"):
+                    try:
+                        # Call the FastAPI Backend
+                        payload = {"text": doc_text}
+                        response = requests.post(API_URL, json=payload)
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        result = data["raw_agent_output"]
+                        if response.status_code == 200:
+                            data = response.json()
+                            result = data["raw_agent_output"]
                         
-                        # Display Result nicely
-                        st.markdown(f"""
-                        <div class="success-box">
-                            {result}
-                        </div>
-                        """, unsafe_allow_html=True)
+                            # Display Result nicely
+                            st.markdown(f"""
+                            <div class="success-box">
+                                {result}
+                            </div>
+                            """, unsafe_allow_html=True)
                         
-                        # Show raw JSON for debugging (optional)
-                        with st.expander("View System Logs"):
-                            st.json(data)
+                            # Show raw JSON for debugging (optional)
+                            with st.expander("View System Logs"):
+                                st.json(data)
                             
-                    else:
-                        st.error(f"Server Error: {response.status_code}")
-                        st.write(response.text)
+                        else:
+                            st.error(f"Server Error: {response.status_code}")
+                            st.write(response.text)
                         
-                except requests.exceptions.ConnectionError:
-                    st.error("Failed to connect to Backend. Is 'python app.py' running?")
-                except Exception as e:
-                    st.error(f"An error occurred: {e}")
+                    except requests.exceptions.ConnectionError:
+                        st.error("Failed to connect to Backend. Is 'python app.py' running?")
+                    except Exception as e:
+                        st.error(f"An error occurred: {e}")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,122 @@
+"""
+Near-duplicate deduplication check.
+
+Run with `python test_data_deduplication.py` (numpy, pandas; no models).
+Covers the union-find grouping when a bucket's first row belongs to another
+group, that a clause shared by test and train is kept in test only, and that
+disabling the stage removes the outputs of an earlier run.
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.entity import DataDeduplicationConfig
+from documind.components.data_deduplication import DataDeduplication
+
+WORDS = ("agreement party shall seller buyer goods deliver within days notice terminate breach liability "
+         "indemnify claims law state court payment invoice term renewal confidential information disclose").split()
+
+def dedup_config(directory: str, mode: str = "drop", file_format: str = "csv") -> DataDeduplicationConfig:
+    return DataDeduplicationConfig(
+        root_dir=Path(directory) / "out",
+        data_dir=Path(directory),
+        file_format=file_format,
+        enabled=True,
+        mode=mode,
+        split_priority=("test", "validation", "train"),
+        threshold=0.9,
+        num_perm=128,
+        shingle_size=3,
+        seed=1,
+        report_file=Path(directory) / "out" / "report.json"
+    )
+
+def test_groups_behind_other_bucket_members():
+    rng = random.Random(0)
+    base = [rng.choice(WORDS) for _ in range(60)]
+
+    rng = random.Random(85)
+    def variant(changes: int) -> str:
+        words = list(base)
+        for _ in range(changes):
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        return " ".join(words)
+
+    # Six clauses close to `base` (but below the threshold) come first and share its
+    # LSH buckets; the near-copy of `base` at the end must still join its group
+    texts = [variant(rng.randint(2, 4)) for _ in range(6)] + [" ".join(base), variant(1)]
+    with tempfile.TemporaryDirectory() as directory:
+        groups = DataDeduplication(dedup_config(directory)).find_groups(texts)
+    assert groups.tolist() == [0, 1, 2, 3, 4, 5, 6, 6], groups
+
+    # Truncated copies of one clause join the group of the first row, an unrelated clause does not
+    chain = [" ".join(base[:55]), " ".join(base[:57]), " ".join(base), "an unrelated clause about payment terms"]
+    with tempfile.TemporaryDirectory() as directory:
+        groups = DataDeduplication(dedup_config(directory)).find_groups(chain)
+    assert groups.tolist() == [0, 0, 0, 3], groups
+
+def write_splits(directory: str):
+    shared = "The Seller shall deliver the Goods within 30 days of the Order Date."
+    pd.DataFrame({"text": [shared, "Either party may terminate on notice."], "label": [1, 2]}).to_csv(os.path.join(directory, "test.csv"), index=False)
+    pd.DataFrame({"text": ["This Agreement is governed by the laws of New York."], "label": [3]}).to_csv(os.path.join(directory, "validation.csv"), index=False)
+    # Near-copy of the test clause (other whitespace, case and date) plus an exact repeat within train
+    train = [shared.upper().replace("30", "45"), "Payment is due within 60 days.", "Payment is due within 60 days.", "Confidential Information must not be disclosed."]
+    pd.DataFrame({"text": train, "label": [1, 4, 4, 5]}).to_csv(os.path.join(directory, "train.csv"), index=False)
+
+def test_split_priority_removes_leakage():
+    with tempfile.TemporaryDirectory() as directory:
+        write_splits(directory)
+        config = dedup_config(directory)
+        DataDeduplication(config).deduplicate()
+
+        test = pd.read_csv(config.root_dir / "test.csv")
+        train = pd.read_csv(config.root_dir / "train.csv")
+        assert len(test) == 2
+        assert train["text"].tolist() == ["Payment is due within 60 days.", "Confidential Information must not be disclosed."]
+
+        with open(config.report_file) as f:
+            report = json.load(f)
+        assert report["splits"]["train"] == {"rows_before": 4, "rows_after": 2, "duplicates_within_split": 1, "duplicates_of_other_splits": 1}
+        assert report["rows_before"] == 7 and report["rows_after"] == 5
+
+def test_group_mode_keeps_rows():
+    with tempfile.TemporaryDirectory() as directory:
+        write_splits(directory)
+        config = dedup_config(directory, mode="group")
+        DataDeduplication(config).deduplicate()
+
+        test = pd.read_csv(config.root_dir / "test.csv")
+        train = pd.read_csv(config.root_dir / "train.csv")
+        assert len(train) == 4
+        # Rows are numbered test, validation, train: the train near-copy points at test row 0
+        assert train["dup_group"].tolist()[0] == test["dup_group"].tolist()[0] == 0
+        assert train["dup_group"].tolist()[1] == train["dup_group"].tolist()[2]
+
+def test_disabled_clears_earlier_outputs():
+    with tempfile.TemporaryDirectory() as directory:
+        write_splits(directory)
+        config = dedup_config(directory)
+        DataDeduplication(config).deduplicate()
+        assert all((config.root_dir / f"{split}.csv").exists() for split in config.split_priority)
+
+        # Transformation reads the ingested files now; no stale deduplicated split is left behind
+        DataDeduplication(replace(config, enabled=False)).deduplicate()
+        assert not any((config.root_dir / f"{split}.csv").exists() for split in config.split_priority)
+        with open(config.report_file) as f:
+            assert json.load(f) == {"enabled": False}
+
+if __name__ == "__main__":
+    test_groups_behind_other_bucket_members()
+    test_split_priority_removes_leakage()
+    test_group_mode_keeps_rows()
+    test_disabled_clears_earlier_outputs()
+    print("Data deduplication OK.")
@@ -0,0 +1,91 @@
+"""
+Incremental tokenization check.
+
+Run with `python test_data_transformation.py` (needs datasets and
+transformers; uses the stand-in classifier's tokenizer, no downloads).
+Covers that every split is tokenized without padding and fingerprinted, that
+a re-run skips unchanged splits, and that changing one split's data or
+max_length re-tokenizes exactly what it affects.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("datasets")
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from datasets import load_from_disk
+from documind.components.data_transformation import DataTransformation
+from documind.entity import DataTransformationConfig
+from documind.utils.stand_ins import build_stand_in_classifier
+
+CLAUSES = [
+    "This agreement shall be governed by the laws of the state of new york.",
+    "Either party may terminate this agreement on written notice.",
+    "The company shall pay all invoices within thirty days of receipt, without limitation including any taxes.",
+    "Notices shall be in writing."
+]
+
+def transformation_config(directory: str, max_length: int = 512) -> DataTransformationConfig:
+    return DataTransformationConfig(
+        root_dir=Path(directory) / "out",
+        data_path=Path(directory),
+        file_format="csv",
+        tokenizer_name=os.path.join(directory, "classifier"),
+        max_length=max_length,
+        num_proc=1,
+        fingerprint_file=Path(directory) / "out" / "fingerprints.json"
+    )
+
+def write_split(directory: str, split: str, texts: list):
+    pd.DataFrame({"text": texts, "label": list(range(len(texts)))}).to_csv(os.path.join(directory, f"{split}.csv"), index=False)
+
+def split_mtimes(config: DataTransformationConfig) -> dict:
+    save_path = config.root_dir / "samsum_dataset"
+    return {split: max(f.stat().st_mtime_ns for f in (save_path / split).iterdir()) for split in ("train", "test", "validation")}
+
+def test_fingerprinted_incremental_tokenization():
+    with tempfile.TemporaryDirectory() as directory:
+        build_stand_in_classifier(os.path.join(directory, "classifier"))
+        for split in ("train", "test", "validation"):
+            write_split(directory, split, CLAUSES)
+        config = transformation_config(directory)
+        os.makedirs(config.root_dir)
+
+        DataTransformation(config).convert()
+        dataset = load_from_disk(str(config.root_dir / "samsum_dataset"))
+        lengths = [len(ids) for ids in dataset["train"]["input_ids"]]
+        assert len(set(lengths)) > 1, "examples must not be padded at this stage"
+        with open(config.fingerprint_file) as f:
+            fingerprints = json.load(f)
+        assert sorted(fingerprints) == ["test", "train", "validation"]
+
+        # Nothing changed: nothing is re-tokenized
+        before = split_mtimes(config)
+        DataTransformation(config).convert()
+        assert split_mtimes(config) == before
+
+        # Only the split whose file changed is re-tokenized
+        write_split(directory, "train", CLAUSES + ["Confidential information shall not be disclosed."])
+        DataTransformation(config).convert()
+        after = split_mtimes(config)
+        assert after["train"] != before["train"]
+        assert after["test"] == before["test"] and after["validation"] == before["validation"]
+        assert load_from_disk(str(config.root_dir / "samsum_dataset"))["train"].num_rows == 5
+
+        # max_length is part of every fingerprint
+        short = transformation_config(directory, max_length=8)
+        DataTransformation(short).convert()
+        assert all(split_mtimes(short)[split] != after[split] for split in after)
+        assert max(len(ids) for ids in load_from_disk(str(config.root_dir / "samsum_dataset"))["test"]["input_ids"]) == 8
+
+if __name__ == "__main__":
+    test_fingerprinted_incremental_tokenization()
+    print("Incremental tokenization OK.")
@@ -0,0 +1,82 @@
+"""
+Long-document splitter check.
+
+Run with `python test_document_splitter.py` (needs transformers; uses the
+stand-in classifier's tokenizer, no downloads). Covers clause splitting,
+overlapping windows that share exactly `stride` tokens and reach the end of
+the clause, and the stride bounds (0 <= stride < window size).
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from transformers import AutoTokenizer
+from documind.components.document_splitter import DocumentSplitter
+from documind.entity import DocumentSplitterConfig
+from documind.utils.stand_ins import build_stand_in_classifier
+
+LONG_CLAUSE = " ".join(f"the company shall give written notice {i} days before termination of this agreement." for i in range(40))
+DOCUMENT = (
+    "1. Governing Law. This agreement shall be governed by the laws of the state of new york.\n"
+    "2. Term. " + LONG_CLAUSE + "\n\n"
+    "(a)\n"
+    "Notices. All notices under this agreement shall be in writing."
+)
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    with tempfile.TemporaryDirectory() as directory:
+        yield AutoTokenizer.from_pretrained(build_stand_in_classifier(os.path.join(directory, "classifier")))
+
+def splitter_for(tokenizer, max_tokens: int = 64, stride: int = 16) -> DocumentSplitter:
+    return DocumentSplitter(tokenizer, DocumentSplitterConfig(max_tokens=max_tokens, stride=stride, min_clause_chars=10, batch_size=16))
+
+def test_clauses_and_overlapping_windows(tokenizer):
+    splitter = splitter_for(tokenizer)
+    segments = splitter.split(DOCUMENT)
+
+    # Three clauses; the bare "(a)" heading is folded into the clause after it
+    assert sorted({segment["clause"] for segment in segments}) == [0, 1, 2]
+    assert segments[-1]["text"].startswith("(a)")
+    for segment in segments:
+        assert DOCUMENT[segment["start"]:segment["end"]].strip() == segment["text"].strip()
+
+    windows = [segment for segment in segments if segment["clause"] == 1]
+    assert len(windows) > 2 and [w["window"] for w in windows] == list(range(len(windows)))
+
+    def tokens(text):
+        return tokenizer(text, add_special_tokens=False)["input_ids"]
+
+    for previous, current in zip(windows, windows[1:]):
+        assert len(tokens(previous["text"])) == splitter.window_tokens
+        assert tokens(previous["text"])[-16:] == tokens(current["text"])[:16]
+    # Nothing past the classifier window is dropped
+    assert windows[-1]["end"] == DOCUMENT.index(LONG_CLAUSE) + len(LONG_CLAUSE)
+
+def test_zero_stride_windows_do_not_overlap(tokenizer):
+    windows = [s for s in splitter_for(tokenizer, stride=0).split(DOCUMENT) if s["clause"] == 1]
+    for previous, current in zip(windows, windows[1:]):
+        assert previous["end"] <= current["start"]
+
+def test_stride_bounds(tokenizer):
+    window_tokens = 64 - tokenizer.num_special_tokens_to_add()
+    for stride in (-1, window_tokens, 64):
+        with pytest.raises(ValueError):
+            splitter_for(tokenizer, stride=stride)
+
+    # The largest valid stride still advances one token per window and terminates
+    windows = splitter_for(tokenizer, stride=window_tokens - 1).split(LONG_CLAUSE)
+    assert len(windows) == len(tokenizer(LONG_CLAUSE, add_special_tokens=False)["input_ids"]) - window_tokens + 1
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        stand_in = AutoTokenizer.from_pretrained(build_stand_in_classifier(os.path.join(directory, "classifier")))
+    test_clauses_and_overlapping_windows(stand_in)
+    test_zero_stride_windows_do_not_overlap(stand_in)
+    test_stride_bounds(stand_in)
+    print("Document splitter OK.")
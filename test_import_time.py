@@ -0,0 +1,55 @@
+"""
+Import-time budgets: importing the package (or the API) must not load models,
+pull in torch/transformers or touch the filesystem.
+
+Run with `python test_import_time.py` (or pytest). Each check runs in a fresh
+interpreter from an empty directory, so nothing is cached between them.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Milliseconds on top of a bare interpreter start
+BUDGETS_MS = {
+    "documind": 50,
+    "documind.config.configuration": 300
+}
+HEAVY_MODULES = ("torch", "transformers", "datasets", "langgraph", "onnxruntime")
+
+def probe(module: str, cwd: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed_ms = (time.perf_counter() - t0) * 1000\n"
+        f"print(json.dumps({{'ms': elapsed_ms, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(REPO_ROOT, "src"), REPO_ROOT, os.environ.get("PYTHONPATH", "")]))
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=cwd, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_package_import_budgets():
+    with tempfile.TemporaryDirectory() as workspace:
+        for module, budget_ms in BUDGETS_MS.items():
+            result = probe(module, workspace)
+            print(f"import {module:<32} {result['ms']:8.1f} ms (budget {budget_ms} ms)")
+            assert result["ms"] < budget_ms, f"import {module} took {result['ms']:.1f} ms"
+            assert not result["heavy"], f"import {module} pulled in {result['heavy']}"
+
+        # The logger must not create logs/ until something is logged
+        assert not os.path.exists(os.path.join(workspace, "logs")), "import documind created logs/"
+
+def test_app_import_loads_no_models():
+    # app.py reads config/ relative to the working directory
+    result = probe("app", REPO_ROOT)
+    print(f"import {'app':<32} {result['ms']:8.1f} ms")
+    assert not result["heavy"], f"import app pulled in {result['heavy']}"
+
+if __name__ == "__main__":
+    test_package_import_budgets()
+    test_app_import_loads_no_models()
+    print("Import-time budgets OK.")
@@ -0,0 +1,95 @@
+"""
+Micro-batching scheduler check.
+
+Run with `python test_micro_batcher.py` (no models). Covers that concurrent
+callers are coalesced into batches of at most max_batch_size with each
+caller getting its own result, that a failing or short batch fails every
+caller instead of leaving them waiting, and that a batcher created before
+fork() serves requests in the child.
+"""
+import os
+import signal
+import sys
+import threading
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.components.micro_batcher import MicroBatcher
+from documind.entity import MicroBatcherConfig
+
+def recording_batch_fn(batches: list):
+    def predict_batch(texts):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+    return predict_batch
+
+def call_concurrently(batcher: MicroBatcher, texts: list) -> dict:
+    results, barrier = {}, threading.Barrier(len(texts))
+
+    def call(text):
+        barrier.wait()
+        try:
+            results[text] = batcher.predict(text)
+        except Exception as e:
+            results[text] = e
+
+    threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_coalesces_concurrent_calls():
+    batches = []
+    batcher = MicroBatcher(recording_batch_fn(batches), MicroBatcherConfig(max_batch_size=8, max_wait_ms=100))
+    texts = [f"clause {i}" for i in range(20)]
+
+    results = call_concurrently(batcher, texts)
+
+    assert results == {text: text.upper() for text in texts}
+    assert sorted(text for batch in batches for text in batch) == sorted(texts)
+    assert max(len(batch) for batch in batches) <= 8
+    assert len(batches) < len(texts), batches
+
+def test_failed_and_short_batches_fail_every_caller():
+    def broken(texts):
+        raise ValueError("model exploded")
+
+    results = call_concurrently(MicroBatcher(broken, MicroBatcherConfig(max_batch_size=4, max_wait_ms=50)), ["a", "b", "c"])
+    assert all(isinstance(result, ValueError) for result in results.values()), results
+
+    results = call_concurrently(MicroBatcher(lambda texts: texts[:1], MicroBatcherConfig(max_batch_size=4, max_wait_ms=50)), ["a", "b", "c"])
+    assert all(isinstance(result, RuntimeError) for result in results.values()), results
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_restarts_worker_after_fork():
+    batcher = MicroBatcher(recording_batch_fn([]), MicroBatcherConfig(max_batch_size=4, max_wait_ms=10))
+    assert batcher.predict("before fork") == "BEFORE FORK"
+
+    # The worker thread does not survive fork(): the child must start its own
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        # A child stuck on the dead worker would hang the test: it dies instead and the read comes back empty
+        signal.alarm(10)
+        try:
+            os.write(write_end, batcher.predict("in child").encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end) as f:
+        assert f.read() == "IN CHILD"
+    os.waitpid(pid, 0)
+    assert batcher.predict("after fork") == "AFTER FORK"
+
+if __name__ == "__main__":
+    test_coalesces_concurrent_calls()
+    test_failed_and_short_batches_fail_every_caller()
+    test_restarts_worker_after_fork()
+    print("Micro-batcher OK.")
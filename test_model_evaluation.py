@@ -0,0 +1,104 @@
+"""
+Length-sorted evaluation check.
+
+Run with `python test_model_evaluation.py` (needs datasets, mlflow and
+scikit-learn; builds a stand-in classifier, no downloads). Evaluation sorts
+the test split by length before batching: metrics must match an unsorted
+one-example-at-a-time pass, every example must be counted once, and the run
+and registered version must land in the configured tracking store.
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("datasets")
+pytest.importorskip("mlflow")
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+import torch
+from datasets import Dataset, DatasetDict
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from documind.components.model_evaluation import ModelEvaluation
+from documind.components.model_registry import ModelRegistry
+from documind.entity import ModelEvaluationConfig, ModelRegistryConfig
+from documind.utils.common import get_tracking_uri
+from documind.utils.stand_ins import build_stand_in_classifier
+
+WORDS = "the company shall give written notice days before termination of this agreement governed by laws state".split()
+
+def build_test_split(model_path: str, data_path: str, count: int = 37) -> list:
+    rng = random.Random(0)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 80))) for _ in range(count)]
+    labels = [rng.randrange(10) for _ in range(count)]
+    encodings = AutoTokenizer.from_pretrained(model_path)(texts, truncation=True, max_length=512)
+    split = Dataset.from_dict({"input_ids": encodings["input_ids"], "attention_mask": encodings["attention_mask"], "label": labels})
+    DatasetDict({"test": split}).save_to_disk(data_path)
+    return list(zip(texts, labels))
+
+def test_length_sorted_evaluation_matches_unsorted():
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = build_stand_in_classifier(os.path.join(directory, "classifier"), num_labels=10)
+        examples = build_test_split(model_path, os.path.join(directory, "dataset"))
+        out = Path(directory) / "evaluation"
+        out.mkdir()
+        config = ModelEvaluationConfig(
+            root_dir=out,
+            data_path=Path(directory) / "dataset",
+            model_path=Path(model_path),
+            tokenizer_path=Path(model_path),
+            metric_file_name=out / "metrics.json",
+            per_class_metric_file=out / "per_class_metrics.json",
+            latency_profile_file=out / "latency_profile.json",
+            eval_batch_size=8,
+            registered_model_name="stand-in-classifier",
+            tracking_uri=get_tracking_uri(f"sqlite:///{directory}/mlflow.db")
+        )
+        # Run artifacts go under the working directory's default artifact root
+        cwd = os.getcwd()
+        try:
+            os.chdir(directory)
+            ModelEvaluation(config).evaluation()
+        finally:
+            os.chdir(cwd)
+
+        # Reference: original order, one example at a time, no padding at all
+        model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        with torch.inference_mode():
+            predictions = [int(model(**tokenizer(text, return_tensors="pt")).logits.argmax()) for text, _ in examples]
+        accuracy = sum(p == label for p, (_, label) in zip(predictions, examples)) / len(examples)
+
+        with open(config.metric_file_name) as f:
+            assert abs(json.load(f)["accuracy"] - accuracy) < 1e-9
+        with open(config.per_class_metric_file) as f:
+            per_class = json.load(f)
+        assert sum(scores["support"] for scores in per_class.values()) == len(examples)
+        with open(config.latency_profile_file) as f:
+            profile = json.load(f)
+        assert profile["num_examples"] == len(examples) and profile["num_batches"] == 5
+
+        # Run and registered version went to the configured store, where the serving registry looks
+        registry = ModelRegistry(ModelRegistryConfig(
+            source="mlflow",
+            watch_path=Path(model_path),
+            tracking_uri=config.tracking_uri,
+            model_name="stand-in-classifier",
+            model_alias=None,
+            download_dir=Path(directory) / "registry",
+            poll_seconds=0,
+            keep_versions=1
+        ))
+        version = registry.latest_version()
+        assert version == "stand-in-classifier/1"
+        assert (registry.fetch(version) / "config.json").exists()
+
+if __name__ == "__main__":
+    test_length_sorted_evaluation_matches_unsorted()
+    print("Length-sorted evaluation OK.")
@@ -0,0 +1,99 @@
+"""
+Classifier hot-swap check under the ONNX backends.
+
+Run with `python test_model_swapper.py` (needs onnxruntime and onnx; no
+downloads, no GPU). A stand-in checkpoint is served through ONNX Runtime, then
+retrained in place: the swapper must export the new version's own graph on
+load instead of serving the startup graph under the new version id.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+import yaml
+
+pytest.importorskip("onnxruntime")
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.config.configuration import ConfigurationManager
+from documind.components.model_swapper import ClassifierSwapper
+from documind.components.onnx_export import export_to_onnx, quantize_onnx
+from documind.pipeline.prediction import PredictionPipeline
+from documind.utils.stand_ins import build_stand_in_classifier
+
+TEXTS = ["The Seller shall indemnify the Buyer against all claims.", "Either party may terminate this Agreement on notice."]
+
+def swap_under(backend: str):
+    workspace = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(workspace)
+        os.makedirs("config")
+        with open(os.path.join(REPO_ROOT, "config", "config.yaml")) as f:
+            config = yaml.safe_load(f)
+        config["result_cache"]["enabled"] = False
+        with open(os.path.join("config", "config.yaml"), "w") as f:
+            yaml.safe_dump(config, f)
+        shutil.copy(os.path.join(REPO_ROOT, "params.yaml"), workspace)
+        shutil.copy(os.path.join(REPO_ROOT, "schema.yaml"), workspace)
+
+        model_path = Path(build_stand_in_classifier(os.path.join(workspace, "classifier"), seed=0))
+        startup_graph = Path(workspace) / "startup.onnx"
+        export_to_onnx(model_path, startup_graph)
+
+        config_manager = ConfigurationManager()
+        prediction_config = replace(
+            config_manager.get_prediction_config(),
+            model_path=model_path,
+            backend=backend,
+            onnx_model_path=startup_graph,
+            onnx_int8_model_path=Path(workspace) / "startup-int8.onnx"
+        )
+        registry_config = replace(
+            config_manager.get_model_registry_config(),
+            source="path",
+            watch_path=model_path,
+            download_dir=Path(workspace) / "registry",
+            poll_seconds=0
+        )
+        if backend == "onnx-int8":
+            quantize_onnx(startup_graph, prediction_config.onnx_int8_model_path)
+
+        swapper = ClassifierSwapper(prediction_config, registry_config)
+        before = swapper.current.predict_batch(TEXTS)
+
+        # Retrain in place: new weights, same label names
+        build_stand_in_classifier(str(model_path), seed=1)
+        assert swapper.check(explicit=True), swapper.status()
+        assert swapper.current.model_version != swapper.history[-1].model_version
+
+        # The new version runs its own graph, which matches its own eager weights
+        eager = PredictionPipeline(replace(prediction_config, backend="torch")).predict_batch(TEXTS)
+        assert swapper.current.session is not None
+        assert registry_config.download_dir in swapper.current.config.onnx_model_path.parents
+        if backend == "onnx":
+            assert swapper.current.predict_batch(TEXTS) == eager, (before, eager)
+
+        # Rolling back serves the startup graph again
+        swapper.rollback()
+        assert swapper.current.predict_batch(TEXTS) == before
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+def test_swap_under_onnx():
+    swap_under("onnx")
+
+def test_swap_under_onnx_int8():
+    swap_under("onnx-int8")
+
+if __name__ == "__main__":
+    test_swap_under_onnx()
+    test_swap_under_onnx_int8()
+    print("ONNX hot swap OK.")
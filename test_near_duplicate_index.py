@@ -0,0 +1,79 @@
+"""
+Near-duplicate audit reuse check.
+
+Run with `python test_near_duplicate_index.py` (numpy only; no models). With
+the configured threshold, a contract that only differs in party names is
+served from the index; one that changes a number is not. Eviction keeps the
+newest `max_entries` audits of a namespace and leaves other namespaces alone.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.config.configuration import ConfigurationManager
+from documind.components.near_duplicate_index import NearDuplicateIndex
+
+CONTRACT = (
+    "This Services Agreement is entered into by and between Acme Corporation, a Delaware corporation "
+    "(the Provider), and Globex Industries LLC (the Client). The Provider shall indemnify, defend and hold "
+    "harmless the Client from and against any and all losses, damages, liabilities and expenses arising out "
+    "of any breach of this Agreement, provided that the aggregate liability of the Provider shall not exceed "
+    "500,000 dollars. This Agreement shall be governed by the laws of the State of New York."
+)
+OTHER_PARTIES = CONTRACT.replace("Acme Corporation", "Initech Holdings Inc.").replace("Globex Industries LLC", "Umbrella Partners")
+OTHER_CAP = CONTRACT.replace("500,000", "5,000,000")
+
+def new_index(directory: str, version: str = "v1", namespace: str = "full_agent", **overrides) -> NearDuplicateIndex:
+    config = ConfigurationManager().get_near_duplicate_index_config()
+    config = replace(config, sqlite_path=Path(directory) / "audits.sqlite", **overrides)
+    return NearDuplicateIndex(config, namespace, version)
+
+def test_party_names_reuse_numbers_do_not():
+    with tempfile.TemporaryDirectory() as directory:
+        index = new_index(directory)
+        audit_id = index.add(CONTRACT, {"category": "Indemnification"})
+
+        match = index.find(OTHER_PARTIES)
+        assert match is not None and match["audit_id"] == audit_id, match
+        assert match["value"] == {"category": "Indemnification"}
+        assert index.config.threshold <= match["similarity"] < 1.0, match
+
+        assert index.find(OTHER_CAP) is None
+
+def test_versions_and_restarts():
+    with tempfile.TemporaryDirectory() as directory:
+        new_index(directory).add(CONTRACT, {"category": "Indemnification"})
+        # Persisted across instances, kept apart per model version
+        assert new_index(directory).find(OTHER_PARTIES) is not None
+        assert new_index(directory, version="v2").find(OTHER_PARTIES) is None
+
+def test_eviction_keeps_newest_per_namespace():
+    with tempfile.TemporaryDirectory() as directory:
+        other = new_index(directory, namespace="classifier_only")
+        other.add(CONTRACT, {"category": "Indemnification"})
+
+        index = new_index(directory, max_entries=50)
+        # Eviction runs on every 100th insert; each contract has its own cap, so none match another
+        ids = [index.add(CONTRACT.replace("500,000", f"{i},000"), {"cap": i}) for i in range(100)]
+
+        with sqlite3.connect(str(index.config.sqlite_path)) as db:
+            kept = [row[0] for row in db.execute("SELECT id FROM audits WHERE namespace = 'full_agent' ORDER BY id")]
+            orphans = db.execute("SELECT COUNT(*) FROM buckets WHERE audit_id NOT IN (SELECT id FROM audits)").fetchone()[0]
+        assert kept == ids[50:]
+        assert orphans == 0
+
+        assert index.find(CONTRACT.replace("500,000", "0,000")) is None
+        assert index.find(CONTRACT.replace("500,000", "99,000"))["value"] == {"cap": 99}
+        assert other.find(OTHER_PARTIES) is not None
+
+if __name__ == "__main__":
+    test_party_names_reuse_numbers_do_not()
+    test_versions_and_restarts()
+    test_eviction_keeps_newest_per_namespace()
+    print("Near-duplicate index OK.")
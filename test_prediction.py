@@ -0,0 +1,101 @@
+"""
+Batched classifier inference check.
+
+Run with `python test_prediction.py` (needs transformers; builds a stand-in
+classifier, no downloads). predict_batch sorts inputs by length and pads each
+batch to its longest member: results must still come back in the caller's
+order, match one-at-a-time predictions, and be the same through the cache.
+"""
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import pytest
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.pipeline.prediction import PredictionPipeline
+from documind.utils.stand_ins import build_stand_in_classifier
+
+WORDS = "the company shall give written notice days before termination of this agreement governed by laws state".split()
+
+@contextlib.contextmanager
+def stand_in_workspace():
+    directory = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+        os.makedirs("config")
+        with open(os.path.join(REPO_ROOT, "config", "config.yaml")) as f:
+            config = yaml.safe_load(f)
+        config["prediction"]["model_path"] = build_stand_in_classifier(os.path.join(directory, "classifier"))
+        config["prediction"]["backend"] = "torch"
+        # Memory tier only: nothing is left behind
+        config["result_cache"]["enabled"] = True
+        config["result_cache"]["sqlite_path"] = None
+        with open(os.path.join("config", "config.yaml"), "w") as f:
+            yaml.safe_dump(config, f)
+        shutil.copy(os.path.join(REPO_ROOT, "params.yaml"), directory)
+        shutil.copy(os.path.join(REPO_ROOT, "schema.yaml"), directory)
+        yield directory
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+@pytest.fixture(scope="module")
+def workspace():
+    with stand_in_workspace() as directory:
+        yield directory
+
+def make_texts(count: int = 23) -> list:
+    rng = random.Random(0)
+    # Lengths deliberately out of order, so sorting by length reorders them
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 120))) for _ in range(count)]
+
+def test_batch_results_keep_caller_order(workspace):
+    pipeline = PredictionPipeline()
+    # Every call goes through the model here
+    pipeline.cache = pipeline.top_k_cache = None
+    texts = make_texts()
+
+    one_by_one = [pipeline.predict_batch([text])[0] for text in texts]
+    assert pipeline.predict_batch(texts, batch_size=4) == one_by_one
+    assert pipeline.predict_batch(list(reversed(texts)), batch_size=4) == list(reversed(one_by_one))
+
+    top_k = pipeline.predict_top_k(texts, k=3, batch_size=4)
+    assert [result["label"] for result in top_k] == one_by_one
+    for result, text in zip(top_k, texts):
+        alone = pipeline.predict_top_k([text], k=3)[0]
+        assert [entry["label"] for entry in result["top_k"]] == [entry["label"] for entry in alone["top_k"]]
+        assert all(abs(a["score"] - b["score"]) < 1e-3 for a, b in zip(result["top_k"], alone["top_k"]))
+
+    assert pipeline.predict_batch([]) == []
+
+def test_cache_serves_the_same_order(workspace):
+    pipeline = PredictionPipeline()
+    assert pipeline.cache is not None
+
+    texts = make_texts()
+    cold = pipeline.predict_batch(texts[:12], batch_size=4)
+    expected = pipeline._predict_batch(texts, batch_size=4)
+
+    computed = []
+    model_batch = pipeline._predict_batch
+    pipeline._predict_batch = lambda missing, batch_size=None: computed.extend(missing) or model_batch(missing, batch_size)
+
+    # Half cached, half new, with a repeat: only the missing distinct texts run, order is kept
+    mixed = texts[6:] + [texts[20]]
+    assert pipeline.predict_batch(mixed, batch_size=4) == expected[6:] + [expected[20]]
+    assert computed == texts[12:]
+    assert pipeline.predict_batch(texts[:12]) == cold
+
+if __name__ == "__main__":
+    with stand_in_workspace() as directory:
+        test_batch_results_keep_caller_order(directory)
+        test_cache_serves_the_same_order(directory)
+    print("Batched prediction OK.")
@@ -0,0 +1,129 @@
+"""
+Remote LLM backend check against the stand-in OpenAI-compatible server.
+
+Run with `python test_remote_llm.py` (needs fastapi, uvicorn, httpx,
+langchain-core; no models, no GPU). Covers the ReAct tool-call round trip
+(plain and streamed), retries on 503, no retries on 400, timeouts, and that
+concurrent calls respect max_concurrency over a small pool of kept-alive
+connections.
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from langchain_core.messages import HumanMessage, ToolMessage
+from documind.components.remote_llm import RemoteChatModel, RemoteLLMError
+from documind.utils.stand_ins import build_stand_in_openai_app
+
+PROMPT = 'Task: Classify this legal text.\nText: "This Agreement shall be governed by the laws of California."\nFirst, use the tool.'
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextlib.contextmanager
+def stand_in_server(**kwargs):
+    app = build_stand_in_openai_app(**kwargs)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}/v1", app.state.stats
+    finally:
+        server.should_exit = True
+        thread.join()
+
+def remote_model(base_url: str, **kwargs) -> RemoteChatModel:
+    settings = {"base_url": base_url, "model": "stand-in", "backoff_seconds": 0.01, "max_backoff_seconds": 0.05, **kwargs}
+    return RemoteChatModel(**settings)
+
+def test_tool_call_round_trip():
+    with stand_in_server() as (base_url, stats):
+        llm = remote_model(base_url)
+        first = llm.invoke([HumanMessage(content=PROMPT)])
+        assert first.tool_calls and first.tool_calls[0]["name"] == "Document Classifier", first
+        assert first.usage_metadata["input_tokens"] > 0
+
+        tool_result = ToolMessage(content="Governing Laws", tool_call_id=first.tool_calls[0]["id"])
+        second = llm.invoke([HumanMessage(content=PROMPT), first, tool_result])
+        assert "Governing Laws" in second.content, second
+
+        # Streaming: tool call chunks are merged back into one call, text arrives token by token
+        chunks = list(llm.stream([HumanMessage(content=PROMPT)]))
+        merged = chunks[0]
+        for chunk in chunks[1:]:
+            merged += chunk
+        assert merged.tool_calls[0]["args"] == first.tool_calls[0]["args"]
+        text_chunks = list(llm.stream([HumanMessage(content=PROMPT), first, tool_result]))
+        assert len(text_chunks) > 3 and "".join(c.content for c in text_chunks) == second.content
+        llm.close()
+
+def test_retries_transient_errors_only():
+    with stand_in_server(fail_first=2, fail_status=503) as (base_url, stats):
+        llm = remote_model(base_url, max_retries=3)
+        assert llm.invoke([HumanMessage(content=PROMPT)]).tool_calls
+        assert stats["requests"] == 3 and stats["failed"] == 2, stats
+        llm.close()
+
+    with stand_in_server(fail_first=1, fail_status=400) as (base_url, stats):
+        llm = remote_model(base_url, max_retries=3)
+        with contextlib.suppress(RemoteLLMError):
+            llm.invoke([HumanMessage(content=PROMPT)])
+            raise AssertionError("a 400 must not be retried into a success")
+        assert stats["requests"] == 1, stats
+        llm.close()
+
+def test_timeout():
+    with stand_in_server(latency_ms=500) as (base_url, stats):
+        llm = remote_model(base_url, timeout_seconds=0.1, max_retries=1)
+        started_at = time.perf_counter()
+        with contextlib.suppress(RemoteLLMError):
+            llm.invoke([HumanMessage(content=PROMPT)])
+            raise AssertionError("the request should have timed out")
+        assert stats["requests"] == 2 and time.perf_counter() - started_at < 1.0, stats
+        llm.close()
+
+def test_concurrency_limit_and_keep_alive():
+    with stand_in_server(latency_ms=100) as (base_url, stats):
+        llm = remote_model(base_url, max_concurrency=4, max_connections=4, max_keepalive_connections=4)
+
+        async def burst():
+            return await asyncio.gather(*[llm.ainvoke([HumanMessage(content=PROMPT)]) for _ in range(16)])
+
+        started_at = time.perf_counter()
+        results = asyncio.run(burst())
+        elapsed = time.perf_counter() - started_at
+        # Sync callers (agent worker threads) share the same limit and pool
+        threads = [threading.Thread(target=llm.invoke, args=([HumanMessage(content=PROMPT)],)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"16 async calls in {elapsed:.2f}s, peak in flight {stats['max_in_flight']}, "
+              f"{len(stats['client_ports'])} connections for {stats['requests']} requests")
+        assert all(result.tool_calls for result in results)
+        assert stats["max_in_flight"] <= 4, stats
+        assert elapsed >= 0.35, "more than max_concurrency requests ran at once"
+        assert len(stats["client_ports"]) <= 4, "connections were not reused"
+        llm.close()
+
+if __name__ == "__main__":
+    test_tool_call_round_trip()
+    test_retries_transient_errors_only()
+    test_timeout()
+    test_concurrency_limit_and_keep_alive()
+    print("Remote LLM backend OK.")
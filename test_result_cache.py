@@ -0,0 +1,78 @@
+"""
+Result cache check.
+
+Run with `python test_result_cache.py` (standard library only, no models).
+Covers the in-memory LRU tier, the persistent SQLite tier across instances
+and its size-based eviction, key separation by namespace, version and
+normalized text, and the TTL on both tiers.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.components.result_cache import ResultCache
+from documind.entity import ResultCacheConfig
+
+def cache_config(sqlite_path=None, **overrides) -> ResultCacheConfig:
+    settings = {"enabled": True, "max_entries": 100, "ttl_seconds": 3600, "sqlite_path": sqlite_path, "sqlite_max_entries": 1000}
+    return ResultCacheConfig(**{**settings, **overrides})
+
+def test_memory_tier_is_lru():
+    cache = ResultCache(cache_config(max_entries=2), "classifier", "v1")
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"   # a is now the most recently used
+    cache.set("c", "C")            # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+def test_keys_separate_versions_and_normalize_text():
+    cache = ResultCache(cache_config(), "classifier", "v1")
+    cache.set("The  Seller shall\ndeliver.", "Delivery")
+    assert cache.get("The Seller shall deliver.  ") == "Delivery"
+    assert ResultCache(cache_config(), "classifier", "v2").get("The Seller shall deliver.") is None
+    assert cache.key("x") != ResultCache(cache_config(), "agent", "v1").key("x")
+
+def test_sqlite_tier_persists_and_evicts():
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_path = Path(directory) / "results.sqlite"
+        config = cache_config(sqlite_path, max_entries=10, sqlite_max_entries=50)
+
+        cache = ResultCache(config, "classifier", "v1")
+        cache.set("governing law", {"label": "Governing Laws"})
+        # A restarted process (empty memory tier) is served from disk, then from memory
+        restarted = ResultCache(config, "classifier", "v1")
+        assert restarted.get("governing law") == {"label": "Governing Laws"}
+        assert restarted.key("governing law") in restarted._memory
+
+        # Every 100th write trims the namespace to the sqlite_max_entries most recently used rows
+        for i in range(99):
+            cache.set(f"clause {i}", i)
+        with sqlite3.connect(str(sqlite_path)) as db:
+            assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 50
+        assert ResultCache(config, "classifier", "v1").get("clause 98") == 98
+        assert ResultCache(config, "classifier", "v1").get("clause 0") is None
+
+def test_ttl_expires_both_tiers():
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_path = Path(directory) / "results.sqlite"
+        expired = ResultCache(cache_config(sqlite_path, ttl_seconds=0), "classifier", "v1")
+        expired.set("force majeure", "Force Majeure")
+        assert expired.get("force majeure") is None
+
+        # The expired row was removed from disk as well
+        with sqlite3.connect(str(sqlite_path)) as db:
+            assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+        assert ResultCache(cache_config(sqlite_path), "classifier", "v1").get("force majeure") is None
+
+if __name__ == "__main__":
+    test_memory_tier_is_lru()
+    test_keys_separate_versions_and_normalize_text()
+    test_sqlite_tier_persists_and_evicts()
+    test_ttl_expires_both_tiers()
+    print("Result cache OK.")
@@ -0,0 +1,145 @@
+"""
+Multi-worker memory check: with the classifier preloaded in the gunicorn master,
+every extra worker must cost far less than another copy of the weights.
+
+Run with `python test_shared_memory.py` or `pytest -m slow test_shared_memory.py`
+(Linux, needs gunicorn; takes minutes, so plain `pytest` skips it). Serves a
+DistilBERT-sized stand-in classifier (random weights, no downloads) with 1 and
+3 workers, with and without preloading, and compares the proportional set size
+(PSS: shared pages split between the processes sharing them) of the whole
+process tree.
+"""
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import pytest
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def write_config(workspace: str, model_path: str, workers: int, preload: bool, port: int):
+    with open(os.path.join(REPO_ROOT, "config", "config.yaml")) as f:
+        config = yaml.safe_load(f)
+    config["prediction"]["model_path"] = model_path
+    config["prediction"]["backend"] = "torch"
+    config["result_cache"]["enabled"] = False
+    config["model_registry"]["poll_seconds"] = 0
+    config["serving"].update({
+        "host": "127.0.0.1",
+        "port": port,
+        "workers": workers,
+        "preload_classifier": preload,
+        "warmup_agent": False,
+        "torch_threads_per_worker": 1
+    })
+    os.makedirs(os.path.join(workspace, "config"), exist_ok=True)
+    with open(os.path.join(workspace, "config", "config.yaml"), "w") as f:
+        yaml.safe_dump(config, f)
+
+def process_tree(root: int) -> list:
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                continue
+    tree, frontier = [root], [root]
+    while frontier:
+        children = [pid for pid, ppid in parents.items() if ppid in frontier]
+        tree += children
+        frontier = children
+    return tree
+
+def pss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def post(port: int, path: str, payload: dict = None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.status
+
+def serve_and_measure(workspace: str, model_path: str, workers: int, preload: bool) -> float:
+    port = free_port()
+    write_config(workspace, model_path, workers, preload, port)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(REPO_ROOT, "src"), REPO_ROOT, os.environ.get("PYTHONPATH", "")]))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_ROOT, "gunicorn.conf.py"), "app:app"],
+        cwd=workspace, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # 1. Wait until every worker answers ready (requests are spread over the workers)
+        deadline = time.time() + 300
+        ready_in_a_row = 0
+        while ready_in_a_row < 5 * workers:
+            if time.time() > deadline or server.poll() is not None:
+                raise RuntimeError(f"Server with {workers} worker(s) did not become ready")
+            try:
+                ready_in_a_row = ready_in_a_row + 1 if post(port, "/health/ready") == 200 else 0
+            except Exception:
+                ready_in_a_row = 0
+                time.sleep(0.5)
+
+        # 2. Real traffic, so every worker has run inference
+        text = "This Agreement shall be governed by the laws of the State of New York, without limitation."
+        for _ in range(20 * workers):
+            post(port, "/audit", {"text": text, "mode": "classify"})
+        time.sleep(1)
+
+        # 3. PSS of master + workers
+        return sum(pss_mb(pid) for pid in process_tree(server.pid))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+@pytest.mark.slow
+def test_extra_workers_share_classifier_weights():
+    pytest.importorskip("gunicorn")
+    from documind.utils.stand_ins import build_stand_in_classifier
+
+    workspace = tempfile.mkdtemp(prefix="documind-shm-")
+    try:
+        # DistilBERT-sized encoder, so the weights dominate a worker's footprint
+        model_path = build_stand_in_classifier(os.path.join(workspace, "classifier"), dim=768, hidden_dim=3072, n_layers=6)
+        weights_mb = sum(
+            os.path.getsize(os.path.join(model_path, name)) for name in os.listdir(model_path) if name.endswith((".safetensors", ".bin"))
+        ) / 2**20
+        shutil.copy(os.path.join(REPO_ROOT, "params.yaml"), workspace)
+        shutil.copy(os.path.join(REPO_ROOT, "schema.yaml"), workspace)
+
+        extra = {}
+        for preload in (True, False):
+            one = serve_and_measure(workspace, model_path, 1, preload)
+            three = serve_and_measure(workspace, model_path, 3, preload)
+            extra[preload] = (three - one) / 2
+            print(f"preload={preload!s:<5}  1 worker {one:8.1f} MB   3 workers {three:8.1f} MB   per extra worker {extra[preload]:7.1f} MB")
+
+        print(f"weights: {weights_mb:.1f} MB")
+        assert extra[True] < weights_mb, "with preloading, an extra worker still costs a full copy of the weights"
+        assert extra[True] < extra[False] - 0.5 * weights_mb, "preloading does not save the weights per extra worker"
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_extra_workers_share_classifier_weights()
+    print("Shared-memory serving OK.")
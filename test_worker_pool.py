@@ -0,0 +1,133 @@
+"""
+Bounded agent worker pool check.
+
+Run with `python test_worker_pool.py` (needs fastapi and httpx; builds a
+stand-in classifier, no downloads). Covers QueueFullError once
+max_concurrency + max_queue jobs are pending, that a job cancelled while
+still queued gives its slot back, and that /audit answers a saturated pool
+with 429 and Retry-After.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from dataclasses import replace
+
+import pytest
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from documind.components.worker_pool import AgentWorkerPool, QueueFullError
+from documind.entity import WorkerPoolConfig
+from documind.utils.stand_ins import build_stand_in_classifier
+
+CLAUSE = "This Agreement shall be governed by the laws of the State of New York."
+
+def test_rejects_when_full_and_releases_cancelled_slots():
+    pool = AgentWorkerPool(WorkerPoolConfig(max_concurrency=1, max_queue=1, retry_after_seconds=1))
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_job():
+        started.set()
+        release.wait()
+        return "done"
+
+    async def scenario():
+        running = pool.submit(blocking_job)
+        await asyncio.to_thread(started.wait)
+        queued = pool.submit(lambda: "never runs")
+        assert pool.stats() == {"running": 1, "queued": 1, "max_concurrency": 1, "max_queue": 1}
+
+        with pytest.raises(QueueFullError):
+            pool.submit(lambda: "rejected")
+
+        # A client gone while its job waits: the slot comes back without the job ever running
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queued"] == 0
+        replacement = pool.submit(lambda: "replacement")
+
+        release.set()
+        (result, timing), (replacement_result, _) = await asyncio.gather(running, replacement)
+        assert result == "done" and replacement_result == "replacement"
+        assert timing["run_time_ms"] > 0 and "queue_wait_ms" in timing
+        assert pool.stats()["running"] == 0 and pool.stats()["queued"] == 0
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+class BlockingAgent:
+    """Stands in for AgentPipeline: every run blocks until released."""
+
+    def __init__(self):
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def find_prior_audit(self, document_text, mode):
+        return None
+
+    def remember_audit(self, document_text, mode, value):
+        pass
+
+    def run_agent(self, document_text):
+        self.started.set()
+        self.release.wait()
+        return "Low risk."
+
+def test_audit_answers_429_when_saturated():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import app as api
+
+    workspace = tempfile.mkdtemp()
+    cwd, configured_pool = os.getcwd(), api.worker_pool
+    try:
+        os.chdir(workspace)
+        os.makedirs("config")
+        with open(os.path.join(REPO_ROOT, "config", "config.yaml")) as f:
+            config = yaml.safe_load(f)
+        config["prediction"]["model_path"] = build_stand_in_classifier(os.path.join(workspace, "classifier"))
+        config["prediction"]["backend"] = "torch"
+        config["result_cache"]["enabled"] = False
+        config["near_duplicate_index"]["enabled"] = False
+        with open(os.path.join("config", "config.yaml"), "w") as f:
+            yaml.safe_dump(config, f)
+        shutil.copy(os.path.join(REPO_ROOT, "params.yaml"), workspace)
+        shutil.copy(os.path.join(REPO_ROOT, "schema.yaml"), workspace)
+
+        agent = BlockingAgent()
+        api.agent_pipeline = agent
+        api.worker_pool = AgentWorkerPool(replace(api.worker_pool_config, max_concurrency=1, max_queue=0))
+        client = TestClient(api.app)
+
+        first = {}
+        thread = threading.Thread(target=lambda: first.update(response=client.post("/audit", json={"text": CLAUSE})))
+        thread.start()
+        try:
+            assert agent.started.wait(60), "the first audit never reached the agent"
+            busy = client.post("/audit", json={"text": CLAUSE})
+        finally:
+            agent.release.set()
+            thread.join()
+
+        assert busy.status_code == 429, busy.text
+        assert busy.headers["Retry-After"] == str(api.worker_pool_config.retry_after_seconds)
+        assert first["response"].status_code == 200, first["response"].text
+        assert first["response"].json()["risk_analysis"] == "Low risk."
+        assert client.post("/audit", json={"text": CLAUSE}).status_code == 200
+        api.worker_pool.shutdown()
+    finally:
+        # The app and the classifier singleton must not keep pointing at the deleted workspace
+        api.agent_pipeline, api.worker_pool = None, configured_pool
+        from documind.components import agent_tools
+        agent_tools._swapper = agent_tools._batcher = None
+        os.chdir(cwd)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_rejects_when_full_and_releases_cancelled_slots()
+    test_audit_answers_429_when_saturated()
+    print("Agent worker pool OK.")